@@ -0,0 +1,33 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir('..')
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
+django.setup()
+
+from utils.rank_index import RankIndex
+
+
+def create_user_rank_index():
+    execute("""
+        CREATE TABLE IF NOT EXISTS user_rank_index (
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            user_id VARCHAR(36) NOT NULL UNIQUE,
+            segment VARCHAR(10) NOT NULL,
+            karma INT NOT NULL DEFAULT 0,
+            updated_at DATETIME NOT NULL,
+            INDEX idx_user_rank_index_segment_karma (segment, karma),
+            CONSTRAINT fk_user_rank_index_user FOREIGN KEY (user_id) REFERENCES user (id) ON DELETE CASCADE
+        )
+    """)
+
+
+if __name__ == '__main__':
+    create_user_rank_index()
+    RankIndex.rebuild()
+    execute("UPDATE system_setting SET value = '1.47', updated_at = now() WHERE `key` = 'db.version';")
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir('..')
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
+django.setup()
+
+from api.leaderboard.leaderboard_helper import build_all_snapshots
+
+
+def create_leaderboard_snapshot():
+    execute("""
+        CREATE TABLE IF NOT EXISTS leaderboard_snapshot (
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            board VARCHAR(50) NOT NULL,
+            period VARCHAR(10) NOT NULL,
+            data JSON NOT NULL,
+            etag VARCHAR(64) NOT NULL,
+            frozen BOOLEAN NOT NULL DEFAULT FALSE,
+            updated_at DATETIME NOT NULL,
+            created_at DATETIME NOT NULL,
+            UNIQUE KEY unique_leaderboard_snapshot (board, period)
+        )
+    """)
+
+
+if __name__ == '__main__':
+    create_leaderboard_snapshot()
+    build_all_snapshots()
+    execute("UPDATE system_setting SET value = '1.48', updated_at = now() WHERE `key` = 'db.version';")
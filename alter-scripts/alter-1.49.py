@@ -0,0 +1,52 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir('..')
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
+django.setup()
+
+
+def create_import_job():
+    execute("""
+        CREATE TABLE IF NOT EXISTS import_job (
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            type VARCHAR(50) NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            file_name VARCHAR(255) NOT NULL,
+            file LONGBLOB NOT NULL,
+            total_rows INT NOT NULL DEFAULT 0,
+            processed_rows INT NOT NULL DEFAULT 0,
+            success_count INT NOT NULL DEFAULT 0,
+            failed_count INT NOT NULL DEFAULT 0,
+            message VARCHAR(255),
+            worker VARCHAR(100),
+            started_at DATETIME,
+            completed_at DATETIME,
+            created_by VARCHAR(36) NOT NULL,
+            updated_at DATETIME NOT NULL,
+            created_at DATETIME NOT NULL,
+            INDEX import_job_status_created_at (status, created_at),
+            CONSTRAINT fk_import_job_ref_created_by FOREIGN KEY (created_by) REFERENCES user(id) ON DELETE CASCADE
+        )
+    """)
+    execute("""
+        CREATE TABLE IF NOT EXISTS import_job_row (
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            job_id VARCHAR(36) NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            data JSON NOT NULL,
+            created_at DATETIME NOT NULL,
+            INDEX import_job_row_job_status (job_id, status),
+            CONSTRAINT fk_import_job_row_ref_job_id FOREIGN KEY (job_id) REFERENCES import_job(id) ON DELETE CASCADE
+        )
+    """)
+
+
+if __name__ == '__main__':
+    create_import_job()
+    execute("UPDATE system_setting SET value = '1.49', updated_at = now() WHERE `key` = 'db.version';")
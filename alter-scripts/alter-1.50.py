@@ -0,0 +1,26 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir('..')
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
+django.setup()
+
+
+def create_voucher_code_sequence():
+    execute("""
+        CREATE TABLE IF NOT EXISTS voucher_code_sequence (
+            prefix VARCHAR(10) NOT NULL PRIMARY KEY,
+            last_serial INT NOT NULL DEFAULT 0,
+            updated_at DATETIME NOT NULL
+        )
+    """)
+
+
+if __name__ == '__main__':
+    create_voucher_code_sequence()
+    execute("UPDATE system_setting SET value = '1.50', updated_at = now() WHERE `key` = 'db.version';")
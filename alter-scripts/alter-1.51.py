@@ -0,0 +1,47 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir('..')
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
+django.setup()
+
+
+def create_email_outbox():
+    execute("""
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            subject VARCHAR(255) NOT NULL,
+            body LONGTEXT NOT NULL,
+            html_body LONGTEXT,
+            from_email VARCHAR(255) NOT NULL,
+            recipients JSON NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            attempts INT NOT NULL DEFAULT 0,
+            next_attempt_at DATETIME NOT NULL,
+            last_error VARCHAR(255),
+            sent_at DATETIME,
+            updated_at DATETIME NOT NULL,
+            created_at DATETIME NOT NULL,
+            INDEX email_outbox_status_next_attempt_at (status, next_attempt_at)
+        )
+    """)
+    execute("""
+        CREATE TABLE IF NOT EXISTS email_outbox_attachment (
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            email_id VARCHAR(36) NOT NULL,
+            filename VARCHAR(255) NOT NULL,
+            content LONGBLOB NOT NULL,
+            mimetype VARCHAR(100),
+            CONSTRAINT fk_email_outbox_attachment_ref_email_id FOREIGN KEY (email_id) REFERENCES email_outbox(id) ON DELETE CASCADE
+        )
+    """)
+
+
+if __name__ == '__main__':
+    create_email_outbox()
+    execute("UPDATE system_setting SET value = '1.51', updated_at = now() WHERE `key` = 'db.version';")
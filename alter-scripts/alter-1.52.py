@@ -0,0 +1,29 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir('..')
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
+django.setup()
+
+
+def create_discord_webhook_queue():
+    execute("""
+        CREATE TABLE IF NOT EXISTS discord_webhook_queue (
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            content TEXT NOT NULL,
+            attempts INT NOT NULL DEFAULT 0,
+            next_attempt_at DATETIME NOT NULL,
+            created_at DATETIME NOT NULL,
+            INDEX discord_webhook_queue_next_attempt_at (next_attempt_at)
+        )
+    """)
+
+
+if __name__ == '__main__':
+    create_discord_webhook_queue()
+    execute("UPDATE system_setting SET value = '1.52', updated_at = now() WHERE `key` = 'db.version';")
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir('..')
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
+django.setup()
+
+
+def create_error_log_index():
+    execute("""
+        CREATE TABLE IF NOT EXISTS error_log_index (
+            id VARCHAR(64) NOT NULL PRIMARY KEY,
+            type VARCHAR(255) NOT NULL,
+            message TEXT NOT NULL,
+            method VARCHAR(10) NOT NULL,
+            path VARCHAR(255) NOT NULL,
+            route VARCHAR(255) NOT NULL,
+            count INT NOT NULL DEFAULT 0,
+            open_count INT NOT NULL DEFAULT 0,
+            first_seen DATETIME NOT NULL,
+            last_seen DATETIME NOT NULL,
+            patched_at DATETIME NULL,
+            samples JSON NOT NULL,
+            updated_at DATETIME NOT NULL,
+            INDEX error_log_index_last_seen (last_seen),
+            INDEX error_log_index_open_count_last_seen (open_count, last_seen)
+        )
+    """)
+
+
+def create_error_log_affected_user():
+    execute("""
+        CREATE TABLE IF NOT EXISTS error_log_affected_user (
+            muid VARCHAR(100) NOT NULL PRIMARY KEY,
+            count INT NOT NULL DEFAULT 0,
+            last_seen DATETIME NOT NULL
+        )
+    """)
+
+
+def create_error_log_index_state():
+    execute("""
+        CREATE TABLE IF NOT EXISTS error_log_index_state (
+            log_name VARCHAR(100) NOT NULL PRIMARY KEY,
+            inode BIGINT NOT NULL DEFAULT 0,
+            byte_offset BIGINT NOT NULL DEFAULT 0,
+            updated_at DATETIME NOT NULL
+        )
+    """)
+
+
+if __name__ == '__main__':
+    create_error_log_index()
+    create_error_log_affected_user()
+    create_error_log_index_state()
+    execute("UPDATE system_setting SET value = '1.53', updated_at = now() WHERE `key` = 'db.version';")
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir('..')
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
+django.setup()
+
+from utils.search_index import SearchIndex
+
+
+def create_search_document():
+    execute("""
+        CREATE TABLE IF NOT EXISTS search_document (
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            entity VARCHAR(20) NOT NULL,
+            object_id VARCHAR(36) NOT NULL,
+            muid VARCHAR(100) NULL,
+            email VARCHAR(200) NULL,
+            mobile VARCHAR(15) NULL,
+            content TEXT NOT NULL,
+            updated_at DATETIME NOT NULL,
+            UNIQUE KEY unique_search_document (entity, object_id),
+            INDEX search_document_muid (entity, muid),
+            INDEX search_document_email (entity, email),
+            INDEX search_document_mobile (entity, mobile),
+            FULLTEXT INDEX search_document_content (content)
+        )
+    """)
+
+
+if __name__ == '__main__':
+    create_search_document()
+    SearchIndex.rebuild()
+    execute("UPDATE system_setting SET value = '1.54', updated_at = now() WHERE `key` = 'db.version';")
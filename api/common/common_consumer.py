@@ -1,5 +1,8 @@
 import json
+import threading
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.db.models import Count
@@ -15,10 +18,24 @@ from db.organization import Organization
 from db.task import InterestGroup
 from db.user import User, UserRoleLink
 
-from utils.types import IntegrationType, OrganizationType
+from utils.types import IntegrationType, OrganizationType, RoleType
+
+ORG_TYPES = [OrganizationType.COLLEGE.value, OrganizationType.COMPANY.value, OrganizationType.COMMUNITY.value]
+MAIN_ROLES = [RoleType.MENTOR.value, RoleType.ENABLER.value]
+
 
 class LandingStats:
-    data = {}
+    """
+    Keeps the landing page totals as atomic counters in the cache.
+
+    Signals increment and decrement the counters, so the database is only
+    queried when the counters are reconciled: on a cold cache and at most
+    once per LANDING_STATS_RECONCILE_INTERVAL.
+    """
+
+    key_prefix = "landing_stats"
+    reconciled_key = f"{key_prefix}:reconciled"
+    broadcast_key = f"{key_prefix}:broadcast"
 
     def members_count(self):
         members_count = User.objects.all().count()
@@ -26,8 +43,7 @@ class LandingStats:
 
     def org_type_counts(self):
         org_type_counts = Organization.objects.filter(
-                org_type__in=[OrganizationType.COLLEGE.value, OrganizationType.COMPANY.value,
-                                OrganizationType.COMMUNITY.value]
+                org_type__in=ORG_TYPES
             ).values('org_type').annotate(org_count=Coalesce(Count('org_type'), 0))
         org_type_counts = list(org_type_counts)
 
@@ -35,7 +51,7 @@ class LandingStats:
 
     def enablers_mentors_count(self):
         enablers_mentors_count = UserRoleLink.objects.filter(
-            role__title__in=["Mentor", "Enabler"]).values(
+            role__title__in=MAIN_ROLES).values(
             'role__title').annotate(role_count=Coalesce(Count('role__title'), 0))
         enablers_mentors_count = list(enablers_mentors_count)
 
@@ -49,29 +65,97 @@ class LandingStats:
         learning_circles_count = LearningCircle.objects.all().count()
         return learning_circles_count
 
-    def get_data(self, sender):
-        if sender == None:
-            self.data = {
-                'members': self.members_count(),
-                'org_type_counts': self.org_type_counts(),
-                'enablers_mentors_count': self.enablers_mentors_count(),
-                'ig_count': self.interest_groups_count(),
-                'learning_circle_count': self.learning_circles_count()
-            }
-        elif sender == User:
-            self.data['members'] = self.members_count()
-
+    def get_key(self, *parts):
+        return ":".join([self.key_prefix, *parts])
+
+    def reconcile(self):
+        """
+        Recomputes every counter from the database.
+        """
+        org_counts = {org["org_type"]: org["org_count"] for org in self.org_type_counts()}
+        role_counts = {role["role__title"]: role["role_count"] for role in self.enablers_mentors_count()}
+
+        counters = {
+            self.get_key("members"): self.members_count(),
+            self.get_key("ig_count"): self.interest_groups_count(),
+            self.get_key("learning_circle_count"): self.learning_circles_count(),
+        }
+        counters |= {self.get_key("org", org_type): org_counts.get(org_type, 0) for org_type in ORG_TYPES}
+        counters |= {self.get_key("role", role): role_counts.get(role, 0) for role in MAIN_ROLES}
+
+        cache.set_many(counters, timeout=None)
+        cache.set(self.reconciled_key, True, timeout=settings.LANDING_STATS_RECONCILE_INTERVAL)
+
+    def update(self, sender, instance, delta):
+        """
+        Applies a created (+1) or deleted (-1) row to its counter.
+        """
+        if sender == User:
+            key = self.get_key("members")
         elif sender == Organization:
-            self.data['org_type_counts'] = self.org_type_counts()
-
+            if instance.org_type not in ORG_TYPES:
+                return
+            key = self.get_key("org", instance.org_type)
         elif sender == UserRoleLink:
-            self.data['enablers_mentors_count'] = self.enablers_mentors_count()
-
+            role = instance.role.title
+            if role not in MAIN_ROLES:
+                return
+            key = self.get_key("role", role)
         elif sender == InterestGroup:
-            self.data['ig_count'] = self.interest_groups_count()
-
+            key = self.get_key("ig_count")
         elif sender == LearningCircle:
-            self.data['learning_circle_count'] = self.learning_circles_count()
+            key = self.get_key("learning_circle_count")
+        else:
+            return
+
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # counter evicted or never initialised, the database already has the change
+            self.reconcile()
+
+    def get_data(self):
+        if not cache.get(self.reconciled_key):
+            self.reconcile()
+
+        counters = cache.get_many(
+            [self.get_key("members"), self.get_key("ig_count"), self.get_key("learning_circle_count")]
+            + [self.get_key("org", org_type) for org_type in ORG_TYPES]
+            + [self.get_key("role", role) for role in MAIN_ROLES]
+        )
+        return {
+            'members': counters.get(self.get_key("members"), 0),
+            'org_type_counts': [
+                {'org_type': org_type, 'org_count': counters[self.get_key("org", org_type)]}
+                for org_type in ORG_TYPES
+                if counters.get(self.get_key("org", org_type))
+            ],
+            'enablers_mentors_count': [
+                {'role__title': role, 'role_count': counters[self.get_key("role", role)]}
+                for role in MAIN_ROLES
+                if counters.get(self.get_key("role", role))
+            ],
+            'ig_count': counters.get(self.get_key("ig_count"), 0),
+            'learning_circle_count': counters.get(self.get_key("learning_circle_count"), 0),
+        }
+
+    def schedule_broadcast(self):
+        """
+        Coalesces changes into one broadcast per LANDING_STATS_BROADCAST_INTERVAL.
+        Only the first change of a window, across all workers, starts the timer.
+        """
+        interval = settings.LANDING_STATS_BROADCAST_INTERVAL
+        if cache.add(self.broadcast_key, True, timeout=interval * 2):
+            timer = threading.Timer(interval, self.broadcast)
+            timer.daemon = True
+            timer.start()
+
+    def broadcast(self):
+        cache.delete(self.broadcast_key)
+        async_to_sync(channel_layer.group_send)(
+            GlobalCount.group_name,
+            {"type": "send_data", "data": self.get_data()}
+        )
 
 
 landing_stats = LandingStats()
@@ -82,24 +166,23 @@ class GlobalCount(WebsocketConsumer):
 
     def connect(self):
         async_to_sync(self.channel_layer.group_add)(
-                self.group_name, 
+                self.group_name,
                 self.channel_name
             )
         self.accept()
 
-        landing_stats.get_data(None)
-        self.data = landing_stats.data
+        self.data = landing_stats.get_data()
 
         self.send(text_data=json.dumps(self.data))
-    
+
     def disconnect(self, code):
         self.channel_layer.group_discard(self.group_name, self.channel_name)
-    
+
     def send_data(self, event):
         self.send(text_data=json.dumps(event['data']))
 
 channel_layer = get_channel_layer()
-    
+
 @receiver(post_save, sender=User)
 @receiver(post_save, sender=LearningCircle)
 @receiver(post_save, sender=InterestGroup)
@@ -112,9 +195,5 @@ channel_layer = get_channel_layer()
 @receiver(post_delete, sender=Organization)
 def db_signals(sender, instance, created=None, *args, **kwargs):
     if created or created == None:
-        landing_stats.get_data(sender)
-        data = landing_stats.data
-        async_to_sync(channel_layer.group_send)(
-            "landing_stats",
-            {"type": "send_data", "data": data}
-        )
+        landing_stats.update(sender, instance, 1 if created else -1)
+        landing_stats.schedule_broadcast()
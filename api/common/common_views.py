@@ -9,19 +9,21 @@ from rest_framework.views import APIView
 
 from db.learning_circle import LearningCircle
 from db.learning_circle import UserCircleLink
-from db.organization import Organization,Department,District,State,Country
+from db.organization import Organization,Department
 from db.task import InterestGroup, KarmaActivityLog, UserIgLink
 from db.user import User, UserRoleLink
 from utils.response import CustomResponse
-from utils.types import IntegrationType, OrganizationType, RoleType
+from utils.cache import cache_response
+from utils.geography import GeographyIndex
+from utils.types import CacheTag, IntegrationType, OrganizationType, RoleType
 from utils.utils import CommonUtils
 from .serializer import StudentInfoSerializer, CollegeInfoSerializer, LearningCircleEnrollmentSerializer, \
-    UserLeaderboardSerializer,OrgSerializer,DistrictSerializer,StateSerializer,CountrySerializer, LcDetailsSerializer, \
+    UserLeaderboardSerializer,OrgSerializer, LcDetailsSerializer, \
     LcListSerializer
 
 class LcDetailsAPI(APIView):
     def get(self, request, circle_id):
-        learning_circle = LearningCircle.objects.filter(id=circle_id).first()
+        learning_circle = LearningCircle.objects.filter(id=circle_id).select_related('org', 'ig').first()
 
         serializer = LcDetailsSerializer(
             learning_circle,
@@ -33,7 +35,7 @@ class LcDetailsAPI(APIView):
 
 class LcListAPI(APIView):
     def get(self, request):
-        all_circles = LearningCircle.objects.all()
+        all_circles = LcListSerializer.load(LearningCircle.objects.all())
         
         ig = request.query_params.get("ig")
         org = request.query_params.get("org")
@@ -314,9 +316,9 @@ class LcReportDownloadAPI(APIView):
             )
         )
 
-        student_info_data = StudentInfoSerializer(student_info, many=True).data
-
-        return CommonUtils.generate_csv(student_info_data, "Learning Circle Report")
+        return CommonUtils.generate_csv(
+            student_info, "Learning Circle Report", serializer=StudentInfoSerializer
+        )
 
 
 class CollegeWiseLcReport(APIView):
@@ -500,6 +502,7 @@ class LearningCircleEnrollmentCSV(APIView):
 
 
 class GlobalCountAPI(APIView):
+    @cache_response(ttl=60, tags=[CacheTag.LANDING_STATS])
     def get(self, request):
         members_count = User.objects.all().count()
         org_type_counts = (
@@ -567,12 +570,14 @@ class GTASANDSHOREAPI(APIView):
 
 class UserProfilePicAPI(APIView):
     def get(self, request, muid):
-        user = User.objects.filter(muid=muid).annotate(image=F("profile_pic")).values("image")
+        # profile_pic is a property reading the storage, not a column
+        user = [{"image": user.profile_pic} for user in User.objects.filter(muid=muid).only("id")]
         return CustomResponse(response=user).get_success_response()
 
 
 class ListIGAPI(APIView):
 
+    @cache_response(tags=[CacheTag.INTEREST_GROUP])
     def get(self, request):
         return CustomResponse(response=InterestGroup.objects.all().values("name")).get_success_response()
 
@@ -623,8 +628,8 @@ class ListTopIgUsersAPI(APIView):
 
 class BekenAPI(APIView):
     def get(self, request):
-        user_info = User.objects.exclude(
-            user_role_link_user__role__title__in=[RoleType.ENABLER.value, RoleType.MENTOR.value]).order_by(
+        user_info = UserLeaderboardSerializer.load(User.objects.exclude(
+            user_role_link_user__role__title__in=[RoleType.ENABLER.value, RoleType.MENTOR.value])).order_by(
             '-wallet_user__karma')[:100]
         data = UserLeaderboardSerializer(user_info, many=True)
         return CustomResponse(response=data.data).get_success_response()
@@ -657,38 +662,32 @@ class LcCollegeAPI(APIView):
 
 class LcDistrictAPI(APIView):
     def get(self, request):
-        district = District.objects.filter(zone__state_id=request.query_params.get("state_id"))
-        
-        serializer = DistrictSerializer(district, many=True)
+        districts = GeographyIndex.get_districts_of_state(request.query_params.get("state_id"))
 
         return CustomResponse(
             response={
-                "districts": serializer.data,
+                "districts": districts,
             }
         ).get_success_response()
 
 class LcStateAPI(APIView):
     def get(self, request):
-        
-        state = State.objects.filter(country_id=request.query_params.get("country_id"))
-        serializer = StateSerializer(state, many=True)
-        
+        states = GeographyIndex.get_children("state", request.query_params.get("country_id"))
+
         return CustomResponse(
             response={
-                "states": serializer.data,
+                "states": states,
             }
         ).get_success_response()
 
 
 class LcCountryAPI(APIView):
     def get(self, request):
-        countries = Country.objects.all()
-
-        serializer = CountrySerializer(countries, many=True)
+        countries = GeographyIndex.get_children("country")
 
         return CustomResponse(
             response={
-                "countries": serializer.data,
+                "countries": countries,
             }
         ).get_success_response()
 
@@ -1,15 +1,14 @@
 from rest_framework import serializers
-from django.db.models import Sum
+from django.db.models import Count, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
 
 from db.user import User
 from db.organization import (
-    Country,
-    District,
     Organization,
-    State,
+    UserOrganizationLink,
 )
-from db.learning_circle import LearningCircle
-from db.task import KarmaActivityLog
+from db.learning_circle import LearningCircle, UserCircleLink
+from db.task import KarmaActivityLog, UserIgLink
 from db.user import User
 
 class LcListSerializer(serializers.ModelSerializer):
@@ -34,7 +33,27 @@ class LcListSerializer(serializers.ModelSerializer):
             'karma'
         ]
 
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the interest group and organisation and annotates the lead,
+        member count and karma of each circle, so a list of circles costs a
+        single query
+        """
+        accepted = UserCircleLink.objects.filter(circle=OuterRef('pk'), accepted=1).order_by()
+        karma = KarmaActivityLog.objects.filter(
+            user__user_circle_link_user__circle=OuterRef('pk'),
+        ).order_by().values('user__user_circle_link_user__circle').annotate(total=Sum('karma')).values('total')
+
+        return queryset.select_related('ig', 'org').annotate(
+            lead_name=Subquery(accepted.filter(lead=True).order_by('pk').values('user__full_name')[:1]),
+            member_count=Coalesce(Subquery(accepted.values('circle').annotate(count=Count('id')).values('count')), 0),
+            total_karma=Subquery(karma),
+        )
+
     def get_lead_name(self, obj):
+        if hasattr(obj, 'lead_name'):
+            return obj.lead_name
         user_circle_link = obj.user_circle_link_circle.filter(
             circle=obj,
             accepted=1,
@@ -44,6 +63,8 @@ class LcListSerializer(serializers.ModelSerializer):
         return user_circle_link.user.full_name if user_circle_link else None
 
     def get_member_count(self, obj):
+        if hasattr(obj, 'member_count'):
+            return obj.member_count
         return obj.user_circle_link_circle.filter(
             circle=obj,
             accepted=1
@@ -56,7 +77,9 @@ class LcListSerializer(serializers.ModelSerializer):
         )
 
     def get_karma(self, obj):
-        
+        if hasattr(obj, 'total_karma'):
+            return obj.total_karma or 0
+
         karma_activity_log = KarmaActivityLog.objects.filter(
             user__user_circle_link_user__circle=obj,
         ).aggregate(
@@ -111,22 +134,26 @@ class LcDetailsSerializer(serializers.ModelSerializer):
 
     def _get_member_info(self, obj, accepted):
 
-        members = obj.user_circle_link_circle.filter(
+        members = list(obj.user_circle_link_circle.filter(
             circle=obj,
             accepted=accepted
+        ).select_related('user__user_lvl_link_user__level'))
+
+        ig_karma = dict(
+            KarmaActivityLog.objects.filter(
+                task__ig=obj.ig_id,
+                user__in=[member.user_id for member in members],
+                appraiser_approved=True
+            ).values_list('user').annotate(
+                total_karma=Sum(
+                    'karma'
+                )).order_by()
         )
 
         member_info = []
 
         for member in members:
-            total_ig_karma = KarmaActivityLog.objects.filter(
-                task__ig=member.circle.ig,
-                user=member.user,
-                appraiser_approved=True
-            ).aggregate(
-                total_karma=Sum(
-                    'karma'
-                ))['total_karma'] or 0
+            total_ig_karma = ig_karma.get(member.user_id) or 0
 
             member_info.append({
                 'id': member.user.id,
@@ -159,19 +186,27 @@ class LcDetailsSerializer(serializers.ModelSerializer):
             id=obj.id
         )
 
-        for lc in all_learning_circles:
-            total_karma_lc = KarmaActivityLog.objects.filter(
-                user__user_circle_link_user__circle=lc,
+        # karma of every circle of the interest group, grouped by the circle
+        # of the accepted link that joined the log
+        circle_karma = dict(
+            KarmaActivityLog.objects.filter(
+                user__user_circle_link_user__circle__ig=obj.ig,
                 user__user_circle_link_user__accepted=True,
-                task__ig=lc.ig,
+                task__ig=obj.ig,
                 appraiser_approved=True
-            ).aggregate(
+            ).values_list(
+                'user__user_circle_link_user__circle'
+            ).annotate(
                 total_karma=Sum(
                     'karma'
                 )
-            )['total_karma'] or 0
+            ).order_by()
+        )
+
+        for lc_id, lc_name in all_learning_circles.values_list('id', 'name'):
+            total_karma_lc = circle_karma.get(lc_id) or 0
 
-            circle_ranks[lc.name] = {'total_karma': total_karma_lc}
+            circle_ranks[lc_name] = {'total_karma': total_karma_lc}
 
         sorted_ranks = sorted(
             circle_ranks.items(),
@@ -232,14 +267,25 @@ class UserLeaderboardSerializer(serializers.ModelSerializer):
             "organizations",
         )
 
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the wallet and prefetches the organisations and interest
+        groups of each user, so the leaderboard costs three queries
+        """
+        return queryset.select_related("wallet_user").prefetch_related(
+            Prefetch("user_organization_link_user", queryset=UserOrganizationLink.objects.select_related("org")),
+            Prefetch("user_ig_link_user", queryset=UserIgLink.objects.select_related("ig")),
+        )
+
     def get_full_name(self, obj):
         return obj.full_name
 
     def get_organizations(self, obj):
-        return obj.user_organization_link_user.all().values_list("org__title", flat=True)
+        return [link.org.title for link in obj.user_organization_link_user.all()]
 
     def get_interest_groups(self, obj):
-        return obj.user_ig_link_user.all().values_list("ig__name", flat=True)
+        return [link.ig.name for link in obj.user_ig_link_user.all()]
 
 
 
@@ -247,17 +293,3 @@ class OrgSerializer(serializers.ModelSerializer):
     class Meta:
         model = Organization
         fields = ["id", "title"]
-
-class DistrictSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = District
-        fields = ["id", "name"]
-
-class StateSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = State
-        fields = ["id", "name"]
-class CountrySerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Country
-        fields = ["id", "name"]
\ No newline at end of file
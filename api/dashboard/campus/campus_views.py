@@ -273,27 +273,12 @@ class CampusStudentDetailsCSVAPI(APIView):
                     is_alumni=F('user_organization_link_user__is_alumni'),
                 ))
 
-        paginated_queryset = CommonUtils.get_paginated_queryset(
+        return CommonUtils.generate_csv(
             user_org_links,
-            request,
-            ["full_name", "level"],
-            {
-                "full_name": "full_name",
-                "muid": "muid",
-                "karma": "wallet_user__karma",
-                "level": "user_lvl_link_user__level__level_order",
-                # "is_active": "karma_activity_log_user__created_at",
-                "join_date": "created_at",
-                "email": "email_",
-                "mobile": "mobile_",
-                "is_alumni": "is_alumni",
-            },
-        )
-
-        serializer = serializers.CampusStudentDetailsSerializer(
-            user_org_links, many=True, context={"ranks": ranks}
+            "Campus Student Details",
+            serializer=serializers.CampusStudentDetailsSerializer,
+            context={"ranks": ranks},
         )
-        return CommonUtils.generate_csv(serializer.data, "Campus Student Details")
 
 
 class WeeklyKarmaAPI(APIView):
@@ -11,9 +11,9 @@ from .serializer import (
 class CollegeApi(APIView):
     def get(self, request, college_code=None):
         if college_code:
-            colleges = College.objects.filter(id=college_code)
+            colleges = CollegeListSerializer.load(College.objects.filter(id=college_code))
         else:
-            colleges = College.objects.all().select_related("org")
+            colleges = CollegeListSerializer.load(College.objects.all())
 
         paginated_queryset = CommonUtils.get_paginated_queryset(
             colleges,
@@ -1,6 +1,7 @@
 from datetime import timedelta
 
-from django.db.models import Sum
+from django.db.models import Count, F, Func, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 
 from db.learning_circle import LearningCircle
@@ -29,50 +30,58 @@ class CollegeListSerializer(serializers.ModelSerializer):
             "no_of_alumni",
         ]
 
-    def get_no_of_alumni(self, obj):
-        return obj.org.user_organization_link_org.filter(
-            org__org_type=OrganizationType.COLLEGE.value,
-            user__user_role_link_user__role__title=RoleType.STUDENT.value,
-            is_alumni=True,
-            verified=True,
-        ).count()
-
-    def get_no_of_lc(self, obj):
-        learning_circle_count = LearningCircle.objects.filter(org=obj.org).count()
-        no_of_lc_increased = LearningCircle.objects.filter(org=obj.org,
-                                                           created_at__gte=DateTimeUtils.get_current_utc_time() - timedelta(
-                                                               days=30)).count()
-        return {'lc_count': learning_circle_count, 'no_of_lc_increased': no_of_lc_increased}
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the organization and annotates the member, learning circle,
+        alumni and karma totals of each college, overall and over the last
+        30 days, so a list of colleges costs a single query
+        """
+        since = DateTimeUtils.get_current_utc_time() - timedelta(days=30)
 
-    def get_number_of_members(self, obj):
-        member_count = obj.org.user_organization_link_org.all().count()
+        def count(rows):
+            return Coalesce(Subquery(rows.order_by().values('org').annotate(count=Count('id')).values('count')), 0)
 
-        no_of_members_increased = obj.org.user_organization_link_org.filter(
-            created_at__gte=DateTimeUtils.get_current_utc_time() - timedelta(days=30)
-        ).count()
-        return {'member_count': member_count, 'no_of_members_increased': no_of_members_increased}
+        def karma(rows):
+            total = rows.order_by().annotate(total=Func(F('karma'), function='SUM')).values('total')
+            return Coalesce(Subquery(total, output_field=IntegerField()), 0)
 
-    def get_total_karma(self, obj):
-        user_org_links = UserOrganizationLink.objects.filter(
-            org=obj.org,
+        links = UserOrganizationLink.objects.filter(org=OuterRef('org'))
+        circles = LearningCircle.objects.filter(org=OuterRef('org'))
+        college_users = UserOrganizationLink.objects.filter(
+            org=OuterRef(OuterRef('org')),
             org__org_type=OrganizationType.COLLEGE.value,
             verified=True
-        )
-        total_karma_gained = (
-                KarmaActivityLog.objects.filter(
-                    user__in=user_org_links.values('user'),
-                ).aggregate(total_karma=Sum("karma"))["total_karma"]
-                or 0
-        )
+        ).values('user')
+        karma_logs = KarmaActivityLog.objects.filter(user__in=college_users)
 
-        total_karma_increased = (
-                KarmaActivityLog.objects.filter(
-                    user__in=user_org_links.values('user'),
-                    created_at__gte=DateTimeUtils.get_current_utc_time() - timedelta(
-                        days=30),
-                ).aggregate(total_karma=Sum("karma"))["total_karma"]
-                or 0
+        return queryset.select_related('org').annotate(
+            alumni_count=count(links.filter(
+                org__org_type=OrganizationType.COLLEGE.value,
+                user__user_role_link_user__role__title=RoleType.STUDENT.value,
+                is_alumni=True,
+                verified=True,
+            )),
+            lc_count=count(circles),
+            lc_increased=count(circles.filter(created_at__gte=since)),
+            member_count=count(links),
+            members_increased=count(links.filter(created_at__gte=since)),
+            karma_gained=karma(karma_logs),
+            karma_increased=karma(karma_logs.filter(created_at__gte=since)),
         )
+
+    def get_no_of_alumni(self, obj):
+        return obj.alumni_count
+
+    def get_no_of_lc(self, obj):
+        return {'lc_count': obj.lc_count, 'no_of_lc_increased': obj.lc_increased}
+
+    def get_number_of_members(self, obj):
+        return {'member_count': obj.member_count, 'no_of_members_increased': obj.members_increased}
+
+    def get_total_karma(self, obj):
+        total_karma_gained = obj.karma_gained
+        total_karma_increased = obj.karma_increased
         try:
             increased_percentage = (total_karma_increased / total_karma_gained) * 100
         except Exception as e:
@@ -14,7 +14,7 @@ class TaskList(APIView):
     authentication_classes = [CustomizePermission]
 
     def get(self, request):
-        tasks = KarmaActivityLog.objects.all()
+        tasks = KarmaActivityLog.objects.select_related("user", "task")
         paginated_queryset = CommonUtils.get_paginated_queryset(
             tasks,
             request,
@@ -65,7 +65,7 @@ class LeaderBoard(APIView):
         logs_with_approval = KarmaActivityLog.objects.filter(
             Q(**{f"{approval_field}__isnull": False}
               ) & ~Q(**{approval_field: ''})
-        )
+        ).select_related(approval_field)
 
         data = defaultdict(lambda: {"count": 0, "muid": None})
 
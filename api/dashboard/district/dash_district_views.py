@@ -103,7 +103,7 @@ class DistrictStudentDetailsAPI(APIView):
                 user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
             )
             .distinct()
-            .order_by("-karma", '-update_at', "created_at")
+            .order_by("-karma", "-updated_at", "created_at")
             .values(
                 "user_id",
                 "karma",
@@ -1,4 +1,5 @@
 import uuid
+from collections import defaultdict
 
 from rest_framework import serializers
 from django.db.models import Q
@@ -49,12 +50,19 @@ class DynamicRoleCreateSerializer(serializers.ModelSerializer):
 class DynamicRoleListSerializer(serializers.ModelSerializer):
     roles = serializers.SerializerMethodField()
 
+    @staticmethod
+    def load(types):
+        """
+        Groups the dynamic roles of the given types by type, for the "roles"
+        context of the serializer, so a page of types costs a single query
+        """
+        roles = defaultdict(list)
+        for dynamic_role in DynamicRole.objects.filter(type__in=types).values_list('type', 'id', 'role__title'):
+            roles[dynamic_role[0]].append({'id': dynamic_role[1], 'role': dynamic_role[2]})
+        return roles
+
     def get_roles(self, obj):
-        dynamic_roles = DynamicRole.objects.filter(type=obj['type']).values_list('id', 'role__title')
-        return [
-            {'id': dynamic_role[0], 'role': dynamic_role[1]}
-            for dynamic_role in dynamic_roles
-        ]
+        return self.context['roles'][obj['type']]
 
     class Meta:
         model = DynamicRole
@@ -130,18 +138,25 @@ class DynamicUserCreateSerializer(serializers.ModelSerializer):
 class DynamicUserListSerializer(serializers.ModelSerializer):
     users = serializers.SerializerMethodField()
 
-    def get_users(self, obj):
-        dynamic_users = DynamicUser.objects.filter(type=obj['type'])
-        return [
-            {
+    @staticmethod
+    def load(types):
+        """
+        Groups the dynamic users of the given types by type, for the "users"
+        context of the serializer, so a page of types costs a single query
+        """
+        users = defaultdict(list)
+        for dynamic_user in DynamicUser.objects.filter(type__in=types).select_related('user'):
+            users[dynamic_user.type].append({
                 'dynamic_user_id': dynamic_user.id,
                 'user_id': dynamic_user.user.id,
                 'full_name': dynamic_user.user.full_name,
                 'muid': dynamic_user.user.muid,
                 'email': dynamic_user.user.email,
-            }
-            for dynamic_user in dynamic_users
-        ]
+            })
+        return users
+
+    def get_users(self, obj):
+        return self.context['users'][obj['type']]
 
     class Meta:
         model = DynamicUser
@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
 
 from db.user import DynamicRole, Role, DynamicUser
-from utils.permission import CustomizePermission, JWTUtils, role_required
+from utils.permission import CustomizePermission, DynamicPermissionTable, JWTUtils, role_required
 from utils.response import CustomResponse
 from utils.types import RoleType, ManagementType
 from utils.utils import CommonUtils
@@ -18,6 +18,7 @@ class DynamicRoleAPI(APIView):
         serializer = DynamicRoleCreateSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
+            DynamicPermissionTable.invalidate()
             return CustomResponse(general_message='Dynamic Role created successfully',
                                   response=serializer.data).get_success_response()
         return CustomResponse(message=serializer.errors).get_failure_response()
@@ -33,7 +34,10 @@ class DynamicRoleAPI(APIView):
             sort_fields={'type': 'type',
                          'role': 'role__title'}
         )
-        dynamic_role_serializer = DynamicRoleListSerializer(paginated_queryset.get('queryset'), many=True).data
+        types = [role['type'] for role in paginated_queryset.get('queryset')]
+        dynamic_role_serializer = DynamicRoleListSerializer(
+            paginated_queryset.get('queryset'), many=True,
+            context={'roles': DynamicRoleListSerializer.load(types)}).data
         return CustomResponse().paginated_response(data=dynamic_role_serializer,
                                                    pagination=paginated_queryset.get('pagination'))
 
@@ -41,6 +45,7 @@ class DynamicRoleAPI(APIView):
     def delete(self, request, type_id):  # delete
         if dynamic_role := DynamicRole.objects.filter(id=type_id).first():
             DynamicRoleUpdateSerializer().destroy(dynamic_role)
+            DynamicPermissionTable.invalidate()
             return CustomResponse(
                 general_message='Dynamic Role successfully deleted'
             ).get_success_response()
@@ -56,6 +61,7 @@ class DynamicRoleAPI(APIView):
         serializer = DynamicRoleUpdateSerializer(dynamic_role, data=request.data, context=context)
         if serializer.is_valid():
             serializer.save()
+            DynamicPermissionTable.invalidate()
             return CustomResponse(general_message='Dynamic Role updated successfully').get_success_response()
         return CustomResponse(message=serializer.errors).get_failure_response()
 
@@ -68,6 +74,7 @@ class DynamicUserAPI(APIView):
         serializer = DynamicUserCreateSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
+            DynamicPermissionTable.invalidate()
             return CustomResponse(general_message='Dynamic User created successfully',
                                   response=serializer.data).get_success_response()
         return CustomResponse(message=serializer.errors).get_failure_response()
@@ -83,7 +90,10 @@ class DynamicUserAPI(APIView):
             sort_fields={'type': 'type',
                          'user': 'user__full_name'}
         )
-        dynamic_user_serializer = DynamicUserListSerializer(paginated_queryset.get('queryset'), many=True).data
+        types = [user['type'] for user in paginated_queryset.get('queryset')]
+        dynamic_user_serializer = DynamicUserListSerializer(
+            paginated_queryset.get('queryset'), many=True,
+            context={'users': DynamicUserListSerializer.load(types)}).data
         return CustomResponse().paginated_response(data=dynamic_user_serializer,
                                                    pagination=paginated_queryset.get('pagination'))
 
@@ -91,6 +101,7 @@ class DynamicUserAPI(APIView):
     def delete(self, request, type_id):
         if dynamic_user := DynamicUser.objects.filter(id=type_id).first():
             DynamicUserUpdateSerializer().destroy(dynamic_user)
+            DynamicPermissionTable.invalidate()
             return CustomResponse(
                 general_message='Dynamic User successfully deleted'
             ).get_success_response()
@@ -106,6 +117,7 @@ class DynamicUserAPI(APIView):
         serializer = DynamicUserUpdateSerializer(dynamic_user, data=request.data, context=context)
         if serializer.is_valid():
             serializer.save()
+            DynamicPermissionTable.invalidate()
             return CustomResponse(general_message='Dynamic User updated successfully').get_success_response()
         return CustomResponse(message=serializer.errors).get_failure_response()
 
@@ -2,14 +2,21 @@ import logging
 import os
 
 from django.conf import settings
-from django.http import FileResponse
 from rest_framework.views import APIView
 
+from utils.error_log_index import ErrorLogIndexer
 from utils.permission import CustomizePermission, role_required
 from utils.response import CustomResponse
 from utils.types import RoleType
+from utils.utils import ChunkedStreamingHttpResponse
 
-from .log_helper import ManageURLPatterns, logHandler
+from .log_helper import LogReader, ManageURLPatterns
+
+# Lines of a log page, by default and at most
+LOG_VIEW_LINES = 500
+LOG_VIEW_MAX_LINES = 5000
+# Bytes of a log page read by byte range at most
+LOG_VIEW_MAX_BYTES = 1024 * 1024
 
 
 class DownloadErrorLogAPI(APIView):
@@ -19,16 +26,29 @@ class DownloadErrorLogAPI(APIView):
         [RoleType.ADMIN.value, RoleType.FELLOW.value, RoleType.TECH_TEAM.value]
     )
     def get(self, request, log_name):
+        """
+        Streams the log, or only its records of the `level` and `path` query
+        params, gzip-compressed when the client accepts it.
+        """
         error_log = f"{settings.LOG_PATH}/{log_name}.log"
-        if os.path.exists(error_log):
-            response = FileResponse(
-                open(error_log, "rb"), content_type="application/octet-stream"
-            )
-            response["Content-Disposition"] = f'attachment; filename="{log_name}"'
-            return response
-        return CustomResponse(
-            general_message=f"{log_name} Not Found"
-        ).get_failure_response()
+        if not os.path.exists(error_log):
+            return CustomResponse(
+                general_message=f"{log_name} Not Found"
+            ).get_failure_response()
+
+        compress = "gzip" in request.headers.get("Accept-Encoding", "")
+        reader = LogReader(
+            open(error_log, "rb"),
+            level=request.query_params.get("level"),
+            path=request.query_params.get("path"),
+        )
+        response = ChunkedStreamingHttpResponse(
+            reader.stream(compress), content_type="application/octet-stream"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{log_name}"'
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        return response
 
 
 class ViewErrorLogAPI(APIView):
@@ -38,20 +58,59 @@ class ViewErrorLogAPI(APIView):
         [RoleType.ADMIN.value, RoleType.FELLOW.value, RoleType.TECH_TEAM.value]
     )
     def get(self, request, log_name):
+        """
+        Returns a page of the log. By default the last `lines` lines, older
+        lines with a `before` cursor, newer lines with an `after` cursor or
+        the whole lines of a byte range with `offset` and `length`.
+
+        The `start` and `end` of a page are the cursors of the previous and
+        next pages. `level` and `path` keep only the matching records.
+        """
         error_log = f"{settings.LOG_PATH}/{log_name}.log"
-        if os.path.exists(error_log):
-            try:
-                with open(error_log, "r") as log_file:
-                    log_content = log_file.read()
-                return CustomResponse(response=log_content).get_success_response()
-            except Exception as e:
-                return CustomResponse(
-                    general_message="Error reading log file"
-                ).get_failure_response()
+        if not os.path.exists(error_log):
+            return CustomResponse(
+                general_message=f"{log_name} Not Found"
+            ).get_failure_response()
 
-        return CustomResponse(
-            general_message=f"{log_name} Not Found"
-        ).get_failure_response()
+        try:
+            params = {
+                key: int(value)
+                for key in ["lines", "before", "after", "offset", "length"]
+                if (value := request.query_params.get(key)) is not None
+            }
+        except ValueError:
+            return CustomResponse(
+                general_message="lines, before, after, offset and length must be integers"
+            ).get_failure_response()
+
+        if any(value < 0 for value in params.values()):
+            return CustomResponse(
+                general_message="lines, before, after, offset and length must not be negative"
+            ).get_failure_response()
+
+        count = min(params.get("lines", LOG_VIEW_LINES), LOG_VIEW_MAX_LINES)
+        try:
+            with open(error_log, "rb") as log_file:
+                reader = LogReader(
+                    log_file,
+                    level=request.query_params.get("level"),
+                    path=request.query_params.get("path"),
+                )
+                if "offset" in params:
+                    page = reader.read_range(
+                        params["offset"],
+                        min(params.get("length", LOG_VIEW_MAX_BYTES), LOG_VIEW_MAX_BYTES),
+                    )
+                elif "after" in params:
+                    page = reader.head(count, params["after"])
+                else:
+                    page = reader.tail(count, params.get("before"))
+        except IOError:
+            return CustomResponse(
+                general_message="Error reading log file"
+            ).get_failure_response()
+
+        return CustomResponse(response=page).get_success_response()
 
 
 class ClearErrorLogAPI(APIView):
@@ -64,8 +123,9 @@ class ClearErrorLogAPI(APIView):
         error_log = f"{settings.LOG_PATH}/{log_name}.log"
         if os.path.exists(error_log):
             try:
-                with open(error_log, "w") as log_file:
-                    log_file.truncate(0)
+                os.truncate(error_log, 0)
+                if log_name == ErrorLogIndexer.log_name:
+                    ErrorLogIndexer.clear()
                 return CustomResponse(
                     general_message=f"{log_name} log cleared successfully"
                 ).get_success_response()
@@ -120,15 +180,12 @@ class LoggerAPI(APIView):
             >>> logger_api = LoggerAPI()
             >>> response = logger_api.get(request)
         """
-        error_log = f"{settings.LOG_PATH}/error.log"
         try:
-            with open(error_log, "r") as file:
-                log_data = file.read()
+            ErrorLogIndexer.refresh(settings.ERROR_LOG_INDEX_CHUNK_SIZE)
         except IOError as e:
             return CustomResponse(response=str(e)).get_failure_response()
 
-        log_handler = logHandler(log_data)
-        formatted_errors = log_handler.parse_logs()
+        formatted_errors = ErrorLogIndexer.get_errors()
         return CustomResponse(response=formatted_errors).get_success_response()
 
     @role_required(
@@ -151,6 +208,10 @@ class LoggerAPI(APIView):
         """
         logger = logging.getLogger("django")
         logger.error(f"PATCHED : {error_id}")
+        try:
+            ErrorLogIndexer.refresh(settings.ERROR_LOG_INDEX_CHUNK_SIZE)
+        except IOError as e:
+            return CustomResponse(response=str(e)).get_failure_response()
         return CustomResponse(response="Updated patch list").get_success_response()
 
 
@@ -182,17 +243,12 @@ class ErrorGraphAPI(APIView):
 
         """
         try:
-            error_log = f"{settings.LOG_PATH}/error.log"
-
-            with open(error_log, "r") as file:
-                log_data = file.read()
-
-            log_handler = logHandler(log_data)
+            ErrorLogIndexer.refresh(settings.ERROR_LOG_INDEX_CHUNK_SIZE)
 
             formatted_errors = {
-                "heatmap": log_handler.get_urls_heatmap(),
-                "incident_info": log_handler.get_incident_info(),
-                "affected_users": log_handler.get_affected_users(),
+                "heatmap": ErrorLogIndexer.get_urls_heatmap(),
+                "incident_info": ErrorLogIndexer.get_incident_info(),
+                "affected_users": ErrorLogIndexer.get_affected_users(),
             }
 
             return CustomResponse(response=formatted_errors).get_success_response()
@@ -229,13 +285,8 @@ class ErrorTabAPI(APIView):
 
         """
         try:
-            error_log = f"{settings.LOG_PATH}/error.log"
-
-            with open(error_log, "r") as file:
-                log_data = file.read()
-
-            log_handler = logHandler(log_data)
-            parsed_errors = log_handler.parse_logs()
+            ErrorLogIndexer.refresh(settings.ERROR_LOG_INDEX_CHUNK_SIZE)
+            parsed_errors = ErrorLogIndexer.get_errors()
         
             urlpatterns = ManageURLPatterns().urlpatterns
             grouped_patterns = ManageURLPatterns.group_patterns(urlpatterns)
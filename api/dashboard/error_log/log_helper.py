@@ -1,13 +1,10 @@
-import json
+import os
 import re
+import zlib
 from collections import defaultdict
-from datetime import datetime, timezone
 
 from django.urls import Resolver404, URLPattern, URLResolver, get_resolver, resolve
 
-from db.user import User
-from utils.utils import DateTimeUtils
-
 
 def check_url_match(url_to_check: str, pattern_to_match: str) -> bool:
     """
@@ -103,215 +100,211 @@ class ManageURLPatterns:
         return grouped_apis
 
 
-class logHandler:
-    def __init__(self, log_data) -> None:
-        self.log_data = log_data
-        self.log_pattern = (
-            r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ERROR EXCEPTION INFO:"
-            r".*?(?=\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ERROR EXCEPTION INFO:|\Z)"
-        )
-        # Log entries their types and how to find them
-        self.log_entries = {
-            "id": {"regex": r"ID: (.+?)\n(?=TYPE:)", "type": str},
-            "timestamp": {"regex": r"\n(.+?) ERROR.*", "type": datetime},
-            "type": {"regex": r"TYPE: (.+?)\n(?=MESSAGE:)", "type": str},
-            "message": {"regex": r"MESSAGE: (.+?)\n(?=METHOD:)", "type": str},
-            "method": {"regex": r"METHOD: (.+?)\n(?=PATH:)", "type": str},
-            "path": {"regex": r"PATH: (.+?)\n(?=AUTH:)", "type": str},
-            "auth": {"regex": r"AUTH: \n(.+?)\n(?=BODY:)", "type": dict},
-            "body": {"regex": r"BODY: \n(.+?)\n(?=TRACEBACK:)", "type": dict},
-            "traceback": {"regex": r"TRACEBACK: (.+)$", "type": str},
-        }
-
-    def parse_logs(self) -> list[dict]:
-        """parse a log value as str and convert it into
-        appropriate types
-
-        Returns:
-            list[dict]: formatted errors
-        """
-        self.patch_pattern = (
-            r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) ERROR PATCHED : (\w+)"
-        )
-        self.patched_errors = self.extract_patches(self.log_data)
+class LogReader:
+    """
+    Reads pages of a log file around a byte cursor.
 
-        # Extract all logs in string format
-        matches = reversed(re.findall(self.log_pattern, self.log_data, re.DOTALL))
-        formatted_errors = {}
-        for error in matches:
-            # Separate each item in log
-            log_entry = self.extract_log_entry(error)
-            # combine them all to formatted_errors dict
-            self.aggregate_log_entry(formatted_errors, log_entry)
+    Tails are read backwards in blocks from the end of the file, or from a
+    `before` cursor, so their cost depends on the page and not on the size of
+    the log. When a level or path filter is given, lines are grouped into
+    records, a header line and the traceback lines following it, and whole
+    matching records are returned.
+    """
 
-        return formatted_errors.values()
+    BLOCK_SIZE = 64 * 1024
+    RECORD_HEADER = re.compile(rb"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ([A-Z]+) ")
 
-    def extract_patches(self, log_data):
-        return {
-            patch[2]: self.get_formatted_time(patch[1])
-            for patch in re.finditer(self.patch_pattern, log_data)
-        }
+    def __init__(self, log_file, level: str = None, path: str = None):
+        self.log_file = log_file
+        self.size = os.fstat(log_file.fileno()).st_size
+        self.level = level.upper().encode() if level else None
+        self.path = path.encode() if path else None
 
-    def extract_log_entry(self, error: str) -> dict:
-        """fetch the value from the details of how to
-        find it provided by the regex
+    @property
+    def is_filtered(self) -> bool:
+        return bool(self.level or self.path)
 
-        Args:
-            error (str): the single matching error str
+    def matches(self, lines: list[bytes]) -> bool:
+        if self.level:
+            header = self.RECORD_HEADER.match(lines[0])
+            if not header or header[1] != self.level:
+                return False
+        return not self.path or any(self.path in line for line in lines)
 
-        Returns:
-            dict: extracted log entry
+    def lines_before(self, end: int):
         """
-        values = self.get_values(error, *self.get_patterns())
-        result_dict = {}
-
-        for key, value in values.items():
-            entry_type = self.log_entries[key]["type"]
-
-            if entry_type == datetime:
-                result_dict[key] = self.get_formatted_time(value)
-            elif entry_type == dict and value:
-                result_dict[key] = json.loads(value)
-            else:
-                result_dict[key] = value
-
-        return result_dict
-
-    def get_formatted_time(self, extracted_timestamp: str) -> datetime:
-        """convert datetime from error log to readable datetime
-
-        Args:
-            extracted_timestamp (str): string datetime from error log
-
-        Returns:
-            datetime: converted datetime object
+        Yields the (offset, line) pairs ending before `end`, last line first.
         """
-        return datetime.strptime(
-            extracted_timestamp.replace(",", "."), "%Y-%m-%d %H:%M:%S.%f"
-        )
-
-    def get_values(self, error: str, *patterns: str) -> dict:
-        """fetches all values with the regex patterns
-
-        Args:
-            error (str): error string from log
-
-        Returns:
-            dict: fetched values
+        remainder = b""
+        position = end
+        while position > 0:
+            size = min(self.BLOCK_SIZE, position)
+            position -= size
+            self.log_file.seek(position)
+            lines = (self.log_file.read(size) + remainder).split(b"\n")
+            remainder = lines.pop(0)
+            if position + size == end and lines and not lines[-1]:
+                lines.pop()
+
+            offsets = []
+            offset = position + len(remainder) + 1
+            for line in lines:
+                offsets.append(offset)
+                offset += len(line) + 1
+            yield from reversed(list(zip(offsets, lines)))
+
+        if end:
+            yield 0, remainder
+
+    def lines_after(self, start: int):
         """
-        return {
-            attr: self.extract_value(error, pattern)
-            for attr, pattern in zip(self.log_entries.keys(), patterns)
-        }
-
-    def extract_value(self, error: str, pattern: str) -> str:
-        """fetches a given value from the error with
-        the provided regex
-
-        Args:
-            error (str): error string from log
-            pattern (str): regex pattern
-
-        Returns:
-            str: fetched value
+        Yields the complete (offset, line) pairs from `start` on.
         """
-        return value[1] if (value := re.search(pattern, error, re.DOTALL)) else None
-
-    def get_patterns(self) -> list:
-        """fetches all regex patterns
-
-        Returns:
-            list: regex patterns
+        self.log_file.seek(start)
+        offset = start
+        for line in self.log_file:
+            if not line.endswith(b"\n"):
+                break
+            yield offset, line[:-1]
+            offset += len(line)
+
+    def records_before(self, end: int):
+        record = []
+        for offset, line in self.lines_before(end):
+            record.insert(0, line)
+            if offset == 0 or self.RECORD_HEADER.match(line):
+                yield offset, record
+                record = []
+
+    def group_records(self, lines):
         """
-        values = self.log_entries.values()
-        return [value["regex"] for value in values]
-
-    def already_patched(self, log_entry: dict) -> bool:
-        """checks if log entry id is in patched
-        errors and its timestamp is before the error was patched
+        Groups (offset, line) pairs in file order into (offset, record) pairs.
         """
-        return (
-            log_entry["id"] in self.patched_errors
-            and log_entry["timestamp"] < self.patched_errors[log_entry["id"]]
-        )
-
-    def aggregate_log_entry(
-        self, formatted_errors: list[dict], log_entry: dict
-    ) -> None:
-        """combines all fetched error into one
-
-        Args:
-            formatted_errors (list[dict]): the list to add everything into
-            log_entry (dict):   current log entry
+        record, record_offset = [], None
+        for offset, line in lines:
+            if record and self.RECORD_HEADER.match(line):
+                yield record_offset, record
+                record = []
+            if not record:
+                record_offset = offset
+            record.append(line)
+        if record:
+            yield record_offset, record
+
+    def records_after(self, start: int):
+        return self.group_records(self.lines_after(start))
+
+    def tail(self, count: int, before: int = None) -> dict:
         """
-        if not self.already_patched(log_entry):
-            log_id = log_entry["id"]
-            log_keys = self.log_entries.keys()
-            if log_id not in formatted_errors:
-                formatted_errors[log_id] = {
-                    key: [] if key != "id" else log_id for key in log_keys
-                }
-            for key in log_keys:
-                if (
-                    key != "id"
-                    and log_entry[key]
-                    and log_entry[key] not in formatted_errors[log_id][key]
-                ):
-                    formatted_errors[log_id][key].append(log_entry[key])
-
-    def get_urls_heatmap(self):
-        """get the number of times each url is hit
-
-        Args:
-            urlpatterns (list): the list of url patterns
-
-        Returns:
-            dict: the number of times each url is hit
+        Returns the last `count` lines, or matching records, ending before the
+        `before` cursor, by default the end of the file.
         """
-        url_hits = {}
-
-        for url_hit in re.finditer(self.log_entries["path"]["regex"], self.log_data):
-            hit = url_hit.group(1)
-            resolved = resolve(hit)
-            matched_pattern = resolved.route
-
-            if matched_pattern in url_hits:
-                url_hits[matched_pattern] += 1
-            else:
-                url_hits[matched_pattern] = 1
+        end = self.size if before is None else min(before, self.size)
+        lines, start = [], end
+        records = self.records_before(end) if self.is_filtered else (
+            (offset, [line]) for offset, line in self.lines_before(end)
+        )
 
-        return url_hits
+        for offset, record in records:
+            if len(lines) >= count:
+                break
+            start = offset
+            if not self.is_filtered or self.matches(record):
+                lines[:0] = record
 
-    def get_incident_info(self):
-        """Get the time since the last incident in UTC.
+        return self.get_page(lines, start, end)
 
-        Returns:
-            str: The time since the last incident in UTC.
+    def head(self, count: int, after: int) -> dict:
         """
-        last_incident = re.findall(
-            self.log_entries["timestamp"]["regex"], self.log_data
-        )[-1]
-
-        last_incident_datetime = self.get_formatted_time(last_incident).replace(
-            tzinfo=timezone.utc
+        Returns the first `count` lines, or matching records, from the
+        `after` cursor on.
+        """
+        start = min(after, self.size)
+        lines, end = [], start
+        records = self.records_after(start) if self.is_filtered else (
+            (offset, [line]) for offset, line in self.lines_after(start)
         )
-        current_datetime = DateTimeUtils.get_current_utc_time()
 
-        time_since_then = current_datetime - last_incident_datetime
+        for offset, record in records:
+            if len(lines) >= count:
+                break
+            end = offset + sum(len(line) + 1 for line in record)
+            if not self.is_filtered or self.matches(record):
+                lines.extend(record)
+
+        return self.get_page(lines, start, end)
 
+    def read_range(self, offset: int, length: int) -> dict:
+        """
+        Returns the whole lines within `length` bytes from `offset`. A line
+        cut by `offset` is skipped, one cut by the end of the range is left
+        for the next read.
+        """
+        start = min(offset, self.size)
+        if start:
+            self.log_file.seek(start - 1)
+            if self.log_file.read(1) != b"\n":
+                start += len(self.log_file.readline())
+
+        self.log_file.seek(start)
+        data = self.log_file.read(length)
+        end = start + data.rfind(b"\n") + 1
+        lines = data[:end - start].split(b"\n")[:-1]
+        if self.is_filtered:
+            offsets = range(len(lines))
+            lines = [
+                line
+                for _, record in self.group_records(zip(offsets, lines))
+                if self.matches(record)
+                for line in record
+            ]
+
+        return self.get_page(lines, start, end)
+
+    def get_page(self, lines: list[bytes], start: int, end: int) -> dict:
         return {
-            "last_incident": last_incident_datetime,
-            "time_since_then": time_since_then.total_seconds(),
+            "lines": [line.decode("utf-8", errors="replace") for line in lines],
+            "start": start,
+            "end": end,
+            "size": self.size,
+            "has_previous": start > 0,
+            "has_next": end < self.size,
         }
 
-    def get_affected_users(self):
-        """Get the number of affected users.
-
-        Returns:
-            int: The number of affected users.
+    def stream(self, compress: bool = False, chunk_size: int = 256 * 1024):
         """
-        affected_users = set(
-            re.findall(r"\n *\"muid\" *: * \"(.+?@mulearn)\",", self.log_data)
-        )
+        Yields the log, or its matching records, in chunks, gzip-compressed
+        on the fly when `compress` is set. The file is closed once the stream
+        is exhausted or closed.
+        """
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
 
-        return (len(affected_users) / User.objects.count()) * 100
+        with self.log_file:
+            if self.is_filtered:
+                chunks = self._filtered_chunks(chunk_size)
+            else:
+                self.log_file.seek(0)
+                chunks = iter(lambda: self.log_file.read(chunk_size), b"")
+
+            for chunk in chunks:
+                if compressor is None:
+                    yield chunk
+                elif chunk := compressor.compress(chunk):
+                    yield chunk
+
+        if compressor is not None:
+            yield compressor.flush()
+
+    def _filtered_chunks(self, chunk_size: int):
+        buffer = []
+        buffered = 0
+        for _, record in self.records_after(0):
+            if not self.matches(record):
+                continue
+            for line in record:
+                buffer.append(line + b"\n")
+                buffered += len(line) + 1
+            if buffered >= chunk_size:
+                yield b"".join(buffer)
+                buffer, buffered = [], 0
+        yield b"".join(buffer)
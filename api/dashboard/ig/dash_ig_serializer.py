@@ -1,7 +1,9 @@
 
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 
-from db.task import InterestGroup
+from db.task import InterestGroup, UserIgLink
 
 
 class InterestGroupSerializer(serializers.ModelSerializer):
@@ -24,8 +26,21 @@ class InterestGroupSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the audit users and annotates the member count of each
+        interest group, so a list of interest groups costs a single query
+        """
+        links = UserIgLink.objects.filter(ig=OuterRef('pk')).order_by().values('ig')
+        return queryset.select_related('created_by', 'updated_by').annotate(
+            members=Coalesce(Subquery(links.annotate(count=Count('id')).values('count')), 0)
+        )
+
     def get_members(self, obj):
-        return obj.user_ig_link_ig.all().count()
+        if hasattr(obj, 'members'):
+            return obj.members
+        return obj.user_ig_link_ig.count()
 
 
 class InterestGroupCreateUpdateSerializer(serializers.ModelSerializer):
@@ -1,4 +1,3 @@
-from django.db.models import Count
 from rest_framework.views import APIView
 
 from db.task import InterestGroup
@@ -19,11 +18,7 @@ class InterestGroupAPI(APIView):
 
     @role_required([RoleType.ADMIN.value])
     def get(self, request):
-        ig_queryset = (
-            InterestGroup.objects.select_related("created_by", "updated_by")
-            .prefetch_related("user_ig_link_ig").annotate(members=Count("user_ig_link_ig"))
-            .all()
-        )
+        ig_queryset = InterestGroupSerializer.load(InterestGroup.objects.all())
         paginated_queryset = CommonUtils.get_paginated_queryset(
             ig_queryset,
             request,
@@ -199,11 +194,7 @@ class InterestGroupCSV(APIView):
 
     @role_required([RoleType.ADMIN.value])
     def get(self, request):
-        ig_serializer = (
-            InterestGroup.objects.select_related("created_by", "updated_by")
-            .prefetch_related("user_ig_link_ig").annotate(members=Count("user_ig_link_ig"))
-            .all()
-        )
+        ig_serializer = InterestGroupSerializer.load(InterestGroup.objects.all())
 
         ig_serializer_data = InterestGroupSerializer(ig_serializer, many=True).data
 
@@ -231,7 +222,7 @@ class InterestGroupGetAPI(APIView):
 
 class InterestGroupListApi(APIView):
     def get(self, request):
-        ig = InterestGroup.objects.all()
+        ig = InterestGroupSerializer.load(InterestGroup.objects.all())
 
         serializer = InterestGroupSerializer(ig, many=True)
 
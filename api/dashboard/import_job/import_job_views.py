@@ -0,0 +1,66 @@
+from rest_framework.views import APIView
+
+from db.import_job import ImportJob, ImportJobRow
+from utils.permission import CustomizePermission, JWTUtils
+from utils.response import CustomResponse
+from utils.types import ImportJobRowStatus, RoleType
+from utils.utils import CommonUtils
+from .serializers import ImportJobRowSerializer, ImportJobSerializer
+
+
+def get_import_job(request, job_id):
+    """
+    Returns the job if it was uploaded by the requesting user or the user is an admin.
+    """
+    jobs = ImportJob.objects.select_related("created_by").filter(id=job_id)
+    if RoleType.ADMIN.value not in JWTUtils.fetch_role(request):
+        jobs = jobs.filter(created_by_id=JWTUtils.fetch_user_id(request))
+    return jobs.defer("file").first()
+
+
+class ImportJobAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    def get(self, request, job_id):
+        job = get_import_job(request, job_id)
+        if job is None:
+            return CustomResponse(
+                general_message="Import job not found."
+            ).get_failure_response()
+
+        failed_rows = ImportJobRow.objects.filter(
+            job_id=job.id, status=ImportJobRowStatus.FAILED.value
+        ).order_by("created_at").values_list("data", flat=True)
+
+        return CustomResponse(
+            response=ImportJobSerializer(job).data | {"Failed": list(failed_rows)}
+        ).get_success_response()
+
+
+class ImportJobRowAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    def get(self, request, job_id):
+        job = get_import_job(request, job_id)
+        if job is None:
+            return CustomResponse(
+                general_message="Import job not found."
+            ).get_failure_response()
+
+        rows = ImportJobRow.objects.filter(job_id=job.id).order_by("created_at")
+        if (row_status := request.query_params.get("status")) is not None:
+            if row_status not in ImportJobRowStatus.get_all_values():
+                return CustomResponse(
+                    general_message=f"Invalid status: {row_status}"
+                ).get_failure_response()
+            rows = rows.filter(status=row_status)
+
+        paginated_queryset = CommonUtils.get_paginated_queryset(rows, request, [])
+        serializer = ImportJobRowSerializer(
+            paginated_queryset.get("queryset"), many=True
+        )
+
+        return CustomResponse().paginated_response(
+            data=serializer.data,
+            pagination=paginated_queryset.get("pagination")
+        )
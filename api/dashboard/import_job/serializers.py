@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+from db.import_job import ImportJob, ImportJobRow
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    created_by = serializers.CharField(source="created_by.full_name")
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "type",
+            "status",
+            "file_name",
+            "total_rows",
+            "processed_rows",
+            "success_count",
+            "failed_count",
+            "message",
+            "started_at",
+            "completed_at",
+            "created_by",
+            "created_at",
+        ]
+
+
+class ImportJobRowSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJobRow
+        fields = ["id", "status", "data", "created_at"]
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import import_job_views
+
+urlpatterns = [
+    path('<str:job_id>/', import_job_views.ImportJobAPI.as_view()),
+    path('<str:job_id>/rows/', import_job_views.ImportJobRowAPI.as_view()),
+]
@@ -0,0 +1,186 @@
+import uuid
+
+import decouple
+from django.db import transaction
+
+from db.task import TaskList
+from db.user import User
+from utils.import_job import ImportJobError
+from utils.karma_voucher import allocate_voucher_codes, get_karma_voucher_extension, render_karma_vouchers
+from utils.mail_outbox import MailOutbox
+from utils.utils import DateTimeUtils
+from .karma_voucher_serializer import VoucherLogCSVSerializer
+
+
+class VoucherLogImport:
+    """
+    Imports the rows of a voucher log upload and mails every voucher, see
+    `ImportVoucherLogAPI`.
+    """
+
+    headers = ['muid', 'karma', 'hashtag',
+               'month', 'week', 'description', 'event']
+
+    @staticmethod
+    def import_rows(rows, current_user):
+        valid_rows = []
+        error_rows = []
+        success_rows = []
+        users_to_fetch = set()
+        tasks_to_fetch = set()
+        for row in rows:
+            task_hashtag = row.get('hashtag')
+            muid = row.get('muid')
+            users_to_fetch.add(muid)
+            tasks_to_fetch.add(task_hashtag)
+        # Fetching users and tasks in bulk
+        users = User.objects.filter(muid__in=users_to_fetch).values(
+            'id', 'email', 'full_name', 'muid')
+        tasks = TaskList.objects.filter(
+            hashtag__in=tasks_to_fetch).values('id', 'hashtag')
+        user_dict = {
+            user['muid']: (
+                user['id'], user['email'],
+                user['full_name']
+            ) for user in users
+        }
+
+        task_dict = {task['hashtag']: task['id'] for task in tasks}
+
+        for row in rows:
+            task_hashtag = row.get('hashtag')
+            karma = row.get('karma')
+            month = row.get('month')
+            week = row.get('week')
+            muid = row.get('muid')
+            description = row.get('description')
+            event = row.get('event')
+            user_info = user_dict.get(muid)
+            if user_info is None:
+                row['error'] = f"Invalid muid: {muid}"
+                error_rows.append(row)
+            else:
+                user_id, email, full_name = user_info
+                task_id = task_dict.get(task_hashtag)
+                if task_id is None:
+                    row['error'] = f"Invalid task hashtag: {task_hashtag}"
+                    error_rows.append(row)
+                elif karma == 0:
+                    row['error'] = "Karma cannot be 0"
+                    error_rows.append(row)
+                elif month is None:
+                    row['error'] = "Month cannot be empty"
+                    error_rows.append(row)
+                else:
+                    # Preparing valid row data
+                    row['user_id'] = user_id
+                    row['task_id'] = task_id
+                    row['id'] = str(uuid.uuid4())
+                    row['claimed'] = False
+                    row['created_by_id'] = current_user
+                    row['updated_by_id'] = current_user
+                    row['created_at'] = DateTimeUtils.get_current_utc_time()
+                    row['updated_at'] = DateTimeUtils.get_current_utc_time()
+                    valid_rows.append(row)
+
+        for row, code in zip(valid_rows, allocate_voucher_codes(len(valid_rows))):
+            row['code'] = code
+
+        # Serializing and saving valid voucher rows to the database
+        voucher_serializer = VoucherLogCSVSerializer(
+            data=valid_rows, many=True)
+        with transaction.atomic():
+            if voucher_serializer.is_valid():
+                voucher_serializer.save()
+            else:
+                code_error_dict = {}
+                for error in voucher_serializer.errors:
+                    code_error = error.get('code')
+                    error_msg = error.get('error')
+
+                    code = str(code_error[0])
+                    error_value = str(error_msg[0])
+                    code_error_dict[code] = error_value
+
+                for row in valid_rows:
+                    code = row['code']
+                    error_row = {}
+                    if code in code_error_dict:
+                        error_row['muid'] = row['muid']
+                        error_row['karma'] = row['karma']
+                        error_row['week'] = row['week']
+                        error_row['month'] = row['month']
+                        error_row['hashtag'] = row['hashtag']
+                        error_row['description'] = row['description']
+                        error_row['event'] = row['event']
+                        error_row['error'] = code_error_dict[code]
+                        error_rows.append(error_row)
+
+                return [], error_rows
+            if len(voucher_serializer.data) != len(valid_rows):
+                raise ImportJobError('Something went wrong. Please try again.')
+
+        karma_voucher_images = render_karma_vouchers([
+            {
+                'name': str(voucher['full_name']),
+                'karma': str(int(voucher['karma'])),
+                'code': voucher['code'],
+                'hashtag': voucher['hashtag'],
+                'month': VoucherLogImport.get_time_or_event(voucher),
+            }
+            for voucher in voucher_serializer.data
+        ])
+        extension = get_karma_voucher_extension()
+
+        for voucher, karma_voucher_image in zip(voucher_serializer.data, karma_voucher_images):
+            muid = voucher['muid']
+            code = voucher['code']
+            month = voucher['month']
+            week = voucher['week']
+            karma = voucher['karma']
+            task_hashtag = voucher['hashtag']
+            full_name = voucher['full_name']
+            email = voucher['email']
+            description = voucher['description']
+            event = voucher['event']
+
+            success_rows.append({
+                'muid': muid,
+                'code': code,
+                'user': full_name,
+                'task': task_hashtag,
+                'karma': karma,
+                'month': month,
+                'week': week,
+                'description': description,
+                'event': event
+            })
+            # Preparing email context and attachment
+            from_mail = decouple.config("FROM_MAIL")
+            subject = "Congratulations on earning Karma points!"
+            text = f"""Greetings from GTech µLearn!
+
+            Great news! You are just one step away from claiming your internship/contribution Karma points.
+
+            Name: {full_name}
+            Email: {email}
+
+            To claim your karma points copy this `voucher {code}` and paste it #task-dropbox channel along with your voucher image.
+            """
+
+            MailOutbox.enqueue(
+                subject=subject,
+                body=text,
+                from_email=from_mail,
+                to=[email],
+                attachments=[(f'{str(full_name)}.{extension}', karma_voucher_image.getvalue(), None)],
+            )
+
+        return success_rows, error_rows
+
+    @staticmethod
+    def get_time_or_event(voucher):
+        event = voucher['event']
+        if event != '' and event is not None:
+            return f"{event}/{voucher['description']}"
+        return f"{voucher['month']}/{voucher['week']}"
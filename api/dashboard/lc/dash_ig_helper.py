@@ -1,6 +1,14 @@
+import itertools
+import re
 from datetime import datetime, timedelta
 
+from django.db import IntegrityError, transaction
+
 from db.learning_circle import UserCircleLink, LearningCircle
+from utils.exception import CustomException
+
+# Circle creations retried when a concurrent one takes the same code first
+CIRCLE_CODE_ATTEMPTS = 5
 
 
 def get_today_start_end(date_time):
@@ -64,3 +72,47 @@ def is_valid_learning_circle(circle_id):
     if learning_circle:
         return True
     return False
+
+
+def generate_circle_code(prefix, exclude=()):
+    """
+    Returns the prefix, or `PREFIX<n>` with the lowest free n when it is
+    taken, reading only the codes starting with the prefix in one index
+    range query.
+    :param prefix: Uppercase code prefix
+    :param exclude: Codes to treat as taken on top of the existing ones
+    :return: The circle code
+    """
+    pattern = re.compile(rf"{re.escape(prefix)}(\d*)")
+
+    taken = set()
+    codes = LearningCircle.objects.filter(circle_code__startswith=prefix).values_list("circle_code", flat=True)
+    for code in [*codes, *exclude]:
+        if match := pattern.fullmatch(code.upper()):
+            taken.add(int(match[1] or 0))
+
+    number = next(number for number in itertools.count() if number not in taken)
+    return f"{prefix}{number}" if number else prefix
+
+
+def create_with_circle_code(prefix, create):
+    """
+    Calls `create(circle_code)` with a free code, inside a savepoint. A
+    concurrent creation may insert the code first, the unique constraint
+    then rejects the row and the next free code is tried.
+    :param prefix: Uppercase code prefix
+    :param create: Function creating the circle with the code
+    :return: The value returned by `create`
+    """
+    attempted = set()
+    for _ in range(CIRCLE_CODE_ATTEMPTS):
+        code = generate_circle_code(prefix, exclude=attempted)
+        try:
+            with transaction.atomic():
+                return create(code)
+        except IntegrityError as e:
+            if "circle_code" not in str(e):
+                raise
+            attempted.add(code)
+
+    raise CustomException("Could not allocate a circle code, please try again")
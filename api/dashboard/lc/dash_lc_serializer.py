@@ -2,7 +2,8 @@ import uuid
 from datetime import datetime
 from django.conf import settings
 from decouple import config
-from django.db.models import Sum
+from django.db.models import Count, Exists, IntegerField, OuterRef, Prefetch, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 
 from db.learning_circle import LearningCircle, UserCircleLink, InterestGroup, CircleMeetingLog
@@ -13,7 +14,7 @@ from db.user import User
 from utils.types import Lc
 from utils.types import OrganizationType
 from utils.utils import DateTimeUtils
-from .dash_ig_helper import get_today_start_end, get_week_start_end
+from .dash_ig_helper import create_with_circle_code, get_today_start_end, get_week_start_end
 
 
 class LearningCircleSerializer(serializers.ModelSerializer):
@@ -71,52 +72,51 @@ class LearningCircleMainSerializer(serializers.ModelSerializer):
             'karma'
         ]
 
-    def get_lead_name(self, obj):
-        user_circle_link = obj.user_circle_link_circle.filter(
-            circle=obj,
-            accepted=1,
-            lead=True
-        ).first()
+    @staticmethod
+    def load(queryset, user_id=None):
+        """
+        Selects and annotates everything the serializer reads, the lead,
+        member count, membership of `user_id` and karma of each circle, so a
+        list of circles costs a single query
+        """
+        accepted_links = UserCircleLink.objects.filter(circle=OuterRef('pk'), accepted=True)
+        karma = KarmaActivityLog.objects.filter(
+            user__user_circle_link_user__circle=OuterRef('pk')
+        ).order_by().values(
+            'user__user_circle_link_user__circle'
+        ).annotate(
+            total=Sum('karma')
+        ).values('total')
+
+        return queryset.select_related('ig', 'org').annotate(
+            lead_name=Subquery(
+                accepted_links.filter(lead=True).order_by('pk').values('user__full_name')[:1]
+            ),
+            member_count=Coalesce(
+                Subquery(
+                    accepted_links.order_by().values('circle').annotate(count=Count('id')).values('count')
+                ),
+                0,
+            ),
+            ismember=Exists(accepted_links.filter(user_id=user_id)) if user_id else Value(False),
+            karma=Coalesce(Subquery(karma, output_field=IntegerField()), 0),
+        )
 
-        return user_circle_link.user.full_name if user_circle_link else None
+    def get_lead_name(self, obj):
+        return obj.lead_name
 
     def get_member_count(self, obj):
-        return obj.user_circle_link_circle.filter(
-            circle=obj,
-            accepted=1
-        ).count()
+        return obj.member_count
 
     def get_members(self, obj):
-        user_circle_link = obj.user_circle_link_circle.filter(
-            circle=obj,
-            accepted=1
-        )
+        # never returned the members, clients read null
+        return None
 
     def get_ismember(self, obj):
-        user_id = self.context.get('user_id')
-        return obj.user_circle_link_circle.filter(
-            circle=obj,
-            user_id=user_id,
-            accepted=True
-        ).exists()
-    
-        return [
-            {
-                'username': f'{member.user.full_name}'
-            }
-            for member in user_circle_link
-        ]
-    def get_karma(self, obj):
-        
-        karma_activity_log = KarmaActivityLog.objects.filter(
-            user__user_circle_link_user__circle=obj,
-        ).aggregate(
-            karma=Sum(
-                'karma'
-            )
-        )['karma']
+        return obj.ismember
 
-        return karma_activity_log if karma_activity_log else 0
+    def get_karma(self, obj):
+        return obj.karma
 
 
 class LearningCircleCreateSerializer(serializers.ModelSerializer):
@@ -185,34 +185,19 @@ class LearningCircleCreateSerializer(serializers.ModelSerializer):
         else:
             code = validated_data.get('name')[:2] + ig.code
 
-        existing_codes = set(
-            LearningCircle.objects.values_list('circle_code', flat=True))
-        i = 1
-        while code.upper() in existing_codes:
-            code = code + str(i)
-            i += 1
-        if org_link:
-            lc = LearningCircle.objects.create(
+        lc = create_with_circle_code(
+            code.upper(),
+            lambda circle_code: LearningCircle.objects.create(
                 id=uuid.uuid4(),
                 name=validated_data.get('name'),
-                circle_code=code.upper(),
+                circle_code=circle_code,
                 ig=ig,
-                org=org_link.org,
+                org=org_link.org if org_link else None,
                 updated_by_id=user_id,
                 updated_at=DateTimeUtils.get_current_utc_time(),
                 created_by_id=user_id,
-                created_at=DateTimeUtils.get_current_utc_time())
-        else:
-            lc = LearningCircle.objects.create(
-                id=uuid.uuid4(),
-                name=validated_data.get('name'),
-                circle_code=code.upper(),
-                ig=ig,
-                org=None,
-                updated_by_id=user_id,
-                updated_at=DateTimeUtils.get_current_utc_time(),
-                created_by_id=user_id,
-                created_at=DateTimeUtils.get_current_utc_time())
+                created_at=DateTimeUtils.get_current_utc_time()),
+        )
 
         UserCircleLink.objects.create(
             id=uuid.uuid4(),
@@ -406,22 +391,26 @@ class LearningCircleDetailsSerializer(serializers.ModelSerializer):
 
     def _get_member_info(self, obj, accepted):
 
-        members = obj.user_circle_link_circle.filter(
+        members = list(obj.user_circle_link_circle.filter(
             circle=obj,
             accepted=accepted
+        ).select_related('user__user_lvl_link_user__level'))
+
+        ig_karma = dict(
+            KarmaActivityLog.objects.filter(
+                task__ig=obj.ig_id,
+                user__in=[member.user_id for member in members],
+                appraiser_approved=True
+            ).values_list('user').annotate(
+                total_karma=Sum(
+                    'karma'
+                )).order_by()
         )
 
         member_info = []
 
         for member in members:
-            total_ig_karma = KarmaActivityLog.objects.filter(
-                task__ig=member.circle.ig,
-                user=member.user,
-                appraiser_approved=True
-            ).aggregate(
-                total_karma=Sum(
-                    'karma'
-                ))['total_karma'] or 0
+            total_ig_karma = ig_karma.get(member.user_id) or 0
 
             member_info.append({
                 'id': member.user.id,
@@ -454,19 +443,27 @@ class LearningCircleDetailsSerializer(serializers.ModelSerializer):
             id=obj.id
         )
 
-        for lc in all_learning_circles:
-            total_karma_lc = KarmaActivityLog.objects.filter(
-                user__user_circle_link_user__circle=lc,
+        # karma of every circle of the interest group, grouped by the circle
+        # of the accepted link that joined the log
+        circle_karma = dict(
+            KarmaActivityLog.objects.filter(
+                user__user_circle_link_user__circle__ig=obj.ig,
                 user__user_circle_link_user__accepted=True,
-                task__ig=lc.ig,
+                task__ig=obj.ig,
                 appraiser_approved=True
-            ).aggregate(
+            ).values_list(
+                'user__user_circle_link_user__circle'
+            ).annotate(
                 total_karma=Sum(
                     'karma'
                 )
-            )['total_karma'] or 0
+            ).order_by()
+        )
 
-            circle_ranks[lc.name] = {'total_karma': total_karma_lc}
+        for lc_id, lc_name in all_learning_circles.values_list('id', 'name'):
+            total_karma_lc = circle_karma.get(lc_id) or 0
+
+            circle_ranks[lc_name] = {'total_karma': total_karma_lc}
 
         sorted_ranks = sorted(
             circle_ranks.items(),
@@ -774,12 +771,24 @@ class IgTaskDetailsSerializer(serializers.ModelSerializer):
             "completed_users",
         ]
 
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the level and prefetches the approved karma logs of each
+        task, so a list of tasks costs two queries
+        """
+        return queryset.select_related('level').prefetch_related(
+            Prefetch(
+                'karma_activity_log_task',
+                queryset=KarmaActivityLog.objects.filter(appraiser_approved=True).only('id', 'task', 'user'),
+                to_attr='approved_karma_logs'
+            )
+        )
+
     def get_completed_users(self, obj):
-        karma_activity_log = KarmaActivityLog.objects.filter(
-            task=obj, appraiser_approved=True).select_related('user')
         completed_users = []
-        for karma in karma_activity_log:
-            completed_users.append(karma.user.id)
+        for karma in obj.approved_karma_logs:
+            completed_users.append(karma.user_id)
         return completed_users
 
 
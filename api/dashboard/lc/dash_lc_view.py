@@ -2,7 +2,7 @@ import uuid
 from collections import defaultdict
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.db import transaction
 from django.db.models import Q
 from django.shortcuts import redirect
 from rest_framework.views import APIView
@@ -11,6 +11,7 @@ from api.notification.notifications_utils import NotificationUtils
 from db.learning_circle import CircleMeetingLog, LearningCircle, UserCircleLink
 from db.task import TaskList
 from db.user import User
+from utils.mail_outbox import MailOutbox
 from utils.permission import JWTUtils
 from utils.response import CustomResponse
 from utils.utils import DateTimeUtils, send_template_mail
@@ -64,7 +65,7 @@ class UserLearningCircleListApi(APIView):
 
 class LearningCircleMainApi(APIView):
     def post(self, request):
-        all_circles = LearningCircle.objects.all()
+        all_circles = LearningCircleMainSerializer.load(LearningCircle.objects.all())
         if JWTUtils.is_logged_in(request):
             ig_id = request.data.get("ig_id")
             org_id = request.data.get("org_id")
@@ -240,7 +241,7 @@ class LearningCircleDetailsApi(APIView):
                 general_message="unauthorized access"
             ).get_failure_response()
 
-        learning_circle = LearningCircle.objects.filter(id=circle_id).first()
+        learning_circle = LearningCircle.objects.select_related("org", "ig").filter(id=circle_id).first()
 
         serializer = LearningCircleDetailsSerializer(
             learning_circle,
@@ -375,7 +376,12 @@ class LearningCircleDetailsApi(APIView):
 
 class SingleReportDetailAPI(APIView):
     def get(self, request, circle_id, report_id=None):
-        circle_meeting_log = CircleMeetingLog.objects.get(id=report_id)
+        circle_meeting_log = CircleMeetingLog.objects.filter(id=report_id).first()
+
+        if circle_meeting_log is None:
+            return CustomResponse(
+                general_message="Report not found"
+            ).get_failure_response()
 
         serializer = MeetRecordsCreateEditDeleteSerializer(
             circle_meeting_log, many=False
@@ -486,12 +492,10 @@ class LearningCircleInviteLeadAPI(APIView):
             #     subject="LC µFAM IS HERE!",
             #     address=["user_registration.html"],
             # )
-            send_mail(
-                "LC Invite",
-                "Join our lc",
-                settings.FROM_MAIL,
-                [user.email],
-                fail_silently=False,
+            MailOutbox.enqueue(
+                subject="LC Invite",
+                body="Join our lc",
+                to=[user.email],
             )
             return CustomResponse(general_message="User Invited").get_success_response()
 
@@ -540,13 +544,13 @@ class LearningCircleInviteMemberAPI(APIView):
             "muid": muid,
             "email": receiver_email,
         }
-        status = send_template_mail(
-            context=context,
-            subject="MuLearn - Invitation to learning circle",
-            address=html_address,
-        )
-
-        if status == 1:
+        # the invite and its mail are committed together
+        with transaction.atomic():
+            send_template_mail(
+                context=context,
+                subject="MuLearn - Invitation to learning circle",
+                address=html_address,
+            )
             UserCircleLink.objects.create(
                 id=uuid.uuid4(),
                 circle_id=circle_id,
@@ -556,9 +560,7 @@ class LearningCircleInviteMemberAPI(APIView):
                 created_at=DateTimeUtils.get_current_utc_time(),
             )
 
-            return CustomResponse(general_message="User Invited").get_success_response()
-
-        return CustomResponse(general_message="Mail not sent").get_failure_response()
+        return CustomResponse(general_message="User Invited").get_success_response()
 
 
 class LearningCircleInvitationStatus(APIView):
@@ -621,9 +623,11 @@ class ScheduleMeetAPI(APIView):
 
 class IgTaskDetailsAPI(APIView):
     def get(self, request, circle_id):
-        task_list = TaskList.objects.filter(
-            ig__learning_circle_ig__id=circle_id
-        ).order_by("level__level_order")
+        task_list = IgTaskDetailsSerializer.load(
+            TaskList.objects.filter(
+                ig__learning_circle_ig__id=circle_id
+            ).order_by("level__level_order")
+        )
         serializer = IgTaskDetailsSerializer(
             task_list,
             many=True,
@@ -2,6 +2,7 @@ from django.db.models import Q
 from rest_framework.views import APIView
 
 from db.organization import Country, District, State, Zone
+from utils.geography import GeographyIndex
 from utils.permission import CustomizePermission, JWTUtils, role_required
 from utils.response import CustomResponse
 from utils.types import RoleType
@@ -342,20 +343,20 @@ class DistrictDataAPI(APIView):
 
 class CountryListApi(APIView):
     def get(self, request):
-        country = Country.objects.all().values("id", "name").order_by("name")
+        countries = GeographyIndex.get_all("country")
 
-        return CustomResponse(response=country).get_success_response()
+        return CustomResponse(response=countries).get_success_response()
 
 
 class StateListApi(APIView):
     def get(self, request):
-        state = State.objects.all().values("id", "name").order_by("name")
+        states = GeographyIndex.get_all("state")
 
-        return CustomResponse(response=state).get_success_response()
+        return CustomResponse(response=states).get_success_response()
 
 
 class ZoneListApi(APIView):
     def get(self, request):
-        zone = Zone.objects.all().values("id", "name").order_by("name")
+        zones = GeographyIndex.get_all("zone")
 
-        return CustomResponse(response=zone).get_success_response()
+        return CustomResponse(response=zones).get_success_response()
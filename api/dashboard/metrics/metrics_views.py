@@ -0,0 +1,46 @@
+from decouple import config
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from utils.discord_webhook import dispatcher
+from utils.permission import CustomizePermission, role_required
+from utils.request_metrics import request_metrics
+from utils.response import CustomResponse
+from utils.types import RoleType
+
+
+class RequestMetricsAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    @role_required([RoleType.ADMIN.value, RoleType.TECH_TEAM.value])
+    def get(self, request):
+        """
+        Returns the latency, query and size percentiles of every route within
+        REQUEST_METRICS_WINDOW, and the discord webhook counters.
+        """
+        return CustomResponse(
+            response={
+                "routes": request_metrics.get_summary(),
+                "discord_webhook": dispatcher.get_metrics(),
+            }
+        ).get_success_response()
+
+
+class PrometheusMetricsAPI(APIView):
+    def get(self, request):
+        """
+        Renders the request metrics in the Prometheus text format for a
+        scraper sending the protectionKey header.
+        """
+        protection_key = request.headers.get("protectionKey")
+        if not protection_key or not protection_key == config("PROTECTED_API_KEY"):
+            return CustomResponse(general_message="Invalid Key").get_failure_response()
+
+        webhook_metrics = dispatcher.get_metrics()
+        webhook_metrics.pop("queue_depth")
+        return HttpResponse(
+            request_metrics.get_prometheus(
+                {f"mulearn_discord_webhook_{name}": value for name, value in webhook_metrics.items()}
+            ),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import metrics_views
+
+urlpatterns = [
+    path('', metrics_views.RequestMetricsAPI.as_view()),
+    path('prometheus/', metrics_views.PrometheusMetricsAPI.as_view()),
+]
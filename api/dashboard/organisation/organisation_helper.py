@@ -0,0 +1,148 @@
+import uuid
+
+from db.organization import District, OrgAffiliation, Organization
+from utils.types import OrganizationType
+from .serializers import OrganizationImportSerializer
+
+
+class OrganisationImport:
+    """
+    Imports the rows of an organisation list upload, see
+    `OrganisationImportAPI`.
+    """
+
+    headers = [
+        "title",
+        "code",
+        "org_type",
+        "affiliation",
+        "district"
+    ]
+
+    @staticmethod
+    def import_rows(rows, user_id):
+        rows = list(rows)
+        valid_rows = []
+        error_rows = []
+
+        title_excel = set()
+        code_excel = set()
+        title_db = set(
+            Organization.objects.filter(
+                title__in=[row.get("title") for row in rows]
+            ).values_list("title", flat=True)
+        )
+        code_db = set(
+            Organization.objects.filter(
+                code__in=[row.get("code") for row in rows]
+            ).values_list("code", flat=True)
+        )
+
+        affiliations_to_fetch = set()
+        districts_to_fetch = set()
+
+        for row in list(rows):
+            title = row.get("title")
+            if not title:
+                row["error"] = "Missing title."
+                error_rows.append(row)
+                rows.remove(row)
+                continue
+            elif title in title_excel:
+                row["error"] = f"Duplicate title in excel: {title}"
+                error_rows.append(row)
+                rows.remove(row)
+                continue
+            elif title in title_db:
+                row["error"] = f"Duplicate title in database: {title}"
+                error_rows.append(row)
+                rows.remove(row)
+                continue
+            else:
+                title_excel.add(title)
+
+            code = row.get("code")
+            if not code:
+                row["error"] = "Missing code."
+                error_rows.append(row)
+                rows.remove(row)
+                continue
+            elif code in code_excel:
+                row["error"] = f"Duplicate code in excel: {code}"
+                error_rows.append(row)
+                rows.remove(row)
+                continue
+            elif code in code_db:
+                row["error"] = f"Duplicate code in database: {code}"
+                error_rows.append(row)
+                rows.remove(row)
+                continue
+            else:
+                code_excel.add(code)
+
+            affiliation = row.get("affiliation")
+            district = row.get("district")
+
+            affiliations_to_fetch.add(affiliation)
+            districts_to_fetch.add(district)
+
+        affiliations = OrgAffiliation.objects.filter(
+            title__in=affiliations_to_fetch
+        ).values(
+            "id",
+            "title"
+        )
+
+        districts = District.objects.filter(
+            name__in=districts_to_fetch
+        ).values(
+            "id",
+            "name"
+        )
+
+        affiliations_dict = {affiliation["title"]: affiliation["id"] for affiliation in affiliations}
+        districts_dict = {district["name"]: district["id"] for district in districts}
+        org_types = OrganizationType.get_all_values()
+
+        for row in rows:
+            affiliation = row.pop("affiliation")
+            district = row.pop("district")
+
+            affiliation_id = affiliations_dict.get(affiliation) if affiliation is not None else None
+            district_id = districts_dict.get(district)
+            org_type = row.get("org_type")
+
+            if affiliation and not affiliation_id:
+                row["error"] = f"Invalid affiliation: {affiliation}"
+                error_rows.append(row)
+            elif not district_id:
+                row["error"] = f"Invalid district: {district}"
+                error_rows.append(row)
+            elif org_type not in org_types:
+                row["error"] = f"Invalid org_type: {org_type}"
+                error_rows.append(row)
+            else:
+                row["id"] = str(uuid.uuid4())
+                row["updated_by_id"] = user_id
+                row["created_by_id"] = user_id
+                row["affiliation_id"] = affiliation_id
+                row["district_id"] = district_id
+                valid_rows.append(row)
+
+        organization_list_serializer = OrganizationImportSerializer(data=valid_rows, many=True)
+        success_data = []
+        if organization_list_serializer.is_valid():
+            organization_list_serializer.save()
+            for organization_data in organization_list_serializer.data:
+                success_data.append({
+                    'title': organization_data.get('title', ''),
+                    'code': organization_data.get('code', ''),
+                    'org_type': organization_data.get('org_type', ''),
+                    'affiliation': organization_data.get('affiliation_id', ''),
+                    'district': organization_data.get('district_id', ''),
+                })
+        else:
+            error_rows.append(organization_list_serializer.errors)
+
+
+        return success_data, error_rows
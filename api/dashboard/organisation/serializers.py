@@ -2,11 +2,13 @@ import uuid
 
 from django.db import models
 from django.db import transaction
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 
 from db.organization import (
     Organization,
+    UserOrganizationLink,
     District,
     Zone,
     State,
@@ -42,7 +44,24 @@ class InstitutionSerializer(serializers.ModelSerializer):
             "user_count",
         ]
 
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the affiliation and the district up to its country and
+        annotates the verified member count, so a list of institutions
+        costs a single query
+        """
+        user_count = UserOrganizationLink.objects.filter(
+            org=OuterRef("pk"), verified=True
+        ).order_by().values("org").annotate(count=Count("id")).values("count")
+
+        return queryset.select_related(
+            "affiliation", "district__zone__state__country"
+        ).annotate(user_count=Coalesce(Subquery(user_count), 0))
+
     def get_user_count(self, obj):
+        if hasattr(obj, "user_count"):
+            return obj.user_count
         return obj.user_organization_link_org.annotate(user_count=Count("user")).count()
 
 
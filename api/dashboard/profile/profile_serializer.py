@@ -2,7 +2,7 @@ import uuid
 
 from decouple import config as decouple_config
 from django.db import transaction
-from django.db.models import F, Sum, Q
+from django.db.models import Exists, F, OuterRef, Prefetch, Sum
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
 
@@ -11,7 +11,8 @@ from db.task import InterestGroup, KarmaActivityLog, Level, TaskList, Wallet, Us
 from db.user import User, UserSettings, Socials
 from utils.exception import CustomException
 from utils.permission import JWTUtils
-from utils.types import OrganizationType, RoleType, MainRoles, WebHookActions, WebHookCategory
+from utils.rank_index import RankIndex
+from utils.types import OrganizationType, MainRoles, WebHookActions, WebHookCategory
 from utils.utils import DateTimeUtils, DiscordWebhooks
 
 BE_DOMAIN_NAME = decouple_config('BE_DOMAIN_NAME')
@@ -78,61 +79,39 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return 0 if user_count == 0 else 100 - ((users_count_lt_user_karma * 100) / user_count)
 
     def get_roles(self, obj):
-        return list({link.role.title for link in obj.user_role_link_user.filter(verified=True)})
-
-    def get_college_id(self, obj):
-        org_type = (
+        return list({link.role.title for link in obj.user_role_link_user.all() if link.verified})
+
+    @staticmethod
+    def get_org_link(obj, org_type):
+        """
+        The first organization link of a type by id, read from the prefetched
+        links of UserProfileAPI
+        """
+        links = [link for link in obj.user_organization_link_user.all() if link.org.org_type == org_type]
+        return min(links, key=lambda link: link.pk, default=None)
+
+    def get_main_org_type(self, obj):
+        return (
             OrganizationType.COMPANY.value
             if MainRoles.MENTOR.value in self.get_roles(obj)
             else OrganizationType.COLLEGE.value
         )
-        user_org_link = obj.user_organization_link_user.filter(
-            org__org_type=org_type
-        ).first()
+
+    def get_college_id(self, obj):
+        user_org_link = self.get_org_link(obj, self.get_main_org_type(obj))
         return user_org_link.org.id if user_org_link else None
 
     def get_org_district_id(self, obj):
-        org_type = OrganizationType.COMPANY.value if MainRoles.MENTOR.value in self.get_roles(
-            obj) else OrganizationType.COLLEGE.value
-        user_org_link = obj.user_organization_link_user.filter(
-            org__org_type=org_type).first()
-        return user_org_link.org.district.id if user_org_link and hasattr(user_org_link.org, 'district') else None
+        user_org_link = self.get_org_link(obj, self.get_main_org_type(obj))
+        return user_org_link.org.district_id if user_org_link else None
 
     def get_college_code(self, obj):
-        if user_org_link := obj.user_organization_link_user.filter(
-                org__org_type=OrganizationType.COLLEGE.value
-        ).first():
+        if user_org_link := self.get_org_link(obj, OrganizationType.COLLEGE.value):
             return user_org_link.org.code
         return None
 
     def get_rank(self, obj):
-
-        roles = self.get_roles(obj)
-        user_karma = obj.wallet_user.karma
-        if RoleType.MENTOR.value in roles:
-            ranks = Wallet.objects.filter(
-                user__user_role_link_user__verified=True,
-                user__user_role_link_user__role__title=RoleType.MENTOR.value,
-                karma__gte=user_karma,
-            ).order_by('-karma', '-updated_at', 'created_at')
-        elif RoleType.ENABLER.value in roles:
-            ranks = Wallet.objects.filter(
-                user__user_role_link_user__verified=True,
-                user__user_role_link_user__role__title=RoleType.ENABLER.value,
-                karma__gte=user_karma,
-            ).order_by('-karma', '-updated_at', 'created_at')
-        else:
-            ranks = (
-                Wallet.objects.filter(karma__gte=user_karma)
-                .exclude(
-                    Q(user__user_role_link_user__role__title__in=[
-                        RoleType.ENABLER.value, RoleType.MENTOR.value])
-                ).order_by('-karma')
-            )
-
-        for count, _rank in enumerate(ranks, start=1):
-            if obj == _rank.user:
-                return count
+        return RankIndex.get_rank(obj.id, obj.wallet_user.karma)
 
     def get_karma_distribution(self, obj):
         return (
@@ -143,26 +122,16 @@ class UserProfileSerializer(serializers.ModelSerializer):
         )
 
     def get_interest_groups(self, obj):
-        interest_groups = []
-        for ig_link in UserIgLink.objects.filter(user=obj):
-            total_ig_karma = (
-                0
-                if KarmaActivityLog.objects.filter(
-                    task__ig=ig_link.ig, user=obj, appraiser_approved=True
-                )
-                   .aggregate(Sum("karma"))
-                   .get("karma__sum")
-                   is None
-                else KarmaActivityLog.objects.filter(
-                    task__ig=ig_link.ig, user=obj, appraiser_approved=True
-                )
-                   .aggregate(Sum("karma"))
-                   .get("karma__sum")
-            )
-            interest_groups.append(
-                {"id": ig_link.ig.id, "name": ig_link.ig.name, "karma": total_ig_karma}
-            )
-        return interest_groups
+        ig_karma = dict(
+            KarmaActivityLog.objects.filter(user=obj, appraiser_approved=True, task__ig__isnull=False)
+            .values_list("task__ig")
+            .annotate(karma=Sum("karma"))
+            .order_by()
+        )
+        return [
+            {"id": ig_link.ig.id, "name": ig_link.ig.name, "karma": ig_karma.get(ig_link.ig_id) or 0}
+            for ig_link in UserIgLink.objects.filter(user=obj).select_related("ig")
+        ]
 
 
 class UserLevelSerializer(serializers.ModelSerializer):
@@ -172,19 +141,30 @@ class UserLevelSerializer(serializers.ModelSerializer):
         model = Level
         fields = ("name", "tasks", "karma")
 
+    @staticmethod
+    def load(queryset, user_id):
+        """
+        Prefetches the tasks of each level, annotated with whether `user_id`
+        completed them and follows their interest group, so the levels cost
+        two queries
+        """
+        tasks = TaskList.objects.annotate(
+            completed=Exists(
+                KarmaActivityLog.objects.filter(user=user_id, task=OuterRef("pk"), appraiser_approved=True)
+            ),
+            in_user_ig=Exists(UserIgLink.objects.filter(user__id=user_id, ig__name=OuterRef("ig__name"))),
+        )
+        return queryset.prefetch_related(Prefetch("tasklist_set", queryset=tasks))
+
     def get_tasks(self, obj):
-        user_id = self.context.get("user_id")
-        user_igs = UserIgLink.objects.filter(
-            user__id=user_id).values_list("ig__name", flat=True)
-        tasks = TaskList.objects.filter(level=obj)
-        
+        tasks = obj.tasklist_set.all()
+
         if obj.level_order > 4:
-            tasks = tasks.filter(ig__name__in=user_igs)
+            tasks = [task for task in tasks if task.in_user_ig]
 
         data = []
         for task in tasks:
-            completed = KarmaActivityLog.objects.filter(
-                user=user_id, task=task, appraiser_approved=True).exists()
+            completed = task.completed
             if task.active or completed:
                 data.append(
                     {
@@ -215,32 +195,7 @@ class UserRankSerializer(ModelSerializer):
         return ["Learner"] if len(roles) == 0 else roles
 
     def get_rank(self, obj):
-        roles = self.get_roles(obj)
-        user_karma = obj.wallet_user.karma
-        if RoleType.MENTOR.value in roles:
-            ranks = Wallet.objects.filter(
-                user__user_role_link_user__verified=True,
-                user__user_role_link_user__role__title=RoleType.MENTOR.value,
-                karma__gte=user_karma,
-            ).order_by('-karma', '-updated_at', 'created_at')
-        elif RoleType.ENABLER.value in roles:
-            ranks = Wallet.objects.filter(
-                user__user_role_link_user__verified=True,
-                user__user_role_link_user__role__title=RoleType.ENABLER.value,
-                karma__gte=user_karma,
-            ).order_by('-karma', '-updated_at', 'created_at')
-        else:
-            ranks = (
-                Wallet.objects.filter(karma__gte=user_karma)
-                .exclude(
-                    Q(user__user_role_link_user__role__title__in=[
-                        RoleType.ENABLER.value, RoleType.MENTOR.value])
-                ).order_by('-karma')
-            )
-
-        for count, _rank in enumerate(ranks, start=1):
-            if obj == _rank.user:
-                return count
+        return RankIndex.get_rank(obj.id, obj.wallet_user.karma)
 
     def get_karma(self, obj):
         return total_karma.karma if (total_karma := obj.wallet_user) else None
@@ -418,6 +373,7 @@ class LinkSocials(ModelSerializer):
                     karma=F("karma") + karma_value,
                     updated_by_id=user_id
                 )
+                RankIndex.refresh(user_id)
 
         for account, account_url in validated_data.items():
             old_account_url = getattr(instance, account)
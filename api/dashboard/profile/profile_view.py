@@ -104,7 +104,9 @@ class UserIgEditView(APIView):
 
 class UserProfileAPI(APIView):
     def get(self, request, muid=None):
-        user = User.objects.prefetch_related(
+        user = User.objects.select_related(
+            "wallet_user", "user_settings_user", "user_lvl_link_user__level"
+        ).prefetch_related(
             Prefetch(
                 "user_organization_link_user",
                 queryset=UserOrganizationLink.objects.all().select_related(
@@ -118,7 +120,7 @@ class UserProfileAPI(APIView):
         ).get(muid=muid or JWTUtils.fetch_muid(request))
 
         if muid:
-            user_settings = UserSettings.objects.filter(user_id=user).first()
+            user_settings = user.user_settings_user
 
             if not user_settings.is_public:
                 return CustomResponse(
@@ -276,6 +278,10 @@ class ShareUserProfileAPI(APIView):
                 general_message="QR code image with logo saved locally"
             ).get_success_response()
 
+        return CustomResponse(
+            general_message="Invalid muid"
+        ).get_failure_response()
+
 
 class UserLevelsAPI(APIView):
     def get(self, request, muid=None):
@@ -299,7 +305,9 @@ class UserLevelsAPI(APIView):
             JWTUtils.is_jwt_authenticated(request)
             user_id = JWTUtils.fetch_user_id(request)
 
-        user_levels_link_query = Level.objects.all().order_by("level_order")
+        user_levels_link_query = profile_serializer.UserLevelSerializer.load(
+            Level.objects.all().order_by("level_order"), user_id
+        )
         serializer = profile_serializer.UserLevelSerializer(
             user_levels_link_query, many=True, context={"user_id": user_id}
         )
@@ -0,0 +1,120 @@
+import uuid
+
+from db.user import Role, User, UserRoleLink
+from utils.types import WebHookActions, WebHookCategory
+from utils.utils import DiscordWebhooks
+from .dash_roles_serializer import UserRoleBulkAssignSerializer
+
+
+class UserRoleImport:
+    """
+    Imports the rows of a bulk role assignment upload, see
+    `UserRoleBulkAssignAPI`.
+    """
+
+    headers = ["muid", "role"]
+
+    @staticmethod
+    def import_rows(rows, request_user_id):
+        rows = list(rows)
+        valid_rows = []
+        error_rows = []
+        users_to_fetch = set()
+        roles_to_fetch = set()
+        user_role_link_to_check = set()
+
+        for row in rows:
+            keys_to_keep = ["muid", "role"]
+            row_keys = list(row.keys())
+            # Remove columns other than "muid" and "role"
+            for key in row_keys:
+                if key not in keys_to_keep:
+                    del row[key]
+
+        for row in list(rows):
+            user = row.get("muid")
+            role = row.get("role")
+            users_to_fetch.add(user)
+            roles_to_fetch.add(role)
+            if (user, role) in user_role_link_to_check:
+                row["error"] = "Duplicate entry"
+                error_rows.append(row)
+                rows.remove(row)
+            else:
+                user_role_link_to_check.add((user, role))
+
+        users = User.objects.filter(muid__in=users_to_fetch).values(
+            "id",
+            "muid",
+        )
+        roles = Role.objects.filter(title__in=roles_to_fetch).values(
+            "id",
+            "title",
+        )
+        existing_user_role_links = list(
+            UserRoleLink.objects.filter(
+                user__muid__in=users_to_fetch, role__title__in=roles_to_fetch
+            ).values_list("user__muid", "role__title")
+        )
+        users_dict = {user["muid"]: user["id"] for user in users}
+        roles_dict = {role["title"]: role["id"] for role in roles}
+        users_by_role = {role_title: [] for role_title in roles_dict.keys()}
+
+        for row in rows:
+            user = row.pop("muid")
+            role = row.pop("role")
+
+            user_id = users_dict.get(user)
+            role_id = roles_dict.get(role)
+            if not user_id:
+                row["muid"] = user
+                row["role"] = role
+                row["error"] = f"Invalid user muid: {user}"
+                error_rows.append(row)
+            elif not role_id:
+                row["muid"] = user
+                row["role"] = role
+                row["error"] = f"Invalid role: {role}"
+                error_rows.append(row)
+            elif (user, role) in existing_user_role_links:
+                row["muid"] = user
+                row["role"] = role
+                row["error"] = f"User {user} already has role {role}"
+                error_rows.append(row)
+            else:
+                users_by_role[role].append(user_id)
+                row["id"] = str(uuid.uuid4())
+                row["user_id"] = user_id
+                row["role_id"] = role_id
+                row["verified"] = True
+                row["created_by_id"] = request_user_id
+                valid_rows.append(row)
+
+        users_by_role = {
+            role_title: users for role_title, users in users_by_role.items() if users
+        }
+        user_roles_serializer = UserRoleBulkAssignSerializer(
+            data=valid_rows, many=True
+        )
+        success_data = []
+        if user_roles_serializer.is_valid():
+            user_roles_serializer.save()
+            for user_role_data in user_roles_serializer.data:
+                success_data.append(
+                    {
+                        "user": user_role_data.get("user_id", ""),
+                        "role": user_role_data.get("role_id", ""),
+                    }
+                )
+            for role, user_set in users_by_role.items():
+                DiscordWebhooks.general_updates(
+                    WebHookCategory.BULK_ROLE.value,
+                    WebHookActions.UPDATE.value,
+                    role,
+                    ",".join(user_set),
+                )
+        else:
+            error_rows.append(user_roles_serializer.errors)
+
+
+        return success_data, error_rows
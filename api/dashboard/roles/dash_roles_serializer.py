@@ -4,9 +4,11 @@ from rest_framework import serializers
 
 from db.user import Role, User, UserRoleLink
 from utils.permission import JWTUtils
+from utils.rank_index import RankIndex
 from utils.utils import DateTimeUtils, DiscordWebhooks
 from utils.types import WebHookActions, WebHookCategory
-from django.db.models import Q
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.db import transaction
 
 
@@ -52,6 +54,7 @@ class RoleAssignmentSerializer(serializers.Serializer):
         ]
         with transaction.atomic():
             UserRoleLink.objects.bulk_create(user_roles_to_create)
+            RankIndex.refresh_many(user.id for user in users)
             DiscordWebhooks.general_updates(
                 WebHookCategory.BULK_ROLE.value,
                 WebHookActions.UPDATE.value,
@@ -78,8 +81,24 @@ class RoleDashboardSerializer(serializers.ModelSerializer):
             "members",
         ]
 
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the audit users and annotates the verified member count of
+        each role, so a list of roles costs a single query
+        """
+        members = UserRoleLink.objects.filter(role=OuterRef('pk'), verified=True)
+        return queryset.select_related('created_by', 'updated_by').annotate(
+            member_count=Coalesce(
+                Subquery(members.order_by().values('role').annotate(count=Count('id')).values('count')),
+                0,
+            )
+        )
+
     def get_members(self, obj):
-        return len(UserRoleLink.objects.filter(role_id=obj.id, verified=True))
+        if hasattr(obj, 'member_count'):
+            return obj.member_count
+        return UserRoleLink.objects.filter(role_id=obj.id, verified=True).count()
 
     def update(self, instance, validated_data):
         user_id = JWTUtils.fetch_user_id(self.context["request"])
@@ -1,12 +1,12 @@
-import uuid
 from django.db import IntegrityError
 from rest_framework.views import APIView
 
 from db.user import Role, User, UserRoleLink
-from utils.permission import CustomizePermission, role_required, JWTUtils
+from utils.import_job import ImportJobError, ImportJobQueue
+from utils.permission import CustomizePermission, DynamicPermissionTable, role_required, JWTUtils
 from utils.response import CustomResponse
-from utils.types import RoleType, WebHookActions, WebHookCategory
-from utils.utils import CommonUtils, DiscordWebhooks, ImportCSV
+from utils.types import ImportJobType, RoleType, WebHookActions, WebHookCategory
+from utils.utils import CommonUtils, DiscordWebhooks
 from . import dash_roles_serializer
 
 from openpyxl import load_workbook
@@ -21,7 +21,7 @@ class RoleAPI(APIView):
 
     @role_required([RoleType.ADMIN.value])
     def get(self, request):
-        roles_queryset = Role.objects.all()
+        roles_queryset = dash_roles_serializer.RoleDashboardSerializer.load(Role.objects.all())
 
         queryset = CommonUtils.get_paginated_queryset(
             roles_queryset,
@@ -69,6 +69,7 @@ class RoleAPI(APIView):
         try:
             serializer.save()
             newname = role.title
+            DynamicPermissionTable.invalidate()
 
             DiscordWebhooks.general_updates(
                 WebHookCategory.ROLE.value, WebHookActions.EDIT.value, newname, old_name
@@ -87,6 +88,7 @@ class RoleAPI(APIView):
     def delete(self, request, roles_id):
         role = Role.objects.get(id=roles_id)
         role.delete()
+        DynamicPermissionTable.invalidate()
 
         DiscordWebhooks.general_updates(
             WebHookCategory.ROLE.value, WebHookActions.DELETE.value, role.title
@@ -122,7 +124,7 @@ class RoleManagementCSV(APIView):
 
     @role_required([RoleType.ADMIN.value])
     def get(self, request):
-        role = Role.objects.all()
+        role = dash_roles_serializer.RoleDashboardSerializer.load(Role.objects.all())
 
         role_serializer_data = dash_roles_serializer.RoleDashboardSerializer(
             role, many=True
@@ -354,123 +356,16 @@ class UserRoleBulkAssignAPI(APIView):
                 general_message="File not found."
             ).get_failure_response()
 
-        excel_data = ImportCSV()
-        excel_data = excel_data.read_excel_file(file_obj)
-
-        if not excel_data:
+        try:
+            job = ImportJobQueue.enqueue(
+                ImportJobType.USER_ROLE, file_obj, JWTUtils.fetch_user_id(request)
+            )
+        except ImportJobError as e:
             return CustomResponse(
-                general_message="Empty csv file."
+                general_message=str(e)
             ).get_failure_response()
 
-        temp_headers = ["muid", "role"]
-        first_entry = excel_data[0]
-        for key in temp_headers:
-            if key not in first_entry:
-                return CustomResponse(
-                    general_message=f"{key} does not exist in the file."
-                ).get_failure_response()
-
-        excel_data = [row for row in excel_data if any(row.values())]
-        valid_rows = []
-        error_rows = []
-        users_to_fetch = set()
-        roles_to_fetch = set()
-        user_role_link_to_check = set()
-
-        for row in excel_data[1:]:
-            keys_to_keep = ["muid", "role"]
-            row_keys = list(row.keys())
-            # Remove columns other than "muid" and "role"
-            for key in row_keys:
-                if key not in keys_to_keep:
-                    del row[key]
-
-        for row in excel_data[1:]:
-            user = row.get("muid")
-            role = row.get("role")
-            users_to_fetch.add(user)
-            roles_to_fetch.add(role)
-            if (user, role) in user_role_link_to_check:
-                row["error"] = "Duplicate entry"
-                error_rows.append(row)
-                excel_data.remove(row)
-            else:
-                user_role_link_to_check.add((user, role))
-
-        users = User.objects.filter(muid__in=users_to_fetch).values(
-            "id",
-            "muid",
-        )
-        roles = Role.objects.filter(title__in=roles_to_fetch).values(
-            "id",
-            "title",
-        )
-        existing_user_role_links = list(
-            UserRoleLink.objects.filter(
-                user__muid__in=users_to_fetch, role__title__in=roles_to_fetch
-            ).values_list("user__muid", "role__title")
-        )
-        users_dict = {user["muid"]: user["id"] for user in users}
-        roles_dict = {role["title"]: role["id"] for role in roles}
-        users_by_role = {role_title: [] for role_title in roles_dict.keys()}
-
-        for row in excel_data[1:]:
-            user = row.pop("muid")
-            role = row.pop("role")
-
-            user_id = users_dict.get(user)
-            role_id = roles_dict.get(role)
-            if not user_id:
-                row["muid"] = user
-                row["role"] = role
-                row["error"] = f"Invalid user muid: {user}"
-                error_rows.append(row)
-            elif not role_id:
-                row["muid"] = user
-                row["role"] = role
-                row["error"] = f"Invalid role: {role}"
-                error_rows.append(row)
-            elif (user, role) in existing_user_role_links:
-                row["muid"] = user
-                row["role"] = role
-                row["error"] = f"User {user} already has role {role}"
-                error_rows.append(row)
-            else:
-                users_by_role[role].append(user_id)
-                request_user_id = JWTUtils.fetch_user_id(request)
-                row["id"] = str(uuid.uuid4())
-                row["user_id"] = user_id
-                row["role_id"] = role_id
-                row["verified"] = True
-                row["created_by_id"] = request_user_id
-                valid_rows.append(row)
-
-        users_by_role = {
-            role_title: users for role_title, users in users_by_role.items() if users
-        }
-        user_roles_serializer = dash_roles_serializer.UserRoleBulkAssignSerializer(
-            data=valid_rows, many=True
-        )
-        success_data = []
-        if user_roles_serializer.is_valid():
-            user_roles_serializer.save()
-            for user_role_data in user_roles_serializer.data:
-                success_data.append(
-                    {
-                        "user": user_role_data.get("user_id", ""),
-                        "role": user_role_data.get("role_id", ""),
-                    }
-                )
-            for role, user_set in users_by_role.items():
-                DiscordWebhooks.general_updates(
-                    WebHookCategory.BULK_ROLE.value,
-                    WebHookActions.UPDATE.value,
-                    role,
-                    ",".join(user_set),
-                )
-        else:
-            error_rows.append(user_roles_serializer.errors)
-
         return CustomResponse(
-            response={"Success": success_data, "Failed": error_rows}
+            general_message="Import queued.",
+            response={"job_id": job.id}
         ).get_success_response()
@@ -1,8 +1,10 @@
 import uuid
 
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 
-from db.task import TaskList, TaskType
+from db.task import KarmaActivityLog, TaskList, TaskType
 from utils.permission import JWTUtils
 from utils.utils import DateTimeUtils
 
@@ -47,10 +49,30 @@ class TaskListSerializer(serializers.ModelSerializer):
             "bonus_karma",
         ]
 
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the related rows and annotates the approved karma gainers of
+        each task, so a list of tasks costs a single query
+        """
+        gainers = KarmaActivityLog.objects.filter(task=OuterRef("pk"), appraiser_approved=True)
+        return queryset.select_related(
+            "created_by",
+            "updated_by",
+            "channel",
+            "type",
+            "level",
+            "ig",
+            "org"
+        ).annotate(
+            karma_gainer_count=Coalesce(
+                Subquery(gainers.order_by().values("task").annotate(count=Count("id")).values("count")),
+                0,
+            )
+        )
+
     def get_total_karma_gainers(self, obj):
-        return obj.karma_activity_log_task.filter(
-            appraiser_approved=True
-        ).count()
+        return obj.karma_gainer_count
 
 
 class TaskModifySerializer(serializers.ModelSerializer):
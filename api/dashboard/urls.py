@@ -18,6 +18,8 @@ urlpatterns = [
     path('organisation/', include('api.dashboard.organisation.urls')),
     path('dynamic-management/', include('api.dashboard.dynamic_management.urls')),
     path('error-log/', include('api.dashboard.error_log.urls')),
+    path('import-job/', include('api.dashboard.import_job.urls')),
+    path('metrics/', include('api.dashboard.metrics.urls')),
 
     path('affiliation/', include('api.dashboard.affiliation.urls')),
     path('channels/', include('api.dashboard.channels.urls')),
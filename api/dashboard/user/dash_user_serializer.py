@@ -8,6 +8,7 @@ from db.organization import Organization, UserOrganizationLink
 from db.task import UserIgLink
 from db.user import User, UserRoleLink
 from utils.permission import JWTUtils
+from utils.rank_index import RankIndex
 from utils.types import OrganizationType
 from utils.utils import DateTimeUtils
 from db.user import DynamicRole, DynamicUser
@@ -352,6 +353,7 @@ class UserDetailsEditSerializer(serializers.ModelSerializer):
                         for role_id in role_ids
                     ]
                 )
+                RankIndex.refresh(instance.id)
 
             if isinstance(
                     interest_group_ids := validated_data.pop("interest_groups", None), list
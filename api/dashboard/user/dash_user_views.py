@@ -125,12 +125,10 @@ class UserManagementCSV(APIView):
             "wallet_user", "user_lvl_link_user", "user_lvl_link_user__level"
         ).all()
 
-        serializer = dash_user_serializer.UserDashboardSerializer(
-            user_queryset, many=True
+        return CommonUtils.generate_csv(
+            user_queryset, "User", serializer=dash_user_serializer.UserDashboardSerializer
         )
 
-        return CommonUtils.generate_csv(serializer.data, "User")
-
 
 class UserVerificationAPI(APIView):
     authentication_classes = [CustomizePermission]
@@ -185,10 +185,12 @@ class ZonalStudentDetailsCSVAPI(APIView):
             )
         )
 
-        serializer = dash_zonal_serializer.ZonalStudentDetailsSerializer(
-            user_org_links, many=True, context={"ranks": ranks}
+        return CommonUtils.generate_csv(
+            user_org_links,
+            "Zonal Student Details",
+            serializer=dash_zonal_serializer.ZonalStudentDetailsSerializer,
+            context={"ranks": ranks},
         )
-        return CommonUtils.generate_csv(serializer.data, "Zonal Student Details")
 
 
 class ZonalCollegeDetailsAPI(APIView):
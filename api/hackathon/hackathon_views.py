@@ -44,8 +44,11 @@ class HackathonManagementAPI(APIView):
                 hackathons_queryset
             )
         else:
-            hackathons_queryset = Hackathon.objects.filter(
-                Q(status="Published") | Q(hackathonorganiserlink__organiser_id=user_id)).distinct()
+            hackathons_queryset = HackathonRetrievalSerializer.load(
+                Hackathon.objects.filter(
+                    Q(status="Published") | Q(hackathonorganiserlink__organiser_id=user_id)).distinct(),
+                user_id
+            )
 
             serializer = HackathonRetrievalSerializer(hackathons_queryset, many=True, context={"user_id": user_id})
 
@@ -166,13 +169,15 @@ class ListApplicantsAPI(APIView):
     @role_required([RoleType.ADMIN.value])
     def get(self, request, hackathon_id=None):
         if hackathon_id:
-            data = HackathonUserSubmission.objects.filter(hackathon__id=hackathon_id)
+            data = ListApplicantsSerializer.load(
+                HackathonUserSubmission.objects.filter(hackathon__id=hackathon_id)
+            )
             if not data:
                 return CustomResponse(
                     general_message="Hackathon Not Available"
                 ).get_failure_response()
         else:
-            data = HackathonUserSubmission.objects.all()
+            data = ListApplicantsSerializer.load(HackathonUserSubmission.objects.all())
 
         serializer = ListApplicantsSerializer(data, many=True)
         return CustomResponse(response=serializer.data).get_success_response()
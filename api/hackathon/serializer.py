@@ -4,10 +4,12 @@ import uuid
 from django.conf import settings
 from django.db import models
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch
 from rest_framework import serializers
 
 from db.hackathon import Hackathon, HackathonForm, HackathonOrganiserLink, HackathonUserSubmission
 from db.organization import Organization, District, UserOrganizationLink
+from db.user import User
 from utils.permission import JWTUtils
 from utils.types import DEFAULT_HACKATHON_FORM_FIELDS
 from utils.utils import DateTimeUtils
@@ -56,11 +58,27 @@ class HackathonRetrievalSerializer(serializers.ModelSerializer):
     def get_event_logo(self, obj):
         return f"{settings.MEDIA_URL}{media}" if (media := obj.event_logo) else None
 
+    @staticmethod
+    def load(queryset, user_id):
+        """
+        Selects the organisation and district and annotates whether the user
+        organises or applied to each hackathon, so a list of hackathons costs
+        a single query
+        """
+        return queryset.select_related("org", "district").annotate(
+            editable=Exists(HackathonOrganiserLink.objects.filter(organiser=user_id, hackathon=OuterRef("pk"))),
+            is_applied=Exists(HackathonUserSubmission.objects.filter(user=user_id, hackathon=OuterRef("pk"))),
+        )
+
     def get_editable(self, obj):
+        if hasattr(obj, "editable"):
+            return obj.editable
         user_id = self.context.get("user_id")
         return HackathonOrganiserLink.objects.filter(organiser=user_id, hackathon=obj).exists()
 
     def get_is_applied(self, obj):
+        if hasattr(obj, "is_applied"):
+            return obj.is_applied
         user_id = self.context.get("user_id")
         return HackathonUserSubmission.objects.filter(user=user_id, hackathon=obj).exists()
 
@@ -418,13 +436,26 @@ class ListApplicantsSerializer(serializers.ModelSerializer):
         model = HackathonUserSubmission
         fields = ("data",)
 
+    @staticmethod
+    def load(queryset):
+        """
+        Selects the applicant and prefetches their organisations, so a list
+        of submissions costs two queries
+        """
+        return queryset.select_related("user").prefetch_related(
+            Prefetch(
+                "user__user_organization_link_user",
+                queryset=UserOrganizationLink.objects.select_related("org"),
+            )
+        )
+
     def get_data(self, obj):
         try:
             data = obj.data
             for field, value in DEFAULT_HACKATHON_FORM_FIELDS.items():
                 if value == 'system' and not data.get(field):
 
-                    user = User.objects.filter(id=obj.user.id).first()
+                    user = obj.user
                     if field == 'gender':
                         data[field] = user.gender
                     elif field == 'email':
@@ -434,8 +465,9 @@ class ListApplicantsSerializer(serializers.ModelSerializer):
                     elif field == 'name':
                         data[field] = user.full_name
                     elif field == 'college':
-                        data[field] = UserOrganizationLink.objects.filter(
-                            user_id=user.id).first().org.title
+                        data[field] = min(
+                            user.user_organization_link_user.all(),
+                            key=lambda link: link.pk, default=None).org.title
             return data
         except json.JSONDecodeError:
             return {}
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Sum, F, Value, Count, Q, Prefetch
+from django.db.models.functions import Coalesce
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from db.leaderboard import LeaderboardSnapshot
+from db.organization import Organization, UserOrganizationLink
+from db.user import User
+from utils.response import CustomResponse
+from utils.types import LeaderboardType, OrganizationType, RoleType
+from utils.utils import DateTimeUtils
+
+from . import serializers
+
+logger = logging.getLogger("django")
+
+ALL_TIME_PERIOD = "all"
+# Seconds a snapshot build may take before another request builds it again
+SNAPSHOT_BUILD_TIMEOUT = 60
+LEADERBOARD_SIZE = 20
+MONTHLY_STUDENTS_LEADERBOARD_SIZE = 100
+
+
+def get_month_range(date):
+    start_date = date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    next_month = (start_date + timedelta(days=32)).replace(day=1)
+    return start_date, next_month - timedelta(seconds=1)
+
+
+def get_period(date):
+    return date.strftime("%Y-%m")
+
+
+def students_leaderboard():
+    students = (
+        User.objects.filter(
+            user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
+            user_role_link_user__role__title=RoleType.STUDENT.value,
+            exist_in_guild=True,
+        )
+        .distinct()
+        .select_related("wallet_user")
+        .prefetch_related(
+            Prefetch(
+                "user_organization_link_user",
+                queryset=UserOrganizationLink.objects.filter(
+                    org__org_type=OrganizationType.COLLEGE.value
+                ).select_related("org"),
+                to_attr="colleges"
+            )
+        )
+        .order_by("-wallet_user__karma")[:LEADERBOARD_SIZE]
+    )
+    return serializers.StudentLeaderboardSerializer(students, many=True).data
+
+
+def students_monthly_leaderboard(start_date, end_date):
+    return list(
+        User.objects.filter(
+            user_role_link_user__role__title=RoleType.STUDENT.value,
+            user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
+            exist_in_guild=True,
+        )
+        .annotate(
+            institution=F("user_organization_link_user__org__title"),
+            total_karma=Coalesce(
+                Sum(
+                    "karma_activity_log_user__karma",
+                    filter=Q(
+                        karma_activity_log_user__created_at__range=(
+                            start_date,
+                            end_date,
+                        )
+                    ),
+                ),
+                Value(0),
+            ),
+        )
+        .values(
+            "full_name",
+            "total_karma",
+            "institution",
+        )
+        .order_by("-total_karma")[:MONTHLY_STUDENTS_LEADERBOARD_SIZE]
+    )
+
+
+def college_leaderboard():
+    return list(
+        Organization.objects.filter(
+            org_type=OrganizationType.COLLEGE.value,
+            user_organization_link_org__user__user_role_link_user__role__title=RoleType.STUDENT.value,
+            user_organization_link_org__user__exist_in_guild=True,
+        )
+        .distinct()
+        .annotate(
+            total_students=Count("user_organization_link_org__user"),
+            total_karma=Sum("user_organization_link_org__user__wallet_user__karma"),
+        )
+        .values("code", "title", "total_students", "total_karma")
+        .order_by("-total_karma")[:LEADERBOARD_SIZE]
+    )
+
+
+def college_monthly_leaderboard(start_date, end_date):
+    return list(
+        Organization.objects.filter(
+            org_type=OrganizationType.COLLEGE.value,
+            user_organization_link_org__user__karma_activity_log_user__created_at__range=(
+                start_date,
+                end_date,
+            ),
+            user_organization_link_org__user__karma_activity_log_user__appraiser_approved=True,
+        )
+        .annotate(
+            total_karma=Coalesce(
+                Sum(
+                    "user_organization_link_org__user__karma_activity_log_user__karma",
+                    filter=Q(
+                        user_organization_link_org__user__karma_activity_log_user__created_at__range=(
+                            start_date,
+                            end_date,
+                        )
+                    ),
+                ),
+                Value(0),
+            ),
+            students=Count("user_organization_link_org__user", distinct=True),
+            institution=F("title"),
+        )
+        .values("code", "total_karma", "students")
+        .order_by("-total_karma")[:LEADERBOARD_SIZE]
+    )
+
+
+ALL_TIME_BOARDS = {
+    LeaderboardType.STUDENTS.value: students_leaderboard,
+    LeaderboardType.COLLEGE.value: college_leaderboard,
+}
+
+MONTHLY_BOARDS = {
+    LeaderboardType.STUDENTS_MONTHLY.value: students_monthly_leaderboard,
+    LeaderboardType.COLLEGE_MONTHLY.value: college_monthly_leaderboard,
+}
+
+
+def build_snapshot(board, month=None, frozen=False):
+    """
+    Runs the aggregate for a board and stores the result as a snapshot.
+
+    Args:
+        board (str): A LeaderboardType value.
+        month (datetime, optional): Any moment inside the month of a monthly
+            board. Defaults to the current month.
+        frozen (bool, optional): Marks the snapshot as final so it is never
+            rebuilt again.
+
+    Returns:
+        LeaderboardSnapshot: The stored snapshot.
+    """
+    now = DateTimeUtils.get_current_utc_time()
+
+    if board in MONTHLY_BOARDS:
+        month = month or now
+        data = MONTHLY_BOARDS[board](*get_month_range(month))
+        period = get_period(month)
+    else:
+        data = ALL_TIME_BOARDS[board]()
+        period = ALL_TIME_PERIOD
+
+    payload = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    snapshot, _ = LeaderboardSnapshot.objects.update_or_create(
+        board=board,
+        period=period,
+        defaults={
+            "data": json.loads(payload),
+            "etag": hashlib.sha256(payload.encode()).hexdigest(),
+            "frozen": frozen,
+            "updated_at": now,
+        },
+    )
+    return snapshot
+
+
+def build_all_snapshots():
+    """
+    Refreshes every open snapshot and freezes the monthly boards of the
+    previous month once it has closed.
+    """
+    now = DateTimeUtils.get_current_utc_time()
+    previous_month = get_month_range(now)[0] - timedelta(days=1)
+
+    for board in ALL_TIME_BOARDS:
+        build_snapshot(board)
+
+    for board in MONTHLY_BOARDS:
+        build_snapshot(board, now)
+        if not LeaderboardSnapshot.objects.filter(
+            board=board, period=get_period(previous_month), frozen=True
+        ).exists():
+            build_snapshot(board, previous_month, frozen=True)
+
+
+def lock_snapshot_build(key: str) -> bool:
+    try:
+        return cache.add(key, True, timeout=SNAPSHOT_BUILD_TIMEOUT)
+    except Exception:
+        logger.exception("Could not lock the leaderboard snapshot build")
+        return True
+
+
+def unlock_snapshot_build(key: str):
+    try:
+        cache.delete(key)
+    except Exception:
+        logger.exception("Could not unlock the leaderboard snapshot build")
+
+
+def get_snapshot(board):
+    """
+    Returns the snapshot of the current period, rebuilt once it is older than
+    LEADERBOARD_SNAPSHOT_TTL. A single request rebuilds it, the others serve
+    the previous snapshot meanwhile, or wait for the first one to be built.
+    """
+    now = DateTimeUtils.get_current_utc_time()
+    period = get_period(now) if board in MONTHLY_BOARDS else ALL_TIME_PERIOD
+    snapshots = LeaderboardSnapshot.objects.filter(board=board, period=period)
+
+    snapshot = snapshots.first()
+    if snapshot is not None and (
+        snapshot.frozen or now - snapshot.updated_at < timedelta(seconds=settings.LEADERBOARD_SNAPSHOT_TTL)
+    ):
+        return snapshot
+
+    key = f"leaderboard_snapshot:{board}:{period}:build"
+    if lock_snapshot_build(key):
+        try:
+            return build_snapshot(board, now)
+        finally:
+            unlock_snapshot_build(key)
+    if snapshot is not None:
+        return snapshot
+
+    deadline = time.monotonic() + SNAPSHOT_BUILD_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.2)
+        if snapshot := snapshots.first():
+            return snapshot
+    return build_snapshot(board, now)
+
+
+def get_snapshot_response(request, board):
+    """
+    Serves the current snapshot of a board with ETag and Last-Modified
+    headers, answering conditional requests with 304 Not Modified.
+    """
+    snapshot = get_snapshot(board)
+    etag = f'"{snapshot.etag}"'
+    last_modified = int(snapshot.updated_at.timestamp())
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = CustomResponse(response=snapshot.data).get_success_response()
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -3,11 +3,14 @@ from rest_framework.views import APIView
 
 from db.organization import Organization, District
 from utils.response import CustomResponse
+from utils.cache import cache_response
+from utils.types import CacheTag
 from .serializer import OrganisationSerializer, InstitutesRetrivalSerializer
 
 
 class GetInstitutionsAPI(APIView):
 
+    @cache_response(tags=[CacheTag.ORGANIZATION], headers=["protectionKey"])
     def get(self, request, organisation_type, district_name):
         protection_key = request.headers.get("protectionKey")
         if not protection_key or not protection_key == config('PROTECTED_API_KEY'):
@@ -21,6 +24,7 @@ class GetInstitutionsAPI(APIView):
 
 
 class RetrieveInstitutesAPI(APIView):
+    @cache_response(tags=[CacheTag.ORGANIZATION])
     def get(self, request, district_name):
         district = District.objects.filter(name=district_name).first()
         organisations = Organization.objects.filter(org_type__in=["School", "College"], district=district)
@@ -1,5 +1,11 @@
+import itertools
+import re
+
 import decouple
 import requests
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
 from db.user import User
 
 from utils.exception import CustomException
@@ -8,16 +14,59 @@ from utils.response import CustomResponse
 
 
 
-def generate_muid(full_name):
-    full_name = full_name.replace(" ", "").lower()[:85]
-    muid = f"{full_name}@mulearn"
+# Registrations retried when a concurrent one takes the same muid first
+MUID_ATTEMPTS = 5
+
+
+def get_muid_base(full_name):
+    return full_name.replace(" ", "").lower()[:85]
+
+
+def generate_muid(full_name, exclude=()):
+    """
+    Returns `name@mulearn`, or `name-N@mulearn` with the lowest free N when
+    it is taken, reading every taken suffix of the name in one index range
+    query. Suspended users keep their muid, so they are counted as well.
+    :param full_name: Name the muid is made from
+    :param exclude: Muids to treat as taken on top of the existing ones
+    :return: The muid
+    """
+    base = get_muid_base(full_name)
+    pattern = re.compile(rf"{re.escape(base)}(?:-(\d+))?@mulearn")
+
+    taken = set()
+    muids = User.every.filter(
+        Q(muid=f"{base}@mulearn") | Q(muid__startswith=f"{base}-")
+    ).values_list("muid", flat=True)
+    for muid in [*muids, *exclude]:
+        if match := pattern.fullmatch(muid):
+            taken.add(int(match[1] or 0))
+
+    counter = next(counter for counter in itertools.count() if counter not in taken)
+    return f"{base}-{counter}@mulearn" if counter else f"{base}@mulearn"
+
 
-    counter = 0
-    while User.objects.filter(muid=muid).exists():
-        counter += 1
-        muid = f"{full_name}-{counter}@mulearn"
+def create_with_muid(full_name, create):
+    """
+    Calls `create(muid)` with a free muid, inside a savepoint. A concurrent
+    registration of the same name may insert the muid first, the unique
+    constraint then rejects the row and the next free muid is tried.
+    :param full_name: Name the muid is made from
+    :param create: Function creating the user with the muid
+    :return: The value returned by `create`
+    """
+    attempted = set()
+    for _ in range(MUID_ATTEMPTS):
+        muid = generate_muid(full_name, exclude=attempted)
+        try:
+            with transaction.atomic():
+                return create(muid)
+        except IntegrityError as e:
+            if "muid" not in str(e):
+                raise
+            attempted.add(muid)
 
-    return muid
+    raise CustomException("Could not allocate a muid, please try again")
 
 
 def get_auth_token(muid, password):
@@ -1,11 +1,13 @@
 from django.db.models import Q
 from rest_framework.views import APIView
 
-from db.organization import Country, Department, District, Organization, State, Zone
+from db.organization import Country, Department, District, Organization, State
 from db.task import InterestGroup
 from db.user import Role, User
 from utils.response import CustomResponse
-from utils.types import OrganizationType
+from utils.cache import cache_response
+from utils.geography import GeographyIndex
+from utils.types import CacheTag, OrganizationType
 from utils.utils import send_template_mail
 from . import serializers
 from .register_helper import get_auth_token
@@ -30,6 +32,7 @@ class RoleAPI(APIView):
 
 
 class CollegesAPI(APIView):
+    @cache_response(tags=[CacheTag.ORGANIZATION])
     def get(self, request):
         colleges = Organization.objects.filter(
             org_type=OrganizationType.COLLEGE.value
@@ -218,6 +221,7 @@ class CommunityAPI(APIView):
 
 
 class AreaOfInterestAPI(APIView):
+    @cache_response(tags=[CacheTag.INTEREST_GROUP])
     def get(self, request):
         aoi_queryset = InterestGroup.objects.all()
 
@@ -246,62 +250,53 @@ class UserEmailVerificationAPI(APIView):
 
 class UserCountryAPI(APIView):
     def get(self, request):
-        country = Country.objects.all()
+        countries = GeographyIndex.get_children("country")
 
-        if country is None:
-            return CustomResponse(
-                general_message="No data available"
-            ).get_success_response()
-
-        country_serializer = serializers.UserCountrySerializer(country, many=True).data
-
-        return CustomResponse(response=country_serializer).get_success_response()
+        return CustomResponse(
+            response=[{"country_name": country["name"]} for country in countries]
+        ).get_success_response()
 
 
 class UserStateAPI(APIView):
     def get(self, request):
-        country_name = request.data.get("country")
+        country = GeographyIndex.find("country", request.data.get("country"))
 
-        country_object = Country.objects.filter(name=country_name).first()
-
-        if country_object is None:
+        if country is None:
             return CustomResponse(
                 general_message="No country data available"
             ).get_success_response()
 
-        state_object = State.objects.filter(country_id=country_object).all()
+        states = GeographyIndex.get_children("state", country["id"])
 
-        if len(state_object) == 0:
+        if len(states) == 0:
             return CustomResponse(
                 general_message="No state data available for given country"
             ).get_success_response()
 
-        state_serializer = serializers.UserStateSerializer(state_object, many=True).data
-
-        return CustomResponse(response=state_serializer).get_success_response()
+        return CustomResponse(
+            response=[{"state_name": state["name"]} for state in states]
+        ).get_success_response()
 
 
 class UserZoneAPI(APIView):
     def get(self, request):
-        state_name = request.data.get("state")
+        state = GeographyIndex.find("state", request.data.get("state"))
 
-        state_object = State.objects.filter(name=state_name).first()
-
-        if state_object is None:
+        if state is None:
             return CustomResponse(
                 general_message="No state data available"
             ).get_success_response()
 
-        zone_object = Zone.objects.filter(state_id=state_object).all()
+        zones = GeographyIndex.get_children("zone", state["id"])
 
-        if len(zone_object) == 0:
+        if len(zones) == 0:
             return CustomResponse(
                 general_message="No zone data available for given country"
             ).get_success_response()
 
-        zone_serializer = serializers.UserZoneSerializer(zone_object, many=True).data
-
-        return CustomResponse(response=zone_serializer).get_success_response()
+        return CustomResponse(
+            response=[{"zone_name": zone["name"]} for zone in zones]
+        ).get_success_response()
 
 
 class LocationSearchView(APIView):
@@ -314,18 +309,6 @@ class LocationSearchView(APIView):
                 general_message="Query parameter 'q' is required"
             ).get_failure_response()
 
-        queries = [q.strip() for q in query.split(",")]
-
-        # Building the Q object for the OR-based lookup
-        query_filter = Q()
-        for q in queries:
-            query_filter |= Q(name__icontains=q)
-            query_filter |= Q(zone__state__name__icontains=q)
-            query_filter |= Q(zone__state__country__name__icontains=q)
-
-        districts = District.objects.filter(query_filter).select_related(
-            "zone__state", "zone__state__country"
-        )[:MAX_RESULTS]
-        all_districts = serializers.LocationSerializer(districts, many=True).data
+        all_districts = GeographyIndex.search(query, MAX_RESULTS)
 
         return CustomResponse(response=all_districts).get_success_response()
@@ -12,7 +12,6 @@ from db.organization import (
     Organization,
     State,
     UserOrganizationLink,
-    Zone,
 )
 from db.task import InterestGroup, Level, MucoinInviteLog, UserIgLink, UserLvlLink, Wallet
 from db.user import Role, Socials, User, UserMentor, UserReferralLink, UserRoleLink, UserSettings
@@ -269,15 +268,14 @@ class UserSerializer(serializers.ModelSerializer):
         role = validated_data.pop("role", None)
         area_of_interest = validated_data.pop("area_of_interest", None)
 
-        validated_data["muid"] = register_helper.generate_muid(
-            validated_data["full_name"]
-        )
-
         password = validated_data.pop("password")
         hashed_password = make_password(password)
         validated_data["password"] = hashed_password
 
-        user = super().create(validated_data)
+        user = register_helper.create_with_muid(
+            validated_data["full_name"],
+            lambda muid: super(UserSerializer, self).create({**validated_data, "muid": muid}),
+        )
 
         additional_values = {"user": user, "created_by": user, "updated_by": user}
 
@@ -364,38 +362,3 @@ class RegisterSerializer(serializers.Serializer):
             "param",
             "mentor",
         ]
-
-
-class UserCountrySerializer(serializers.ModelSerializer):
-    country_name = serializers.CharField(source="name")
-
-    class Meta:
-        model = Country
-        fields = ["country_name"]
-
-
-class UserStateSerializer(serializers.ModelSerializer):
-    state_name = serializers.CharField(source="name")
-
-    class Meta:
-        model = State
-        fields = ["state_name"]
-
-
-class UserZoneSerializer(serializers.ModelSerializer):
-    zone_name = serializers.CharField(source="name")
-
-    class Meta:
-        model = Zone
-        fields = ["zone_name"]
-
-
-class LocationSerializer(serializers.ModelSerializer):
-    location = serializers.SerializerMethodField()
-
-    class Meta:
-        model = District
-        fields = ("id", "location")
-
-    def get_location(self, obj):
-        return f"{obj.name}, {obj.zone.state.name}, {obj.zone.state.country.name}"
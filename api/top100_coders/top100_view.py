@@ -1,6 +1,7 @@
 from django.db import connection
 from rest_framework.views import APIView
 
+from db.user import User
 from utils.response import CustomResponse
 
 
@@ -10,7 +11,6 @@ class Leaderboard(APIView):
         SELECT 
         u.id,
         u.full_name, 
-        u.profile_pic,
         SUM(kal.karma) AS total_karma,
         COALESCE(org.title, comm.title) AS org,
         COALESCE(org.dis, d.name) AS dis,
@@ -58,4 +58,7 @@ class Leaderboard(APIView):
             column_names = [desc[0] for desc in cursor.description]
 
             list_of_dicts = [dict(zip(column_names, row)) for row in results]
+            for row in list_of_dicts:
+                # profile_pic is a property reading the storage, not a column
+                row["profile_pic"] = User(id=row["id"]).profile_pic
             return CustomResponse(response=list_of_dicts).get_success_response()
@@ -1,6 +1,11 @@
+import sys
+
 from django.apps import AppConfig
 from decouple import config
 
+# Commands creating the database they work on, it holds no system user yet
+SELF_SEEDING_COMMANDS = {"check_query_budgets", "seed_scale"}
+
 
 class SystemUserNotFoundError(Exception):
     pass
@@ -13,6 +18,8 @@ class DbConfig(AppConfig):
     def ready(self) -> None:
         # from db import organization
         _ready = super().ready()
+        if sys.argv[1:2] and sys.argv[1] in SELF_SEEDING_COMMANDS:
+            return _ready
         self.check_system_user_exists()
         return _ready
 
@@ -0,0 +1,44 @@
+from django.db import models
+
+# fmt: off
+# noinspection PyPep8
+
+class ErrorLogIndex(models.Model):
+    id          = models.CharField(primary_key=True, max_length=64)
+    type        = models.CharField(max_length=255)
+    message     = models.TextField()
+    method      = models.CharField(max_length=10)
+    path        = models.CharField(max_length=255)
+    route       = models.CharField(max_length=255)
+    count       = models.IntegerField(default=0)
+    open_count  = models.IntegerField(default=0)
+    first_seen  = models.DateTimeField()
+    last_seen   = models.DateTimeField()
+    patched_at  = models.DateTimeField(null=True)
+    samples     = models.JSONField(default=dict)
+    updated_at  = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "error_log_index"
+
+
+class ErrorLogAffectedUser(models.Model):
+    muid        = models.CharField(primary_key=True, max_length=100)
+    count       = models.IntegerField(default=0)
+    last_seen   = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "error_log_affected_user"
+
+
+class ErrorLogIndexState(models.Model):
+    log_name    = models.CharField(primary_key=True, max_length=100)
+    inode       = models.BigIntegerField(default=0)
+    byte_offset = models.BigIntegerField(default=0)
+    updated_at  = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "error_log_index_state"
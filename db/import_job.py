@@ -0,0 +1,45 @@
+import uuid
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from .user import User
+
+# fmt: off
+# noinspection PyPep8
+
+class ImportJob(models.Model):
+    id              = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    type            = models.CharField(max_length=50)
+    status          = models.CharField(max_length=20)
+    file_name       = models.CharField(max_length=255)
+    file            = models.BinaryField()
+    total_rows      = models.IntegerField(default=0)
+    processed_rows  = models.IntegerField(default=0)
+    success_count   = models.IntegerField(default=0)
+    failed_count    = models.IntegerField(default=0)
+    message         = models.CharField(max_length=255, null=True)
+    worker          = models.CharField(max_length=100, null=True)
+    started_at      = models.DateTimeField(null=True)
+    completed_at    = models.DateTimeField(null=True)
+    created_by      = models.ForeignKey(User, on_delete=models.SET(settings.SYSTEM_ADMIN_ID), db_column="created_by",
+                                        related_name="import_job_created_by")
+    updated_at      = models.DateTimeField()
+    created_at      = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        managed = False
+        db_table = "import_job"
+
+
+class ImportJobRow(models.Model):
+    id          = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    job         = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name="import_job_row_job")
+    status      = models.CharField(max_length=20)
+    data        = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at  = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        managed = False
+        db_table = "import_job_row"
@@ -0,0 +1,24 @@
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+# fmt: off
+# noinspection PyPep8
+
+class LeaderboardSnapshot(models.Model):
+    id          = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    board       = models.CharField(max_length=50)
+    period      = models.CharField(max_length=10)
+    data        = models.JSONField(encoder=DjangoJSONEncoder)
+    etag        = models.CharField(max_length=64)
+    frozen      = models.BooleanField(default=False)
+    updated_at  = models.DateTimeField()
+    created_at  = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        managed = False
+        db_table = "leaderboard_snapshot"
+        constraints = [
+            models.UniqueConstraint(fields=["board", "period"], name="unique_leaderboard_snapshot")
+        ]
@@ -23,3 +23,47 @@ class Notification(models.Model):
         managed = False
         db_table = "notification"
         ordering = ["created_at"]
+
+
+class EmailOutbox(models.Model):
+    id              = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    subject         = models.CharField(max_length=255)
+    body            = models.TextField()
+    html_body       = models.TextField(null=True)
+    from_email      = models.CharField(max_length=255)
+    recipients      = models.JSONField()
+    status          = models.CharField(max_length=20)
+    attempts        = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error      = models.CharField(max_length=255, null=True)
+    sent_at         = models.DateTimeField(null=True)
+    updated_at      = models.DateTimeField()
+    created_at      = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        managed = False
+        db_table = "email_outbox"
+
+
+class EmailOutboxAttachment(models.Model):
+    id          = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    email       = models.ForeignKey(EmailOutbox, on_delete=models.CASCADE, related_name="email_outbox_attachment_email")
+    filename    = models.CharField(max_length=255)
+    content     = models.BinaryField()
+    mimetype    = models.CharField(max_length=100, null=True)
+
+    class Meta:
+        managed = False
+        db_table = "email_outbox_attachment"
+
+
+class DiscordWebhookQueue(models.Model):
+    id              = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    content         = models.TextField()
+    attempts        = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    created_at      = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        managed = False
+        db_table = "discord_webhook_queue"
@@ -0,0 +1,26 @@
+from django.db import models
+
+# fmt: off
+# noinspection PyPep8
+
+class SearchDocument(models.Model):
+    id          = models.CharField(primary_key=True, max_length=36)
+    entity      = models.CharField(max_length=20)
+    object_id   = models.CharField(max_length=36)
+    muid        = models.CharField(max_length=100, null=True)
+    email       = models.CharField(max_length=200, null=True)
+    mobile      = models.CharField(max_length=15, null=True)
+    content     = models.TextField()
+    updated_at  = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "search_document"
+        constraints = [
+            models.UniqueConstraint(fields=["entity", "object_id"], name="unique_search_document")
+        ]
+        indexes = [
+            models.Index(fields=["entity", "muid"], name="search_document_muid"),
+            models.Index(fields=["entity", "email"], name="search_document_email"),
+            models.Index(fields=["entity", "mobile"], name="search_document_mobile"),
+        ]
@@ -145,6 +145,18 @@ class Wallet(models.Model):
         db_table = "wallet"
 
 
+class UserRankIndex(models.Model):
+    id = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="user_rank_index_user")
+    segment = models.CharField(max_length=10)
+    karma = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = "user_rank_index"
+
+
 class KarmaActivityLog(models.Model):
     id = models.CharField(default=uuid.uuid4, primary_key=True, max_length=36)
     karma = models.IntegerField()
@@ -241,6 +253,16 @@ class VoucherLog(models.Model):
         db_table = "voucher_log"
 
 
+class VoucherCodeSequence(models.Model):
+    prefix = models.CharField(primary_key=True, max_length=10)
+    last_serial = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = "voucher_code_sequence"
+
+
 class Events(models.Model):
     id          = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
     name        = models.CharField(max_length=75)
@@ -16,8 +16,12 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
 django.setup()
 
+from utils.discord_webhook import dispatcher
 from .routing import urlpatterns
 
+# post the webhook updates left stored by previous processes
+dispatcher.start()
+
 application = ProtocolTypeRouter({
     'http': get_asgi_application(),
     'websocket': URLRouter(
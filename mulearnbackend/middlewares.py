@@ -4,6 +4,7 @@ import hmac
 import json
 import json
 import logging
+import time
 import traceback
 
 import decouple
@@ -13,6 +14,7 @@ from rest_framework import status
 from rest_framework.renderers import JSONRenderer
 
 from utils.exception import CustomException
+from utils.request_metrics import QueryCounter, request_metrics
 from utils.response import CustomResponse
 from utils.utils import _CustomHTTPHandler
 
@@ -75,6 +77,44 @@ class ApiSignatureMiddleware(object):
         return self.get_response(request)
 
 
+class RequestMetricsMiddleware:
+    """
+    Measures the wall time, database queries and response size of sampled
+    requests and records them per URL route in `request_metrics`. Requests
+    outside the REQUEST_METRICS_SAMPLE_RATE sample are only counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request_metrics.should_sample():
+            response = self.get_response(request)
+            request_metrics.record(self.get_route(request), response.status_code)
+            return response
+
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with queries.wrap_connections():
+            response = self.get_response(request)
+
+        observations = {
+            "duration_seconds": time.perf_counter() - start,
+            "db_seconds": queries.duration,
+            "db_queries": queries.count,
+        }
+        if not response.streaming:
+            observations["response_bytes"] = len(response.content)
+
+        request_metrics.record(self.get_route(request), response.status_code, observations)
+        return response
+
+    @staticmethod
+    def get_route(request) -> str:
+        resolver_match = getattr(request, "resolver_match", None)
+        return resolver_match.route if resolver_match else "unresolved"
+
+
 class UniversalErrorHandlerMiddleware:
     """
     Middleware for handling exceptions and generating error responses.
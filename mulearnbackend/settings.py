@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 
 
 import os
+import sys
 from pathlib import Path
 
 from decouple import config as decouple_config
@@ -57,6 +58,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "mulearnbackend.middlewares.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -103,6 +105,98 @@ CHANNEL_LAYERS = {
     },
 }
 
+TESTING = "test" in sys.argv or "pytest" in sys.modules
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://{decouple_config('REDIS_HOST')}:{decouple_config('REDIS_PORT')}",
+    }
+}
+
+# Tests must not depend on a running Redis
+if TESTING:
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+
+# Default time to live, in seconds, of cached API responses
+RESPONSE_CACHE_TTL = decouple_config("RESPONSE_CACHE_TTL", default=300, cast=int)
+
+# Leaderboards
+# Seconds after which a request rebuilds the snapshot of a leaderboard, build_leaderboards
+# may still refresh them on a schedule
+LEADERBOARD_SNAPSHOT_TTL = decouple_config("LEADERBOARD_SNAPSHOT_TTL", default=300, cast=int)
+
+# Landing stats websocket
+# Seconds to coalesce counter changes into a single broadcast
+LANDING_STATS_BROADCAST_INTERVAL = decouple_config("LANDING_STATS_BROADCAST_INTERVAL", default=5, cast=int)
+# Seconds after which the counters are reconciled against the database
+LANDING_STATS_RECONCILE_INTERVAL = decouple_config("LANDING_STATS_RECONCILE_INTERVAL", default=900, cast=int)
+
+# Background imports
+# Rows processed and committed together by an import worker
+IMPORT_JOB_BATCH_SIZE = decouple_config("IMPORT_JOB_BATCH_SIZE", default=500, cast=int)
+# Seconds an idle import worker waits before polling the queue again
+IMPORT_JOB_POLL_INTERVAL = decouple_config("IMPORT_JOB_POLL_INTERVAL", default=2, cast=int)
+# Seconds without progress after which a running import is handed to another worker
+IMPORT_JOB_STALE_TIMEOUT = decouple_config("IMPORT_JOB_STALE_TIMEOUT", default=600, cast=int)
+
+# Karma vouchers
+# Pillow format of the voucher images: JPEG, PNG or WEBP
+KARMA_VOUCHER_FORMAT = decouple_config("KARMA_VOUCHER_FORMAT", default="JPEG").upper()
+# Encoder quality of JPEG and WEBP vouchers
+KARMA_VOUCHER_QUALITY = decouple_config("KARMA_VOUCHER_QUALITY", default=75, cast=int)
+# Processes rendering the vouchers of bulk imports, 1 renders in the worker itself
+KARMA_VOUCHER_RENDER_WORKERS = decouple_config("KARMA_VOUCHER_RENDER_WORKERS", default=2, cast=int)
+
+# Email outbox
+# Mails sent over one connection by the outbox worker
+MAIL_OUTBOX_BATCH_SIZE = decouple_config("MAIL_OUTBOX_BATCH_SIZE", default=50, cast=int)
+# Seconds an idle outbox worker waits before polling again
+MAIL_OUTBOX_POLL_INTERVAL = decouple_config("MAIL_OUTBOX_POLL_INTERVAL", default=5, cast=int)
+# Delivery attempts before a mail is marked as failed
+MAIL_OUTBOX_MAX_ATTEMPTS = decouple_config("MAIL_OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+# Seconds before the first retry, doubled after every failed attempt
+MAIL_OUTBOX_RETRY_DELAY = decouple_config("MAIL_OUTBOX_RETRY_DELAY", default=60, cast=int)
+# Seconds a claimed mail is reserved for its worker before another may retry it
+MAIL_OUTBOX_CLAIM_TIMEOUT = decouple_config("MAIL_OUTBOX_CLAIM_TIMEOUT", default=300, cast=int)
+
+# Discord webhooks
+# Seconds between two flushes of the queued webhook updates
+DISCORD_WEBHOOK_FLUSH_INTERVAL = decouple_config("DISCORD_WEBHOOK_FLUSH_INTERVAL", default=1, cast=float)
+# Updates held in memory per process, further updates are stored in the database
+DISCORD_WEBHOOK_QUEUE_SIZE = decouple_config("DISCORD_WEBHOOK_QUEUE_SIZE", default=1000, cast=int)
+# Seconds to wait for the webhook to respond
+DISCORD_WEBHOOK_TIMEOUT = decouple_config("DISCORD_WEBHOOK_TIMEOUT", default=5, cast=int)
+# Delivery attempts before an update is dropped
+DISCORD_WEBHOOK_MAX_ATTEMPTS = decouple_config("DISCORD_WEBHOOK_MAX_ATTEMPTS", default=5, cast=int)
+# Send the updates of a flush as newline separated lines of one message,
+# only enable it once the bot reading the channel splits messages on newlines
+DISCORD_WEBHOOK_MERGE_UPDATES = decouple_config("DISCORD_WEBHOOK_MERGE_UPDATES", default=False, cast=bool)
+
+# Error log index
+# Bytes of error.log indexed by a dashboard request, run index_error_log to catch up on larger backlogs
+ERROR_LOG_INDEX_CHUNK_SIZE = decouple_config("ERROR_LOG_INDEX_CHUNK_SIZE", default=2 * 1024 * 1024, cast=int)
+# Recent timestamps, auth, bodies and tracebacks kept per error
+ERROR_LOG_INDEX_SAMPLES = decouple_config("ERROR_LOG_INDEX_SAMPLES", default=20, cast=int)
+
+# Request metrics
+# Share of requests whose time, queries and size are measured, the others are only counted
+REQUEST_METRICS_SAMPLE_RATE = decouple_config("REQUEST_METRICS_SAMPLE_RATE", default=1.0, cast=float)
+# Seconds of requests covered by the histograms
+REQUEST_METRICS_WINDOW = decouple_config("REQUEST_METRICS_WINDOW", default=900, cast=int)
+# Seconds between two stores of the measurements of a process in the cache
+REQUEST_METRICS_FLUSH_INTERVAL = decouple_config("REQUEST_METRICS_FLUSH_INTERVAL", default=10, cast=int)
+
+# Pagination
+# Seconds the total count of a cursor paginated list is cached, the count may lag by as much
+PAGINATION_COUNT_CACHE_TIMEOUT = decouple_config("PAGINATION_COUNT_CACHE_TIMEOUT", default=300, cast=int)
+
+# Search
+# How list searches read the search_document index: "fulltext" uses its MySQL FULLTEXT index,
+# "contains" a substring match, "auto" picks by database and "fields" ignores the index and
+# matches every search field, for instance until rebuild_search_index has filled it
+SEARCH_BACKEND = decouple_config("SEARCH_BACKEND", default="auto")
+
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
@@ -116,6 +210,13 @@ DATABASES = {
         "PORT": decouple_config("DATABASE_PORT"),
     }
 }
+# Second connection to the same database, voucher codes are reserved on it in their own
+# short transaction so the sequence lock is not held until the caller's transaction ends,
+# test databases point it at the test database of "default"
+DATABASES["sequence"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+
+# Number of rejected JWTs remembered per process to skip re-validating them
+JWT_INVALID_TOKEN_CACHE_SIZE = decouple_config("JWT_INVALID_TOKEN_CACHE_SIZE", default=1024, cast=int)
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
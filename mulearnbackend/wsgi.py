@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mulearnbackend.settings')
 
 application = get_wsgi_application()
+
+from utils.discord_webhook import dispatcher  # noqa: E402
+
+# post the webhook updates left stored by previous processes
+dispatcher.start()
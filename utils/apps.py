@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UtilsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'utils'
+
+    def ready(self) -> None:
+        # register model signal receivers
+        from utils import cache, rank_index, search_index  # noqa: F401
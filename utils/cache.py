@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from db.learning_circle import LearningCircle
+from db.organization import Country, District, Organization, State, Zone
+from db.task import InterestGroup
+from db.user import User, UserRoleLink
+from utils.permission import JWTUtils
+from utils.types import CacheTag
+
+logger = logging.getLogger("django")
+
+# Models whose writes invalidate every response cached under the tag
+CACHE_TAG_MODELS = {
+    CacheTag.INTEREST_GROUP.value: [InterestGroup],
+    CacheTag.LOCATION.value: [Country, State, Zone, District],
+    CacheTag.ORGANIZATION.value: [Organization, District],
+    CacheTag.LANDING_STATS.value: [User, Organization, UserRoleLink, InterestGroup, LearningCircle],
+}
+
+
+class ResponseCache:
+    """
+    Caches CustomResponse payloads of APIView methods.
+
+    Every tag has a version stored in the cache and the versions of a
+    response's tags are part of its key, so invalidating a tag only replaces
+    its version and all responses cached under it are never read again.
+    """
+
+    key_prefix = "response"
+    tag_prefix = "response_tag"
+
+    @staticmethod
+    def get_tag_versions(tags) -> list[str]:
+        keys = [f"{ResponseCache.tag_prefix}:{tag}" for tag in tags]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                cache.add(key, uuid.uuid4().hex, timeout=None)
+                versions[key] = cache.get(key)
+        return [versions[key] for key in keys]
+
+    @staticmethod
+    def invalidate(*tags):
+        cache.set_many(
+            {f"{ResponseCache.tag_prefix}:{tag}": uuid.uuid4().hex for tag in tags},
+            timeout=None,
+        )
+
+    @staticmethod
+    def get_roles(request) -> list[str]:
+        if not JWTUtils.is_logged_in(request):
+            return []
+        return sorted(JWTUtils.fetch_role(request))
+
+    @staticmethod
+    def get_key(request, tags, headers) -> str:
+        parts = [
+            request.path,
+            request.META.get("QUERY_STRING", ""),
+            ",".join(ResponseCache.get_roles(request)),
+            *(request.headers.get(header, "") for header in headers),
+            *ResponseCache.get_tag_versions(tags),
+        ]
+        digest = hashlib.sha256("|".join(parts).encode()).hexdigest()
+        return f"{ResponseCache.key_prefix}:{digest}"
+
+
+def cache_response(ttl: int = None, tags=(), headers=()):
+    """
+    Caches the successful responses of an APIView method.
+
+    Args:
+        ttl (int, optional): Seconds to keep a response. Defaults to RESPONSE_CACHE_TTL.
+        tags (list, optional): CacheTag values invalidated by model writes.
+        headers (list, optional): Request headers the response varies on.
+    """
+    tags = [tag.value if isinstance(tag, CacheTag) else tag for tag in tags]
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped_view_func(obj, request, *args, **kwargs):
+            key = ResponseCache.get_key(request, tags, headers)
+            if (data := cache.get(key)) is not None:
+                return Response(data=data, status=status.HTTP_200_OK)
+
+            response = view_func(obj, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK and not response.data.get("hasError"):
+                data = json.loads(json.dumps(response.data, cls=JSONEncoder))
+                cache.set(key, data, timeout=settings.RESPONSE_CACHE_TTL if ttl is None else ttl)
+            return response
+
+        return wrapped_view_func
+
+    return decorator
+
+
+def invalidate_tags(tags):
+    # cached responses are optional, a cache outage must not fail the write
+    try:
+        ResponseCache.invalidate(*tags)
+    except Exception:
+        logger.exception(f"Could not invalidate the cache tags {', '.join(tags)}")
+
+
+def invalidate_tags_signal(sender, *args, **kwargs):
+    tags = [tag for tag, models in CACHE_TAG_MODELS.items() if sender in models]
+    # once committed, so a reader never caches the old rows under the new version
+    transaction.on_commit(lambda: invalidate_tags(tags), using=kwargs.get("using"))
+
+
+for _models in CACHE_TAG_MODELS.values():
+    for _model in _models:
+        post_save.connect(invalidate_tags_signal, sender=_model, dispatch_uid=f"cache_{_model.__name__}_save")
+        post_delete.connect(invalidate_tags_signal, sender=_model, dispatch_uid=f"cache_{_model.__name__}_delete")
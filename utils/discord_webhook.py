@@ -0,0 +1,238 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import timedelta
+
+import requests
+from decouple import config
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+
+from db.notification import DiscordWebhookQueue
+from utils.utils import DateTimeUtils
+
+logger = logging.getLogger("django")
+
+# Longest content Discord accepts in one message
+MESSAGE_LIMIT = 2000
+# Seconds between two reads of the database queue when this process stored nothing
+STORED_POLL_INTERVAL = 10
+
+
+class WebhookDispatcher:
+    """
+    Posts Discord webhook updates from a background thread of each process.
+
+    Callers only put the update on a bounded in-memory queue; updates that do
+    not fit are kept in the `discord_webhook_queue` table and posted by any
+    process. Every update is an event of its own and posted, in the order it
+    was enqueued, over one keep-alive session. When a post fails or Discord's
+    rate limit is exhausted, the update and every later one wait for the
+    backoff instead of overtaking it.
+
+    The server starts the dispatcher when it loads, so the updates stored by
+    a process that exited are posted without waiting for a new one.
+    """
+
+    metrics_prefix = "discord_webhook"
+    metrics = ["sent", "failed", "dropped", "rate_limited", "stored"]
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=settings.DISCORD_WEBHOOK_QUEUE_SIZE)
+        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.paused_until = 0
+        self.next_stored_poll = 0
+        # [content, failed attempts] of the updates waiting to be posted, oldest first
+        self.pending = []
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name="discord-webhook", daemon=True)
+                self.thread.start()
+
+    def enqueue(self, content: str):
+        self.start()
+        try:
+            self.queue.put_nowait(content)
+        except queue.Full:
+            self.store([[content, 0]])
+
+    def incr_metric(self, name: str, delta: int = 1):
+        if not delta:
+            return
+        key = f"{self.metrics_prefix}:{name}"
+        try:
+            if not cache.add(key, delta, timeout=None):
+                cache.incr(key, delta)
+        except Exception:
+            logger.exception(f"Could not count the {name} discord webhooks")
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the update counters shared by every process, the number of
+        in-memory updates of this process and the number of stored updates.
+        """
+        counters = cache.get_many([f"{self.metrics_prefix}:{name}" for name in self.metrics])
+        return {
+            **{name: counters.get(f"{self.metrics_prefix}:{name}", 0) for name in self.metrics},
+            "queue_depth": self.queue.qsize() + len(self.pending),
+            "stored_depth": DiscordWebhookQueue.objects.count(),
+        }
+
+    def store(self, updates: list, delay: int = 0):
+        """
+        Keeps updates in the database queue.
+
+        Args:
+            updates (list): [content, failed attempts] of each update.
+            delay (int, optional): Seconds before the updates are due.
+        """
+        if not updates:
+            return
+        next_attempt_at = DateTimeUtils.get_current_utc_time() + timedelta(seconds=delay)
+        try:
+            DiscordWebhookQueue.objects.bulk_create(
+                [
+                    DiscordWebhookQueue(content=content, attempts=attempts, next_attempt_at=next_attempt_at)
+                    for content, attempts in updates
+                ]
+            )
+        except Exception:
+            logger.exception("Could not store the discord webhooks")
+            self.incr_metric("dropped", len(updates))
+        else:
+            self.incr_metric("stored", len(updates))
+            self.next_stored_poll = min(self.next_stored_poll, time.monotonic() + delay)
+
+    def claim_stored(self) -> list:
+        if time.monotonic() < self.next_stored_poll:
+            return []
+        self.next_stored_poll = time.monotonic() + STORED_POLL_INTERVAL
+
+        with transaction.atomic():
+            stored = list(
+                DiscordWebhookQueue.objects.select_for_update(skip_locked=True)
+                .filter(next_attempt_at__lte=DateTimeUtils.get_current_utc_time())
+                .order_by("created_at")
+                .values_list("id", "content", "attempts")[:settings.DISCORD_WEBHOOK_QUEUE_SIZE]
+            )
+            DiscordWebhookQueue.objects.filter(id__in=[row[0] for row in stored]).delete()
+        return [[content, attempts] for _, content, attempts in stored]
+
+    def get_queued(self) -> list:
+        updates = []
+        while True:
+            try:
+                updates.append([self.queue.get_nowait(), 0])
+            except queue.Empty:
+                return updates
+
+    def get_messages(self, updates: list) -> list[list]:
+        """
+        Groups the updates into messages, several per message only when
+        DISCORD_WEBHOOK_MERGE_UPDATES is enabled.
+        """
+        if not settings.DISCORD_WEBHOOK_MERGE_UPDATES:
+            return [[update] for update in updates]
+
+        messages = []
+        length = MESSAGE_LIMIT
+        for update in updates:
+            if length + len(update[0]) + 1 > MESSAGE_LIMIT:
+                messages.append([])
+                length = -1
+            messages[-1].append(update)
+            length += len(update[0]) + 1
+        return messages
+
+    def post(self, message: list[str]) -> requests.Response:
+        return self.session.post(
+            config("DISCORD_WEBHOOK_LINK"),
+            json={"content": "\n".join(message)},
+            timeout=settings.DISCORD_WEBHOOK_TIMEOUT,
+        )
+
+    def fail(self, messages: list[list]):
+        """
+        Keeps the updates of a failed message ahead of the later ones for a
+        retry with exponential backoff, or drops them after
+        DISCORD_WEBHOOK_MAX_ATTEMPTS.
+        """
+        retries = [[content, attempts + 1] for content, attempts in messages[0]]
+        kept = [update for update in retries if update[1] < settings.DISCORD_WEBHOOK_MAX_ATTEMPTS]
+
+        self.incr_metric("failed", len(retries))
+        self.incr_metric("dropped", len(retries) - len(kept))
+        if kept:
+            self.paused_until = time.monotonic() + 2 ** max(attempts for _, attempts in kept)
+        self.pending = kept + [update for message in messages[1:] for update in message]
+
+    def flush(self):
+        if time.monotonic() < self.paused_until:
+            return
+        if not self.pending:
+            self.pending = self.get_queued() + self.claim_stored()
+
+        messages = self.get_messages(self.pending)
+        for index, message in enumerate(messages):
+            if time.monotonic() < self.paused_until:
+                self.pending = [update for message in messages[index:] for update in message]
+                return
+
+            try:
+                response = self.post([content for content, _ in message])
+            except requests.RequestException:
+                logger.exception("Discord webhook request failed")
+                self.fail(messages[index:])
+                return
+
+            if response.status_code == 429:
+                self.incr_metric("rate_limited")
+                self.paused_until = time.monotonic() + self.get_retry_after(response)
+                self.pending = [update for message in messages[index:] for update in message]
+                return
+
+            if not response.ok:
+                logger.error(f"Discord webhook responded {response.status_code}: {response.text[:200]}")
+                self.fail(messages[index:])
+                return
+
+            self.incr_metric("sent", len(message))
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                self.paused_until = time.monotonic() + float(
+                    response.headers.get("X-RateLimit-Reset-After", 1)
+                )
+        self.pending = []
+
+    @staticmethod
+    def get_retry_after(response: requests.Response) -> float:
+        try:
+            return float(response.json()["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return float(response.headers.get("Retry-After", 1))
+
+    def run(self):
+        while True:
+            time.sleep(settings.DISCORD_WEBHOOK_FLUSH_INTERVAL)
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                logger.exception("Discord webhook flush failed")
+
+    def store_pending(self):
+        """
+        Moves the in-memory updates to the database queue when the process exits.
+        """
+        updates, self.pending = self.pending, []
+        self.store(updates + self.get_queued())
+
+
+dispatcher = WebhookDispatcher()
+atexit.register(dispatcher.store_pending)
@@ -0,0 +1,325 @@
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.urls import Resolver404, resolve
+
+from db.error_log import ErrorLogAffectedUser, ErrorLogIndex, ErrorLogIndexState
+from db.user import User
+from utils.utils import DateTimeUtils
+
+# Start of every record written by the "verbose" formatter: "{asctime} {levelname} "
+RECORD_START = re.compile(rb"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} [A-Z]+ ", re.MULTILINE)
+TIMESTAMP_LENGTH = len("2000-01-01 00:00:00,000")
+
+# Record of CustomExceptionHandler.log_exception, after its "EXCEPTION INFO:" header
+EXCEPTION_PATTERN = re.compile(
+    r"ID: (?P<id>.+?)\n"
+    r"TYPE: (?P<type>.*?)\n"
+    r"MESSAGE: (?P<message>.*?)\n"
+    r"METHOD: (?P<method>.*?)\n"
+    r"PATH: (?P<path>.*?)\n"
+    r"AUTH: \n(?P<auth>.*?)\n"
+    r"BODY: \n(?P<body>.*?)\n"
+    r"TRACEBACK: (?P<traceback>.*)",
+    re.DOTALL,
+)
+PATCH_PATTERN = re.compile(r"PATCHED : (\w+)")
+MUID_PATTERN = re.compile(r"\n *\"muid\" *: * \"(.+?@mulearn)\",")
+
+# Distinct values of these fields are sampled for the dashboard, newest first
+SAMPLED_FIELDS = ["timestamp", "auth", "body", "traceback"]
+
+
+class ErrorLogIndexer:
+    """
+    Maintains an index of the exceptions written to error.log.
+
+    The log is read forward from the byte offset stored in
+    `error_log_index_state`, so a refresh only parses the records appended
+    since the previous one. Every exception is aggregated into one
+    `error_log_index` row per error id with its counts, first and last
+    occurrence, patch time and a few recent samples. A PATCHED record resets
+    the open occurrences of its error, as parse_logs did by hiding the entries
+    logged before the patch.
+    """
+
+    log_name = "error"
+
+    @staticmethod
+    def get_log_path(log_name: str) -> str:
+        return f"{settings.LOG_PATH}/{log_name}.log"
+
+    @staticmethod
+    def get_timestamp(record: str) -> datetime:
+        return datetime.fromisoformat(
+            record[:TIMESTAMP_LENGTH].replace(",", ".")
+        ).replace(tzinfo=timezone.utc)
+
+    @staticmethod
+    def get_route(path: str) -> str:
+        try:
+            return resolve(path).route
+        except Resolver404:
+            return path
+
+    @staticmethod
+    def load_json(value: str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
+    @staticmethod
+    def read_records(log_file, remaining: int, max_bytes: int = None) -> tuple[list[bytes], int]:
+        """
+        Reads the complete records following the current position.
+
+        A record is complete once the next one has started, the last record of
+        the file only when it ends with a newline. The read grows past
+        `max_bytes` as long as it holds no complete record.
+
+        Returns:
+            tuple: The records and the number of bytes they span.
+        """
+        read_size = min(remaining, max_bytes or remaining)
+        data = b""
+
+        while True:
+            data += log_file.read(read_size - len(data))
+            at_eof = len(data) >= remaining
+            starts = [match.start() for match in RECORD_START.finditer(data)]
+
+            if at_eof and data.endswith(b"\n"):
+                end = len(data)
+            elif len(starts) > 1 or (starts and starts[0] > 0):
+                end = starts[-1]
+            elif not starts:
+                # No record starts here, skip the lines left of a truncated one
+                end = data.rfind(b"\n") + 1
+            else:
+                end = 0
+
+            if end or at_eof:
+                break
+            read_size = min(remaining, read_size * 2)
+
+        bounds = [start for start in starts if start < end] + [end]
+        records = [data[start:stop] for start, stop in zip(bounds, bounds[1:])]
+        return records, end
+
+    @staticmethod
+    def parse_record(record: bytes) -> dict | None:
+        text = record.decode("utf-8", errors="replace")
+        header, _, content = text.partition("\n")
+
+        if " ERROR " not in header[TIMESTAMP_LENGTH:TIMESTAMP_LENGTH + 7]:
+            return None
+
+        if header.endswith("EXCEPTION INFO:"):
+            if not (match := EXCEPTION_PATTERN.match(content)):
+                return None
+            return {
+                **match.groupdict(),
+                "patch": False,
+                "timestamp": ErrorLogIndexer.get_timestamp(text),
+                "traceback": match["traceback"].rstrip("\n"),
+                "muids": MUID_PATTERN.findall(text),
+            }
+
+        if match := PATCH_PATTERN.search(header):
+            return {
+                "id": match[1],
+                "patch": True,
+                "timestamp": ErrorLogIndexer.get_timestamp(text),
+            }
+        return None
+
+    @staticmethod
+    def add_sample(samples: dict, field: str, value):
+        values = samples.setdefault(field, [])
+        if value not in values:
+            values.insert(0, value)
+            del values[settings.ERROR_LOG_INDEX_SAMPLES:]
+
+    @staticmethod
+    def index(entries: list[dict]):
+        """
+        Folds parsed records, in log order, into the index rows.
+        """
+        now = DateTimeUtils.get_current_utc_time()
+        rows = ErrorLogIndex.objects.in_bulk({entry["id"] for entry in entries})
+        existing = set(rows)
+        users = {}
+
+        for entry in entries:
+            row = rows.get(entry["id"])
+            timestamp = entry["timestamp"]
+
+            if entry["patch"]:
+                if row and (row.patched_at is None or row.patched_at < timestamp):
+                    row.patched_at = timestamp
+                    row.open_count = 0
+                    row.samples = {}
+                continue
+
+            if row is None:
+                row = rows[entry["id"]] = ErrorLogIndex(
+                    id=entry["id"],
+                    type=entry["type"][:255],
+                    message=entry["message"],
+                    method=entry["method"][:10],
+                    path=entry["path"][:255],
+                    route=ErrorLogIndexer.get_route(entry["path"])[:255],
+                    first_seen=timestamp,
+                    last_seen=timestamp,
+                    samples={},
+                )
+
+            row.count += 1
+            row.first_seen = min(row.first_seen, timestamp)
+            row.last_seen = max(row.last_seen, timestamp)
+            if row.patched_at is None or timestamp >= row.patched_at:
+                row.open_count += 1
+                ErrorLogIndexer.add_sample(row.samples, "timestamp", timestamp.isoformat())
+                for field in ["auth", "body"]:
+                    ErrorLogIndexer.add_sample(
+                        row.samples, field, ErrorLogIndexer.load_json(entry[field])
+                    )
+                ErrorLogIndexer.add_sample(row.samples, "traceback", entry["traceback"])
+
+            for muid in entry["muids"]:
+                count, last_seen = users.get(muid, (0, timestamp))
+                users[muid] = (count + 1, max(last_seen, timestamp))
+
+        for row in rows.values():
+            row.updated_at = now
+        ErrorLogIndex.objects.bulk_create(
+            [row for row_id, row in rows.items() if row_id not in existing]
+        )
+        ErrorLogIndex.objects.bulk_update(
+            [row for row_id, row in rows.items() if row_id in existing],
+            ["count", "open_count", "first_seen", "last_seen", "patched_at", "samples", "updated_at"],
+        )
+
+        affected_users = ErrorLogAffectedUser.objects.in_bulk(list(users))
+        for muid, (count, last_seen) in users.items():
+            if user := affected_users.get(muid):
+                user.count += count
+                user.last_seen = max(user.last_seen, last_seen)
+        ErrorLogAffectedUser.objects.bulk_update(affected_users.values(), ["count", "last_seen"])
+        ErrorLogAffectedUser.objects.bulk_create(
+            [
+                ErrorLogAffectedUser(muid=muid, count=count, last_seen=last_seen)
+                for muid, (count, last_seen) in users.items()
+                if muid not in affected_users
+            ]
+        )
+
+    @staticmethod
+    def refresh(max_bytes: int = None) -> int:
+        """
+        Indexes the records appended to error.log since the last refresh.
+        A rotated or truncated log is read again from its start.
+
+        Args:
+            max_bytes (int, optional): Bytes to read at most, all new records if None.
+
+        Returns:
+            int: Number of bytes consumed, 0 once the index is up to date.
+
+        Raises:
+            IOError: The log file can not be read.
+        """
+        log_name = ErrorLogIndexer.log_name
+        with open(ErrorLogIndexer.get_log_path(log_name), "rb") as log_file:
+            stat = os.fstat(log_file.fileno())
+            ErrorLogIndexState.objects.get_or_create(
+                log_name=log_name,
+                defaults={"updated_at": DateTimeUtils.get_current_utc_time()},
+            )
+
+            with transaction.atomic():
+                state = ErrorLogIndexState.objects.select_for_update().get(log_name=log_name)
+                if state.inode != stat.st_ino or state.byte_offset > stat.st_size:
+                    state.inode = stat.st_ino
+                    state.byte_offset = 0
+
+                log_file.seek(state.byte_offset)
+                records, consumed = ErrorLogIndexer.read_records(
+                    log_file, stat.st_size - state.byte_offset, max_bytes
+                )
+                if entries := list(filter(None, map(ErrorLogIndexer.parse_record, records))):
+                    ErrorLogIndexer.index(entries)
+
+                state.byte_offset += consumed
+                state.updated_at = DateTimeUtils.get_current_utc_time()
+                state.save()
+
+        return consumed
+
+    @staticmethod
+    def clear():
+        """
+        Drops the index, the next refresh parses the whole log again, e.g.
+        after it was cleared.
+        """
+        with transaction.atomic():
+            ErrorLogIndex.objects.all().delete()
+            ErrorLogAffectedUser.objects.all().delete()
+            ErrorLogIndexState.objects.all().delete()
+
+    @staticmethod
+    def get_errors() -> list[dict]:
+        """
+        Returns the errors with occurrences after their last patch, most
+        recent first, in the shape parse_logs returned them.
+        """
+        errors = ErrorLogIndex.objects.filter(open_count__gt=0).order_by("-last_seen")
+        return [
+            {
+                "id": error.id,
+                "type": [error.type],
+                "message": [error.message],
+                "method": [error.method],
+                "path": [error.path],
+                **{field: error.samples.get(field, []) for field in SAMPLED_FIELDS},
+                "count": error.open_count,
+                "total_count": error.count,
+                "first_seen": error.first_seen,
+                "last_seen": error.last_seen,
+                "patched_at": error.patched_at,
+            }
+            for error in errors
+        ]
+
+    @staticmethod
+    def get_urls_heatmap() -> dict:
+        return dict(
+            ErrorLogIndex.objects.values("route")
+            .annotate(hits=Sum("count"))
+            .values_list("route", "hits")
+        )
+
+    @staticmethod
+    def get_incident_info() -> dict:
+        last_incident = ErrorLogIndex.objects.aggregate(last_seen=Max("last_seen"))["last_seen"]
+        if last_incident is None:
+            return {"last_incident": None, "time_since_then": None}
+
+        time_since_then = DateTimeUtils.get_current_utc_time() - last_incident
+        return {
+            "last_incident": last_incident,
+            "time_since_then": time_since_then.total_seconds(),
+        }
+
+    @staticmethod
+    def get_affected_users() -> float:
+        users = User.objects.count()
+        if not users:
+            return 0
+        return (ErrorLogAffectedUser.objects.count() / users) * 100
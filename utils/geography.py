@@ -0,0 +1,235 @@
+import re
+import unicodedata
+
+from db.organization import Country, District, State, Zone
+from utils.cache import ResponseCache
+from utils.types import CacheTag
+
+# Weight of a match on each level when ranking districts, a district found
+# by its own name ranks above one found by its state or country
+LEVEL_WEIGHTS = {"district": 1.0, "state": 0.6, "country": 0.3}
+
+# Scores of the ways a name matches a search term
+EXACT_SCORE = 100
+PREFIX_SCORE = 80
+WORD_PREFIX_SCORE = 60
+SUBSTRING_SCORE = 40
+FUZZY_SCORE = 20
+
+# Share of trigrams a misspelt term needs in common with a name
+FUZZY_THRESHOLD = 0.3
+
+
+def normalize(name: str) -> str:
+    """
+    Lowercases a name, strips its accents and keeps words of letters and digits.
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", name.lower()))
+
+
+def get_trigrams(key: str) -> set[str]:
+    padded = f" {key} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class GeographyTree:
+    """
+    One loaded copy of the countries, states, zones and districts with the
+    maps answering lookups and searches.
+    """
+
+    def __init__(self):
+        self.nodes = {"country": {}, "state": {}, "zone": {}, "district": {}}
+        self.children = {}
+        self.names = {}
+        self.prefixes = {}
+        self.trigrams = {}
+
+        for level, model, parent in [
+            ("country", Country, None),
+            ("state", State, "country_id"),
+            ("zone", Zone, "state_id"),
+            ("district", District, "zone_id"),
+        ]:
+            fields = ["id", "name", parent] if parent else ["id", "name"]
+            for row in model.objects.values(*fields):
+                self.add(level, row["id"], row["name"], row.get(parent))
+
+        for key in self.children:
+            self.children[key].sort(key=lambda node: (node["name"].lower(), node["id"]))
+
+        # districts under each state and country, searches on those levels rank them
+        self.districts = {}
+        for district in self.nodes["district"].values():
+            state = self.get_parent(self.get_parent(district))
+            district["state"] = state
+            district["country"] = self.get_parent(state)
+            for node in (state, district["country"]):
+                if node is not None:
+                    self.districts.setdefault((node["level"], node["id"]), []).append(district)
+
+    def add(self, level: str, id: str, name: str, parent_id: str = None):
+        node = {"id": id, "name": name, "level": level, "parent_id": parent_id, "key": normalize(name)}
+        self.nodes[level][id] = node
+        self.children.setdefault((level, parent_id), []).append(node)
+        self.names.setdefault((level, node["key"]), node)
+
+        for word in node["key"].split():
+            for length in range(1, len(word) + 1):
+                self.prefixes.setdefault(word[:length], set()).add((level, id))
+        for trigram in get_trigrams(node["key"]):
+            self.trigrams.setdefault(trigram, set()).add((level, id))
+
+    def get_parent(self, node: dict | None) -> dict | None:
+        if node is None or node["parent_id"] is None:
+            return None
+        parent_level = {"state": "country", "zone": "state", "district": "zone"}[node["level"]]
+        return self.nodes[parent_level].get(node["parent_id"])
+
+    @staticmethod
+    def get_score(key: str, term: str) -> int:
+        if key == term:
+            return EXACT_SCORE
+        if key.startswith(term):
+            return PREFIX_SCORE
+        if f" {term}" in f" {key}":
+            return WORD_PREFIX_SCORE
+        if term in key:
+            return SUBSTRING_SCORE
+        return 0
+
+    def match(self, term: str) -> dict:
+        """
+        Returns:
+            dict: (level, id) of every name matching the term mapped to its score.
+        """
+        candidates = set(self.prefixes.get(term.split()[0], ()))
+        trigrams = get_trigrams(term)
+        if len(term) >= 3:
+            # every trigram inside the term is inside a name containing it
+            inner = trigrams - {f" {term[:2]}", f"{term[-2:]} "}
+            postings = [self.trigrams.get(trigram, set()) for trigram in inner]
+            if postings:
+                candidates |= set.intersection(*postings)
+
+        matches = {}
+        for level, id in candidates:
+            if score := self.get_score(self.nodes[level][id]["key"], term):
+                matches[(level, id)] = score
+        if matches or len(term) < 3:
+            return matches
+
+        # nothing contains the term, rank the names sharing most of its trigrams
+        shared = {}
+        for trigram in trigrams:
+            for node in self.trigrams.get(trigram, ()):
+                shared[node] = shared.get(node, 0) + 1
+        for (level, id), count in shared.items():
+            similarity = count / (len(trigrams) + len(get_trigrams(self.nodes[level][id]["key"])) - count)
+            if similarity >= FUZZY_THRESHOLD:
+                matches[(level, id)] = FUZZY_SCORE * similarity
+        return matches
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        """
+        Ranks the districts matching the comma separated terms of a query, on
+        their own name or the name of their state or country. A district
+        matching several terms sums their scores.
+        """
+        scores = {}
+        for term in filter(None, (normalize(part) for part in query.split(","))):
+            best = {}
+            for (level, id), score in self.match(term).items():
+                if level not in LEVEL_WEIGHTS:
+                    continue
+                score *= LEVEL_WEIGHTS[level]
+                districts = (
+                    [self.nodes["district"][id]] if level == "district" else self.districts.get((level, id), [])
+                )
+                for district in districts:
+                    best[district["id"]] = max(best.get(district["id"], 0), score)
+            for id, score in best.items():
+                scores[id] = scores.get(id, 0) + score
+
+        ranked = sorted(
+            (self.nodes["district"][id] for id in scores),
+            key=lambda district: (-scores[district["id"]], self.get_location(district)),
+        )
+        return ranked[:limit]
+
+    @staticmethod
+    def get_location(district: dict) -> str:
+        return ", ".join(
+            node["name"] if node else "" for node in (district, district["state"], district["country"])
+        )
+
+
+class GeographyIndex:
+    """
+    The country, state, zone and district tree held in process memory.
+
+    The tree is loaded on first use and reloaded once the version of the
+    location cache tag changes, which every write to a location model does.
+    A lookup costs one cache read of the version and no database queries.
+    """
+
+    tree = None
+    version = None
+
+    @classmethod
+    def get_tree(cls) -> GeographyTree:
+        version = ResponseCache.get_tag_versions([CacheTag.LOCATION.value])[0]
+        if cls.tree is None or cls.version != version:
+            tree = GeographyTree()
+            cls.tree, cls.version = tree, version
+        return cls.tree
+
+    @classmethod
+    def get_children(cls, level: str, parent_id: str = None) -> list[dict]:
+        """
+        Returns the id and name of the nodes of a level under a parent, sorted
+        by name; countries have no parent.
+        """
+        return [
+            {"id": node["id"], "name": node["name"]}
+            for node in cls.get_tree().children.get((level, parent_id), [])
+        ]
+
+    @classmethod
+    def get_all(cls, level: str) -> list[dict]:
+        nodes = sorted(cls.get_tree().nodes[level].values(), key=lambda node: (node["name"].lower(), node["id"]))
+        return [{"id": node["id"], "name": node["name"]} for node in nodes]
+
+    @classmethod
+    def get_districts_of_state(cls, state_id: str) -> list[dict]:
+        tree = cls.get_tree()
+        districts = sorted(
+            tree.districts.get(("state", state_id), []),
+            key=lambda node: (node["name"].lower(), node["id"]),
+        )
+        return [{"id": node["id"], "name": node["name"]} for node in districts]
+
+    @classmethod
+    def find(cls, level: str, name: str) -> dict | None:
+        """
+        Finds a node by name, ignoring case and accents.
+        """
+        if name is None:
+            return None
+        node = cls.get_tree().names.get((level, normalize(name)))
+        return node and {"id": node["id"], "name": node["name"]}
+
+    @classmethod
+    def search(cls, query: str, limit: int) -> list[dict]:
+        """
+        Returns:
+            list: The id and "district, state, country" location of the best
+            ranked districts.
+        """
+        tree = cls.get_tree()
+        return [
+            {"id": district["id"], "location": tree.get_location(district)}
+            for district in tree.search(query, limit)
+        ]
@@ -0,0 +1,210 @@
+import io
+import logging
+import threading
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils.module_loading import import_string
+
+from db.import_job import ImportJob, ImportJobRow
+from utils.types import ImportJobRowStatus, ImportJobStatus, ImportJobType
+from utils.utils import DateTimeUtils, ImportCSV
+
+logger = logging.getLogger("django")
+
+# Importers of each job type, resolved lazily since they live in the api apps.
+# An importer declares the `headers` a file must have and an
+# `import_rows(rows, user_id)` returning the (success, failed) rows.
+IMPORT_JOB_HANDLERS = {
+    ImportJobType.TASK.value: "api.dashboard.task.dash_task_helper.TaskImport",
+    ImportJobType.VOUCHER.value: "api.dashboard.karma_voucher.karma_voucher_helper.VoucherLogImport",
+    ImportJobType.USER_ROLE.value: "api.dashboard.roles.dash_roles_helper.UserRoleImport",
+    ImportJobType.ORGANISATION.value: "api.dashboard.organisation.organisation_helper.OrganisationImport",
+}
+
+
+class ImportJobError(Exception):
+    """
+    Fails the whole job with the given message, e.g. a missing header.
+    """
+
+
+class ImportJobLost(Exception):
+    """
+    Raised when a stale job was handed to another worker.
+    """
+
+
+class ImportJobQueue:
+    """
+    A database backed queue of spreadsheet imports.
+
+    Uploads are stored with their job and claimed by the `run_import_workers`
+    threads with SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers
+    can poll the same table without a broker. Rows are processed in batches
+    of IMPORT_JOB_BATCH_SIZE and every batch commits its results together with
+    the job progress, which lets a stale job resume where it stopped.
+
+    A resumed batch runs again from its first row, so importers keep every
+    side effect inside the batch transaction: rows, queued mails and Discord
+    updates, which are only queued on commit. A worker that lost its job
+    rolls all of them back with its batch.
+    """
+
+    @staticmethod
+    def enqueue(job_type: ImportJobType, file_obj, user_id) -> ImportJob:
+        """
+        Stores an upload as a pending job.
+
+        Raises:
+            ImportJobError: The file is empty or misses a required header.
+        """
+        content = file_obj.read()
+        importer = import_string(IMPORT_JOB_HANDLERS[job_type.value])
+        ImportJobQueue.read_rows(io.BytesIO(content), file_obj.name, importer.headers)
+
+        return ImportJob.objects.create(
+            type=job_type.value,
+            status=ImportJobStatus.PENDING.value,
+            file_name=file_obj.name,
+            file=content,
+            created_by_id=user_id,
+            updated_at=DateTimeUtils.get_current_utc_time(),
+        )
+
+    @staticmethod
+    def claim(worker: str) -> ImportJob | None:
+        """
+        Locks the oldest pending job, or a running job that stopped making
+        progress, and assigns it to `worker`.
+        """
+        now = DateTimeUtils.get_current_utc_time()
+        stale_before = now - timedelta(seconds=settings.IMPORT_JOB_STALE_TIMEOUT)
+
+        with transaction.atomic():
+            job = (
+                ImportJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=ImportJobStatus.PENDING.value)
+                    | Q(status=ImportJobStatus.RUNNING.value, updated_at__lt=stale_before)
+                )
+                .order_by("created_at")
+                .first()
+            )
+            if job is None:
+                return None
+
+            job.status = ImportJobStatus.RUNNING.value
+            job.worker = worker
+            job.started_at = job.started_at or now
+            job.updated_at = now
+            job.save(update_fields=["status", "worker", "started_at", "updated_at"])
+        return job
+
+    @staticmethod
+    def read_rows(file_obj, file_name: str, headers: list[str]):
+        """
+        Checks the header row of an upload.
+
+        Returns:
+            generator: The rows of the upload.
+        """
+        file_headers, rows = ImportCSV().read_file(file_obj, file_name)
+        if not file_headers:
+            raise ImportJobError("Empty csv file.")
+
+        for key in headers:
+            if key not in file_headers:
+                raise ImportJobError(f"{key} does not exist in the file.")
+
+        return rows
+
+    @staticmethod
+    def save_batch(job: ImportJob, processed_rows: int, success: list, failed: list):
+        """
+        Stores the results of a batch and advances the progress of the job.
+        Must run in the transaction that imported the batch.
+        """
+        ImportJobRow.objects.bulk_create(
+            [
+                ImportJobRow(job_id=job.id, status=ImportJobRowStatus.SUCCESS.value, data=data)
+                for data in success
+            ]
+            + [
+                ImportJobRow(job_id=job.id, status=ImportJobRowStatus.FAILED.value, data=data)
+                for data in failed
+            ]
+        )
+        updated = ImportJob.objects.filter(
+            id=job.id, worker=job.worker, status=ImportJobStatus.RUNNING.value
+        ).update(
+            processed_rows=processed_rows,
+            success_count=F("success_count") + len(success),
+            failed_count=F("failed_count") + len(failed),
+            updated_at=DateTimeUtils.get_current_utc_time(),
+        )
+        if not updated:
+            raise ImportJobLost()
+
+    @staticmethod
+    def finish(job: ImportJob, status: ImportJobStatus, message: str = None):
+        now = DateTimeUtils.get_current_utc_time()
+        fields = {
+            "status": status.value,
+            "message": message and message[:255],
+            "completed_at": now,
+            "updated_at": now,
+        }
+        if status == ImportJobStatus.COMPLETED:
+            fields["file"] = b""
+
+        ImportJob.objects.filter(id=job.id, worker=job.worker).update(**fields)
+
+    @staticmethod
+    def run(job: ImportJob):
+        importer = import_string(IMPORT_JOB_HANDLERS[job.type])
+        batch_size = settings.IMPORT_JOB_BATCH_SIZE
+
+        try:
+            # a first pass counts the rows, sheet dimensions include blank
+            # rows and csv files declare none
+            rows = ImportJobQueue.read_rows(io.BytesIO(job.file), job.file_name, importer.headers)
+            ImportJob.objects.filter(id=job.id).update(total_rows=sum(1 for _ in rows))
+
+            rows = ImportJobQueue.read_rows(io.BytesIO(job.file), job.file_name, importer.headers)
+
+            processed_rows = job.processed_rows
+            rows = islice(rows, processed_rows, None)
+            while batch := list(islice(rows, batch_size)):
+                processed_rows += len(batch)
+                with transaction.atomic():
+                    success, failed = importer.import_rows(batch, job.created_by_id)
+                    ImportJobQueue.save_batch(job, processed_rows, success, failed)
+
+        except ImportJobLost:
+            return
+        except ImportJobError as e:
+            ImportJobQueue.finish(job, ImportJobStatus.FAILED, str(e))
+        except Exception as e:
+            logger.exception(f"Import job {job.id} failed")
+            ImportJobQueue.finish(job, ImportJobStatus.FAILED, str(e))
+        else:
+            ImportJobQueue.finish(job, ImportJobStatus.COMPLETED)
+
+    @staticmethod
+    def work(worker: str, stop: threading.Event, poll_interval: int = None):
+        """
+        Processes jobs until `stop` is set, sleeping while the queue is empty.
+        """
+        poll_interval = poll_interval or settings.IMPORT_JOB_POLL_INTERVAL
+
+        while not stop.is_set():
+            close_old_connections()
+            job = ImportJobQueue.claim(worker)
+            if job is None:
+                stop.wait(poll_interval)
+                continue
+            ImportJobQueue.run(job)
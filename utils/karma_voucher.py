@@ -1,12 +1,15 @@
+import time
 from io import BytesIO
-from typing import Optional
 
-from PIL import Image, ImageDraw, ImageFont
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
 
-import time
+from db.task import VoucherCodeSequence, VoucherLog
+from utils.voucher_renderer import FORMAT_EXTENSIONS, VoucherRenderer
+
+# Connection the voucher code sequence is advanced on, see allocate_voucher_codes
+SEQUENCE_DB_ALIAS = 'sequence'
 
-image_location = './api/dashboard/karma_voucher/assets/karmacard.png'
-font_location =  './api/dashboard/karma_voucher/fonts/Roboto-Light.ttf'
 
 def generate_karma_voucher(name, hashtag, karma, code, month):
     """
@@ -17,47 +20,94 @@ def generate_karma_voucher(name, hashtag, karma, code, month):
     :param code:
     :param month:
     :return:
-    """   
-
-
-    image = Image.open(image_location)
-    image = image.convert('RGB')
-
-    draw = ImageDraw.Draw(image)
-    x = 135
-    y = 250
-    font1 = ImageFont.truetype(font_location, size=60)
-    draw.text((x, y), name, fill=(255, 255, 255), font=font1)
-
-    x1 = 135
-    y1 = 450
-    font2 = ImageFont.truetype(font_location, size=45)
-    draw.text((x1, y1), hashtag, fill=(255, 255, 255), font=font2)
+    """
+    return render_karma_vouchers([
+        {'name': name, 'hashtag': hashtag, 'karma': karma, 'code': code, 'month': month}
+    ])[0]
 
-    x2 = 920
-    y2 = 135
-    font3 = ImageFont.truetype(font_location, size=45)
-    draw.text((x2, y2), karma, fill=(255, 255, 255), font=font3)
 
-    x3 = 135
-    y3 = 135
-    font3 = ImageFont.truetype(font_location, size=20)
-    draw.text((x3, y3), code, fill=(255, 255, 255), font=font3)
+def render_karma_vouchers(vouchers):
+    """
+    Generate the karma vouchers of a bulk import, in a process pool of
+    KARMA_VOUCHER_RENDER_WORKERS
+    :param vouchers: List of dicts with the name, hashtag, karma, code and month
+    :return: List of BytesIO images in the same order
+    """
+    images = VoucherRenderer.render_many(
+        vouchers,
+        image_format=settings.KARMA_VOUCHER_FORMAT,
+        quality=settings.KARMA_VOUCHER_QUALITY,
+        workers=settings.KARMA_VOUCHER_RENDER_WORKERS,
+    )
+    return [BytesIO(image) for image in images]
 
-    x3 = 135
-    y3 = 375
-    font3 = ImageFont.truetype(font_location, size=30)
-    draw.text((x3, y3), month, fill=(255, 255, 255), font=font3)
 
-    image_data = BytesIO()
-    image.save(image_data, format='JPEG')
-    return image_data
+def get_karma_voucher_extension():
+    return FORMAT_EXTENSIONS.get(settings.KARMA_VOUCHER_FORMAT, settings.KARMA_VOUCHER_FORMAT.lower())
 
 
-def generate_ordered_id(count):
+def get_voucher_code_prefix():
     day = time.strftime('%d')
     month = time.strftime('%m')
     year = time.strftime('%y')
+    return f'P{day}{month}{year}'
+
+
+def generate_ordered_id(count, prefix=None):
     serial = str(count).zfill(4)
-    ordered_id = f'P{day}{month}{year}{serial}'
+    ordered_id = f'{prefix or get_voucher_code_prefix()}{serial}'
     return ordered_id
+
+
+def get_last_voucher_serial(prefix):
+    """
+    Finds the highest serial already used with a prefix, for the vouchers
+    created before the day's sequence row existed.
+    """
+    serials = [
+        int(serial)
+        for code in VoucherLog.objects.filter(code__startswith=prefix).values_list('code', flat=True)
+        if (serial := code[len(prefix):]).isdigit()
+    ]
+    return max(serials, default=0)
+
+
+def allocate_voucher_codes(count):
+    """
+    Reserves `count` consecutive voucher codes of the current day.
+
+    The day's row in `voucher_code_sequence` is locked with SELECT ... FOR
+    UPDATE and advanced by the whole block at once, so concurrent imports
+    never receive the same serial. The reservation runs and commits on the
+    `sequence` connection, apart from the caller's transaction: the lock is
+    released as soon as the block is reserved, and the serials of a caller
+    that rolls back are skipped, not reused. Databases without row locks,
+    SQLite, lock the whole file instead; there the reservation joins the
+    caller's transaction.
+
+    :param count: Number of codes to reserve
+    :return: List of the codes in order
+    """
+    if count <= 0:
+        return []
+
+    prefix = get_voucher_code_prefix()
+    using = SEQUENCE_DB_ALIAS if connections[SEQUENCE_DB_ALIAS].features.has_select_for_update else DEFAULT_DB_ALIAS
+    sequences = VoucherCodeSequence.objects.using(using)
+    with transaction.atomic(using=using):
+        sequence = sequences.select_for_update().filter(prefix=prefix).first()
+        if sequence is None:
+            try:
+                with transaction.atomic(using=using):
+                    sequence = sequences.create(
+                        prefix=prefix, last_serial=get_last_voucher_serial(prefix)
+                    )
+            except IntegrityError:
+                # created by a concurrent allocation, wait for its lock instead
+                sequence = sequences.select_for_update().get(prefix=prefix)
+
+        start = sequence.last_serial + 1
+        sequence.last_serial += count
+        sequence.save(using=using, update_fields=['last_serial', 'updated_at'])
+
+    return [generate_ordered_id(serial, prefix) for serial in range(start, start + count)]
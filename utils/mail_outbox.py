@@ -0,0 +1,178 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import F, Prefetch
+
+from db.notification import EmailOutbox, EmailOutboxAttachment
+from utils.types import EmailOutboxStatus
+from utils.utils import DateTimeUtils
+
+logger = logging.getLogger("django")
+
+
+class MailOutbox:
+    """
+    A transactional outbox for mails.
+
+    Request handlers only insert rows, so a mail is queued exactly when the
+    surrounding transaction commits. The `run_mail_worker` command delivers
+    the due mails in batches over a single backend connection, retrying
+    failures with exponential backoff up to MAIL_OUTBOX_MAX_ATTEMPTS.
+    """
+
+    @staticmethod
+    def enqueue(
+        subject: str,
+        body: str,
+        to: list[str],
+        html_body: str = None,
+        from_email: str = None,
+        attachments=(),
+    ) -> EmailOutbox:
+        """
+        Queues a mail for delivery.
+
+        Args:
+            attachments (list, optional): (filename, content, mimetype) tuples,
+                the mimetype may be None to guess it from the filename.
+        """
+        now = DateTimeUtils.get_current_utc_time()
+        with transaction.atomic():
+            email = EmailOutbox.objects.create(
+                subject=subject,
+                body=body,
+                html_body=html_body,
+                from_email=from_email or settings.FROM_MAIL,
+                recipients=list(to),
+                status=EmailOutboxStatus.PENDING.value,
+                next_attempt_at=now,
+                updated_at=now,
+            )
+            EmailOutboxAttachment.objects.bulk_create(
+                [
+                    EmailOutboxAttachment(email=email, filename=filename, content=content, mimetype=mimetype)
+                    for filename, content, mimetype in attachments
+                ]
+            )
+        return email
+
+    @staticmethod
+    def claim(batch_size: int) -> list[EmailOutbox]:
+        """
+        Reserves the due mails for this worker by moving their next attempt
+        past MAIL_OUTBOX_CLAIM_TIMEOUT, so a crashed worker's mails are
+        picked up again once the claim expires.
+        """
+        now = DateTimeUtils.get_current_utc_time()
+        with transaction.atomic():
+            ids = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(status=EmailOutboxStatus.PENDING.value, next_attempt_at__lte=now)
+                .order_by("next_attempt_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            EmailOutbox.objects.filter(id__in=ids).update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + timedelta(seconds=settings.MAIL_OUTBOX_CLAIM_TIMEOUT),
+                updated_at=now,
+            )
+
+        return list(
+            EmailOutbox.objects.filter(id__in=ids)
+            .prefetch_related(
+                Prefetch("email_outbox_attachment_email", to_attr="attachments")
+            )
+            .order_by("next_attempt_at")
+        )
+
+    @staticmethod
+    def get_message(email: EmailOutbox, connection) -> EmailMultiAlternatives:
+        message = EmailMultiAlternatives(
+            subject=email.subject,
+            body=email.body,
+            from_email=email.from_email,
+            to=email.recipients,
+            connection=connection,
+        )
+        if email.html_body is not None:
+            message.attach_alternative(email.html_body, "text/html")
+        for attachment in email.attachments:
+            message.attach(attachment.filename, bytes(attachment.content), attachment.mimetype)
+        return message
+
+    @staticmethod
+    def mark_sent(email: EmailOutbox):
+        now = DateTimeUtils.get_current_utc_time()
+        EmailOutbox.objects.filter(id=email.id).update(
+            status=EmailOutboxStatus.SENT.value,
+            last_error=None,
+            sent_at=now,
+            updated_at=now,
+        )
+
+    @staticmethod
+    def mark_failed(email: EmailOutbox, error: Exception):
+        """
+        Schedules the next attempt with exponential backoff, or gives up once
+        MAIL_OUTBOX_MAX_ATTEMPTS is reached.
+        """
+        now = DateTimeUtils.get_current_utc_time()
+        fields = {"last_error": str(error)[:255], "updated_at": now}
+
+        if email.attempts >= settings.MAIL_OUTBOX_MAX_ATTEMPTS:
+            fields["status"] = EmailOutboxStatus.FAILED.value
+        else:
+            delay = settings.MAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+            fields["next_attempt_at"] = now + timedelta(seconds=delay)
+
+        EmailOutbox.objects.filter(id=email.id).update(**fields)
+
+    @staticmethod
+    def deliver(batch_size: int = None) -> int:
+        """
+        Sends one batch of due mails over a single connection.
+
+        Returns:
+            int: Number of mails claimed.
+        """
+        emails = MailOutbox.claim(batch_size or settings.MAIL_OUTBOX_BATCH_SIZE)
+        if not emails:
+            return 0
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            logger.exception("Could not open the mail connection")
+            for email in emails:
+                MailOutbox.mark_failed(email, e)
+            return len(emails)
+
+        try:
+            for email in emails:
+                try:
+                    MailOutbox.get_message(email, connection).send()
+                except Exception as e:
+                    MailOutbox.mark_failed(email, e)
+                else:
+                    MailOutbox.mark_sent(email)
+        finally:
+            connection.close()
+
+        return len(emails)
+
+    @staticmethod
+    def work(stop: threading.Event, batch_size: int = None, poll_interval: int = None):
+        """
+        Delivers mails until `stop` is set, sleeping while nothing is due.
+        """
+        poll_interval = poll_interval or settings.MAIL_OUTBOX_POLL_INTERVAL
+
+        while not stop.is_set():
+            close_old_connections()
+            if not MailOutbox.deliver(batch_size):
+                stop.wait(poll_interval)
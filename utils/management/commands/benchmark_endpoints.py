@@ -0,0 +1,396 @@
+import asyncio
+import io
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.test.utils import override_settings
+
+from db.learning_circle import LearningCircle
+from db.organization import District
+from db.task import Wallet
+from db.user import UserRoleLink
+from utils.query_budget import QueryBudgetCheck
+from utils.request_metrics import QueryCounter
+from utils.types import RoleType
+from utils.utils import DateTimeUtils
+
+# A client address outside of INTERNAL_IPS, so the debug toolbar stays off
+CLIENT = ("192.0.2.1", 50000)
+
+# Relative growth of a latency past which a comparison reports a regression
+DEFAULT_THRESHOLD = 0.2
+
+
+def get_scenarios(values: dict) -> dict:
+    """
+    Returns the benchmarked requests: method, path, query, JSON body and
+    whether they are sent with a token.
+    """
+    return {
+        "students-leaderboard": ("GET", "/api/v1/leaderboard/students/", {}, None, False),
+        "students-monthly-leaderboard": ("GET", "/api/v1/leaderboard/students-monthly/", {}, None, False),
+        "college-leaderboard": ("GET", "/api/v1/leaderboard/college/", {}, None, False),
+        "college-monthly-leaderboard": ("GET", "/api/v1/leaderboard/college-monthly/", {}, None, False),
+        "user-profile": ("GET", f"/api/v1/dashboard/profile/user-profile/{values['muid']}/", {}, None, True),
+        "user-rank": ("GET", f"/api/v1/dashboard/profile/rank/{values['muid']}/", {}, None, True),
+        "learning-circles": ("POST", "/api/v1/dashboard/lc/list/", {}, {"district_id": values["district_id"]}, True),
+        "campus-students": ("GET", "/api/v1/dashboard/campus/student-details/", {"perPage": 20}, None, True),
+        "global-count": ("GET", "/api/v1/public/global-count/", {}, None, False),
+        "location-search": ("GET", "/api/v1/register/location/", {"q": values["location"]}, None, False),
+    }
+
+
+class SharedQueryCounter(QueryCounter):
+    """
+    A QueryCounter the connections of every request thread add to.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self.lock:
+                self.count += 1
+                self.duration += time.perf_counter() - start
+
+
+def get_percentile(latencies: list[float], percentile: float) -> float:
+    """
+    Returns the nearest-rank percentile of sorted latencies.
+    """
+    rank = max(0, min(len(latencies) - 1, round(percentile / 100 * len(latencies)) - 1))
+    return latencies[rank]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives the hot endpoints through the ASGI application in process, as daphne serves "
+        "them, or with --server wsgi from a pool of threads, against a seeded database, "
+        "reports latency percentiles, throughput and queries per request"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("endpoints", nargs="*", help="Only run these endpoints, all by default")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+        parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+        parser.add_argument(
+            "--server",
+            choices=["asgi", "wsgi"],
+            default="asgi",
+            help="asgi runs the sync views one at a time like daphne, wsgi runs --concurrency of them at once",
+        )
+        parser.add_argument("--warmup", type=int, default=10, help="Requests per endpoint before measuring")
+        parser.add_argument("--save", help="Write the results to this JSON baseline")
+        parser.add_argument("--compare", help="Compare the results with this JSON baseline")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help="Relative latency growth reported as a regression, 0.2 is 20%%",
+        )
+
+    @staticmethod
+    def get_values() -> dict:
+        """
+        Picks the rows the requests point to: the user with the most karma, a
+        campus lead, the district with the most learning circles.
+        """
+        wallet = Wallet.objects.select_related("user").order_by("-karma").first()
+        lead = (
+            UserRoleLink.objects.filter(role__title=RoleType.CAMPUS_LEAD.value, verified=True)
+            .select_related("user")
+            .first()
+        )
+        district = (
+            LearningCircle.objects.values("org__district_id")
+            .annotate(circles=Count("id"))
+            .order_by("-circles")
+            .first()
+        )
+        location = District.objects.values_list("name", flat=True).first()
+        if not (wallet and lead and district and location):
+            raise CommandError("The database holds no users or circles to request, run seed_scale first")
+
+        return {
+            "muid": wallet.user.muid,
+            "district_id": district["org__district_id"],
+            "location": location.split()[0],
+            "token": QueryBudgetCheck.get_token(lead.user),
+        }
+
+    @staticmethod
+    async def send_asgi(application, method: str, path: str, query: dict, body: dict, token: str | None) -> int:
+        body = json.dumps(body).encode() if body is not None else b""
+        headers = [(b"host", b"testserver"), (b"content-type", b"application/json")]
+        if token:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(query).encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": CLIENT,
+            "server": ("testserver", 80),
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        status = None
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # the client never disconnects
+            return await asyncio.Future()
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await application(scope, receive, send)
+        return status
+
+    async def run_asgi(self, application, scenario: tuple, count: int, concurrency: int):
+        """
+        Sends the requests from `concurrency` tasks of one event loop. As under
+        daphne, the sync views run one at a time on the thread sensitive
+        executor, so concurrent requests queue for it.
+
+        Returns:
+            tuple: The sorted latencies, the count of every status and the wall time.
+        """
+        method, path, query, body, authenticated = scenario
+        token = self.values["token"] if authenticated else None
+        latencies, statuses = [], {}
+        remaining = count
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                status = await self.send_asgi(application, method, path, query, body, token)
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+        return sorted(latencies), statuses, time.perf_counter() - started
+
+    @staticmethod
+    def send_wsgi(application, method: str, path: str, query: dict, body: dict, token: str | None) -> int:
+        body = json.dumps(body).encode() if body is not None else b""
+        environ = {
+            "REQUEST_METHOD": method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": path,
+            "QUERY_STRING": urlencode(query),
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            "HTTP_HOST": "testserver",
+            "REMOTE_ADDR": CLIENT[0],
+            "REMOTE_PORT": str(CLIENT[1]),
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        if token:
+            environ["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        status = None
+
+        def start_response(status_line, headers, exc_info=None):
+            nonlocal status
+            status = int(status_line.split()[0])
+
+        response = application(environ, start_response)
+        try:
+            for _ in response:
+                pass
+        finally:
+            response.close()
+        return status
+
+    def run_wsgi(self, application, scenario: tuple, count: int, concurrency: int):
+        """
+        Sends the requests from `concurrency` threads, so that many views run
+        at once, each on the database connection of its thread, as under a
+        threaded WSGI server.
+
+        Returns:
+            tuple: The sorted latencies, the count of every status and the wall time.
+        """
+        method, path, query, body, authenticated = scenario
+        token = self.values["token"] if authenticated else None
+
+        def request(_):
+            started = time.perf_counter()
+            status = self.send_wsgi(application, method, path, query, body, token)
+            return time.perf_counter() - started, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(concurrency, count)) as executor:
+            responses = list(executor.map(request, range(count)))
+        elapsed = time.perf_counter() - started
+
+        statuses = {}
+        for _, status in responses:
+            statuses[status] = statuses.get(status, 0) + 1
+        return sorted(latency for latency, _ in responses), statuses, elapsed
+
+    def run(self, application, scenario: tuple, count: int, concurrency: int) -> tuple[list[float], dict, float]:
+        if self.server == "wsgi":
+            return self.run_wsgi(application, scenario, count, concurrency)
+        return asyncio.run(self.run_asgi(application, scenario, count, concurrency))
+
+    def measure(self, application, scenarios: dict, options: dict) -> dict:
+        counter = SharedQueryCounter()
+
+        def count_queries(sender, connection, **kwargs):
+            if counter not in connection.execute_wrappers:
+                connection.execute_wrappers.append(counter)
+
+        connection_created.connect(count_queries)
+        for connection in connections.all(initialized_only=True):
+            connection.execute_wrappers.append(counter)
+
+        results = {}
+        try:
+            for name, scenario in scenarios.items():
+                if options["warmup"]:
+                    self.run(application, scenario, options["warmup"], options["concurrency"])
+                counter.count = 0
+                counter.duration = 0.0
+                latencies, statuses, elapsed = self.run(
+                    application, scenario, options["requests"], options["concurrency"]
+                )
+                results[name] = {
+                    "requests": len(latencies),
+                    "statuses": {str(status): count for status, count in sorted(statuses.items())},
+                    "p50_ms": get_percentile(latencies, 50) * 1000,
+                    "p95_ms": get_percentile(latencies, 95) * 1000,
+                    "p99_ms": get_percentile(latencies, 99) * 1000,
+                    "throughput": len(latencies) / elapsed,
+                    "queries_per_request": counter.count / len(latencies),
+                    "db_ms_per_request": counter.duration * 1000 / len(latencies),
+                }
+                self.write_result(name, results[name])
+        finally:
+            connection_created.disconnect(count_queries)
+            for connection in connections.all(initialized_only=True):
+                if counter in connection.execute_wrappers:
+                    connection.execute_wrappers.remove(counter)
+        return results
+
+    def write_result(self, name: str, result: dict):
+        line = (
+            f"{name:<30} p50 {result['p50_ms']:8.1f}ms  p95 {result['p95_ms']:8.1f}ms  "
+            f"p99 {result['p99_ms']:8.1f}ms  {result['throughput']:8.1f} req/s  "
+            f"{result['queries_per_request']:6.1f} queries"
+        )
+        if set(result["statuses"]) - {"200"}:
+            line += f"  statuses {result['statuses']}"
+            self.stdout.write(self.style.WARNING(line))
+        else:
+            self.stdout.write(line)
+
+    def compare(self, results: dict, path: str, threshold: float) -> list[str]:
+        """
+        Returns:
+            list: The regressions against the baseline.
+        """
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)
+        self.stdout.write(f"Compared with {path} ({baseline.get('commit') or 'unknown commit'}):")
+        if baseline.get("server", "asgi") != self.server:
+            self.stdout.write(self.style.WARNING(f"  the baseline was measured with --server {baseline.get('server', 'asgi')}"))
+
+        regressions = []
+        for name, result in results.items():
+            if (before := baseline["results"].get(name)) is None:
+                continue
+            changes = []
+            for metric in ["p50_ms", "p95_ms", "p99_ms", "throughput", "queries_per_request"]:
+                old, new = before[metric], result[metric]
+                change = (new - old) / old if old else 0
+                changes.append(f"{metric} {change:+.0%}")
+                if metric == "queries_per_request":
+                    regressed = new > old
+                else:
+                    regressed = (-change if metric == "throughput" else change) > threshold
+                if regressed:
+                    regressions.append(f"{name} {metric} {old:.1f} -> {new:.1f}")
+            self.stdout.write(f"  {name:<30} " + "  ".join(changes))
+        return regressions
+
+    @staticmethod
+    def get_commit() -> str | None:
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive")
+
+        self.values = self.get_values()
+        scenarios = get_scenarios(self.values)
+        if unknown := set(options["endpoints"]) - set(scenarios):
+            raise CommandError(f"Unknown endpoints {', '.join(sorted(unknown))}, choose from {', '.join(scenarios)}")
+        if options["endpoints"]:
+            scenarios = {name: scenarios[name] for name in options["endpoints"]}
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            self.server = options["server"]
+            application = get_wsgi_application() if self.server == "wsgi" else get_asgi_application()
+            results = self.measure(application, scenarios, options)
+
+        if options["save"]:
+            baseline = {
+                "commit": self.get_commit(),
+                "created_at": DateTimeUtils.get_current_utc_time().isoformat(),
+                "database": connections["default"].vendor,
+                "requests": options["requests"],
+                "concurrency": options["concurrency"],
+                "server": options["server"],
+                "results": results,
+            }
+            with open(options["save"], "w") as baseline_file:
+                json.dump(baseline, baseline_file, indent=2)
+            self.stdout.write(f"Saved the baseline to {options['save']}")
+
+        if options["compare"]:
+            if regressions := self.compare(results, options["compare"], options["threshold"]):
+                raise CommandError("Regressions: " + "; ".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"Benchmarked {len(results)} endpoints"))
@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.voucher_renderer import VoucherRenderer
+
+
+class Command(BaseCommand):
+    help = "Measures the throughput of karma voucher rendering"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=200, help="Vouchers rendered per run")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.KARMA_VOUCHER_RENDER_WORKERS,
+            help="Processes of the pooled run, defaults to KARMA_VOUCHER_RENDER_WORKERS",
+        )
+        parser.add_argument("--format", default=settings.KARMA_VOUCHER_FORMAT, help="Pillow image format")
+        parser.add_argument("--quality", type=int, default=settings.KARMA_VOUCHER_QUALITY)
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        image_format = options["format"].upper()
+        quality = options["quality"]
+        vouchers = [
+            {
+                "name": f"Benchmark User {index}",
+                "hashtag": "#benchmark",
+                "karma": "200",
+                "code": f"P000000{index:04}",
+                "month": "January/1",
+            }
+            for index in range(count)
+        ]
+
+        def uncached():
+            # what every voucher used to cost: decoding the template and fonts again
+            for voucher in vouchers:
+                VoucherRenderer.get_template.cache_clear()
+                VoucherRenderer.get_font.cache_clear()
+                VoucherRenderer.render(voucher, image_format, quality)
+
+        def cached():
+            VoucherRenderer.render_many(vouchers, image_format, quality, workers=1)
+
+        def pooled():
+            VoucherRenderer.render_many(vouchers, image_format, quality, workers=options["workers"])
+
+        # start the pool outside of the measurement
+        VoucherRenderer.render_many(vouchers[:1] * options["workers"] * 8, image_format, quality, options["workers"])
+
+        for name, run in [("uncached", uncached), ("cached", cached), (f"pool of {options['workers']}", pooled)]:
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{name:>12}: {elapsed:.2f}s, {count / elapsed:.1f} vouchers/s")
+
+        size = len(VoucherRenderer.render(vouchers[0], image_format, quality))
+        self.stdout.write(f"{image_format} at quality {quality}: {size / 1024:.1f} KiB per voucher")
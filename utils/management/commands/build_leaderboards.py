@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.leaderboard.leaderboard_helper import build_all_snapshots
+
+
+class Command(BaseCommand):
+    help = "Refreshes the leaderboard snapshots; schedule it to run periodically"
+
+    def handle(self, *args, **options):
+        build_all_snapshots()
+        self.stdout.write(self.style.SUCCESS("Leaderboard snapshots refreshed"))
@@ -0,0 +1,73 @@
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from utils.query_budget import KNOWN_SCALING_ROUTES, QueryBudgetCheck
+from utils.synthetic_data import create_tables
+
+TEST_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests every GET endpoint against a synthetic dataset in a throwaway test database "
+        "and fails when one responds with a server error, exceeds its query budget or its query "
+        "count grows with the data"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("routes", nargs="*", help="Only check the routes containing one of these parts")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic dataset")
+        parser.add_argument("--scale", type=int, default=1, help="Size of each batch of the synthetic dataset")
+        parser.add_argument("--noinput", action="store_false", dest="interactive", help="Drop an existing test database without asking")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = []
+        try:
+            # the log views read an empty log instead of the one of this checkout
+            with tempfile.TemporaryDirectory() as log_path, override_settings(CACHES=TEST_CACHES, LOG_PATH=log_path):
+                Path(log_path, "error.log").touch()
+                # every alias, the voucher codes are reserved on the "sequence" mirror
+                old_config = setup_databases(
+                    verbosity=0, interactive=options["interactive"], serialized_aliases=set()
+                )
+                create_tables()
+                results = QueryBudgetCheck(
+                    seed=options["seed"], scale=options["scale"], routes=options["routes"]
+                ).run()
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        measured = [result for result in results if not result["skipped"]]
+        failures = [result for result in measured if result.get("failure")]
+
+        for result in measured:
+            first, second = result["queries"]
+            line = f"{first:>4} {second:>4} / {result['budget']:<4} {result['status'][-1]}  {result['route']}"
+            if result.get("failure"):
+                self.stdout.write(self.style.ERROR(f"{line}  {result['failure']}"))
+            elif result["route"] in KNOWN_SCALING_ROUTES:
+                reason = KNOWN_SCALING_ROUTES[result["route"]]
+                self.stdout.write(self.style.WARNING(f"{line}  known to grow with the data: {reason}"))
+            else:
+                self.stdout.write(line)
+
+        if options["verbosity"] > 1:
+            for result in results:
+                if result["skipped"]:
+                    self.stdout.write(f"skipped {result['route']}: {result['skipped']}")
+
+        summary = f"{len(measured)} routes checked, {len(results) - len(measured)} skipped"
+        if failures:
+            raise CommandError(f"{summary}, {len(failures)} failed")
+        self.stdout.write(self.style.SUCCESS(summary))
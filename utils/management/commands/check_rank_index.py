@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.rank_index import RankIndex
+
+
+class Command(BaseCommand):
+    help = "Checks the user rank index against wallets and role links"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Refresh every inconsistent entry",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="With --fix, repeat the repair every this many seconds, for wallets written outside the signals",
+        )
+
+    def handle(self, *args, **options):
+        if options["interval"] is None:
+            self.repair(options["fix"])
+            return
+        if not options["fix"]:
+            raise CommandError("--interval needs --fix")
+
+        while True:
+            self.repair(fix=True)
+            time.sleep(options["interval"])
+
+    def repair(self, fix: bool):
+        report = RankIndex.check()
+        inconsistent = [user_id for user_ids in report.values() for user_id in user_ids]
+
+        for kind, user_ids in report.items():
+            self.stdout.write(f"{kind}: {len(user_ids)}")
+
+        if not inconsistent:
+            self.stdout.write(self.style.SUCCESS("Rank index is consistent"))
+            return
+
+        if not fix:
+            raise CommandError(f"{len(inconsistent)} inconsistent entries found")
+
+        RankIndex.refresh_many(inconsistent)
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {len(inconsistent)} entries"))
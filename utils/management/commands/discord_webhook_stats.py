@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from utils.discord_webhook import dispatcher
+
+
+class Command(BaseCommand):
+    help = "Prints the discord webhook counters and the depth of the stored queue"
+
+    def handle(self, *args, **options):
+        metrics = dispatcher.get_metrics()
+        # the in-memory queue belongs to each server process, not to this command
+        metrics.pop("queue_depth")
+        for name, value in metrics.items():
+            self.stdout.write(f"{name}: {value}")
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.error_log_index import ErrorLogIndexer
+
+
+class Command(BaseCommand):
+    help = "Indexes the records appended to error.log since the last run"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop the index and parse the whole log again",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            ErrorLogIndexer.clear()
+
+        total = 0
+        while consumed := ErrorLogIndexer.refresh(settings.ERROR_LOG_INDEX_CHUNK_SIZE):
+            total += consumed
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} bytes of error.log"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from utils.rank_index import RankIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the user rank index from wallets and role links"
+
+    def handle(self, *args, **options):
+        count = RankIndex.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} users"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.search_index import SEARCH_ENTITIES, SearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search index of the user, organisation, task and voucher lists"
+
+    def add_arguments(self, parser):
+        parser.add_argument("entities", nargs="*", help=f"Only rebuild these, from {', '.join(SEARCH_ENTITIES)}")
+
+    def handle(self, *args, **options):
+        if unknown := set(options["entities"]) - set(SEARCH_ENTITIES):
+            raise CommandError(f"Unknown entities {', '.join(sorted(unknown))}")
+
+        counts = SearchIndex.rebuild(options["entities"])
+        for entity, count in counts.items():
+            self.stdout.write(f"{count:>10}  {entity}")
+        self.stdout.write(self.style.SUCCESS(f"Indexed {sum(counts.values())} rows"))
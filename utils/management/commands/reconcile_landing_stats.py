@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.common.common_consumer import landing_stats
+
+
+class Command(BaseCommand):
+    help = "Reconciles the landing stats counters against the database and broadcasts them"
+
+    def handle(self, *args, **options):
+        landing_stats.reconcile()
+        landing_stats.broadcast()
+        self.stdout.write(self.style.SUCCESS("Landing stats reconciled"))
@@ -0,0 +1,53 @@
+import os
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from utils.import_job import ImportJobQueue
+
+
+class Command(BaseCommand):
+    help = "Runs a pool of workers processing the queued spreadsheet imports"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Number of jobs processed concurrently",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=None,
+            help="Seconds to wait while the queue is empty, defaults to IMPORT_JOB_POLL_INTERVAL",
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+        def work(worker):
+            try:
+                ImportJobQueue.work(worker, stop, options["poll_interval"])
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=work, args=(f"{prefix}:{index}",), daemon=True)
+            for index in range(options["workers"])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(self.style.SUCCESS(f"Started {len(threads)} import workers"))
+
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            stop.set()
+            self.stdout.write("Waiting for the running batches to finish")
+            for thread in threads:
+                thread.join()
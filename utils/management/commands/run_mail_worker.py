@@ -0,0 +1,43 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from utils.mail_outbox import MailOutbox
+
+
+class Command(BaseCommand):
+    help = "Delivers the queued mails of the email outbox over EMAIL_BACKEND"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Mails sent per connection, defaults to MAIL_OUTBOX_BATCH_SIZE",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=None,
+            help="Seconds to wait while nothing is due, defaults to MAIL_OUTBOX_POLL_INTERVAL",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Deliver the due mails and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            total = 0
+            while count := MailOutbox.deliver(options["batch_size"]):
+                total += count
+            self.stdout.write(self.style.SUCCESS(f"Processed {total} mails"))
+            return
+
+        stop = threading.Event()
+        self.stdout.write(self.style.SUCCESS("Mail worker started"))
+        try:
+            MailOutbox.work(stop, options["batch_size"], options["poll_interval"])
+        except KeyboardInterrupt:
+            stop.set()
@@ -0,0 +1,67 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.leaderboard.leaderboard_helper import build_all_snapshots
+from db.user import User
+from utils.rank_index import RankIndex
+from utils.search_index import SearchIndex
+from utils.synthetic_data import SyntheticDataset, create_tables
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills an empty local database with a synthetic dataset of SyntheticDataset.USERS users "
+        "per unit of scale, written in batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=10, help="Size of the dataset, 1 is 40 users")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the generator, the same seed writes the same rows")
+        parser.add_argument("--batch-scale", type=int, default=50, help="Scale written per transaction")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per INSERT statement")
+        parser.add_argument("--create-tables", action="store_true", help="Create the tables first, for an empty database")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError("Refusing to seed a database with DEBUG off")
+        if options["scale"] < 1 or options["batch_scale"] < 1:
+            raise CommandError("--scale and --batch-scale must be positive")
+
+        if options["create_tables"]:
+            create_tables()
+        if User.every.exclude(id=settings.SYSTEM_ADMIN_ID).exists():
+            raise CommandError("The database already holds users, seed an empty database")
+
+        dataset = SyntheticDataset(seed=options["seed"], batch_size=options["batch_size"])
+        started = time.perf_counter()
+        remaining = options["scale"]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                # the rows are consistent by construction, skip the per row checks while loading
+                cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+            try:
+                while remaining:
+                    scale = min(remaining, options["batch_scale"])
+                    counts = dataset.generate(scale)
+                    remaining -= scale
+                    self.stdout.write(
+                        f"batch {dataset.batch}: {sum(counts.values())} rows, "
+                        f"{time.perf_counter() - started:.1f}s"
+                    )
+            finally:
+                if connection.vendor == "mysql":
+                    cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+
+        RankIndex.rebuild()
+        SearchIndex.rebuild()
+        build_all_snapshots()
+
+        for model, count in sorted(counts.items()):
+            self.stdout.write(f"{count:>10}  {model}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Seeded {sum(counts.values())} rows in {time.perf_counter() - started:.1f}s")
+        )
@@ -1,12 +1,15 @@
 import datetime
+import threading
+import uuid
+from collections import OrderedDict
 from datetime import datetime
+from functools import wraps
 
 import jwt
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpRequest
-from rest_framework import authentication
 from rest_framework.authentication import get_authorization_header
-from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import BasePermission
 
 from mulearnbackend.settings import SECRET_KEY
@@ -66,14 +69,95 @@ class CustomizePermission(BasePermission):
         return f'{self.token_prefix} realm="api"'
 
 
+class InvalidTokenCache:
+    """
+    A small thread-safe LRU of tokens that failed validation, mapped to the
+    failure message, so repeated requests with the same bad token skip the
+    signature check and payload parsing.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.tokens = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, token: str) -> str | None:
+        with self.lock:
+            if token not in self.tokens:
+                return None
+            self.tokens.move_to_end(token)
+            return self.tokens[token]
+
+    def set(self, token: str, message: str):
+        with self.lock:
+            self.tokens[token] = message
+            self.tokens.move_to_end(token)
+            if len(self.tokens) > self.maxsize:
+                self.tokens.popitem(last=False)
+
+
 class JWTUtils:
+    token_prefix = "Bearer"
+    invalid_tokens = InvalidTokenCache(settings.JWT_INVALID_TOKEN_CACHE_SIZE)
+
     @staticmethod
-    def fetch_role(request):
-        token = authentication.get_authorization_header(request).decode("utf-8").split()
-        payload = jwt.decode(
-            token[1], settings.SECRET_KEY, algorithms=["HS256"], verify=True
+    def get_payload(request) -> dict:
+        """
+        Returns the validated JWT payload of the request.
+
+        The token is decoded and validated once per request; the payload is
+        stored on the underlying HttpRequest and reused by every later call.
+
+        Raises:
+            UnauthorizedAccessException: If the token is missing, invalid or expired.
+        """
+        http_request = getattr(request, "_request", request)
+        if (payload := getattr(http_request, "jwt_payload", None)) is not None:
+            return payload
+
+        payload = JWTUtils.decode(get_authorization_header(request).decode("utf-8"))
+        http_request.jwt_payload = payload
+        return payload
+
+    @staticmethod
+    def decode(auth_header: str) -> dict:
+        if not auth_header or not auth_header.startswith(JWTUtils.token_prefix):
+            raise JWTUtils.get_exception("Invalid token header")
+
+        token = auth_header[len(JWTUtils.token_prefix):].strip()
+        if not token:
+            raise JWTUtils.get_exception("Empty Token")
+
+        if (message := JWTUtils.invalid_tokens.get(token)) is not None:
+            raise JWTUtils.get_exception(message)
+
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"], verify=True)
+
+            user_id = payload.get("id")
+            expiry = datetime.strptime(payload.get("expiry"), "%Y-%m-%d %H:%M:%S%z")
+
+            if not user_id or expiry < DateTimeUtils.get_current_utc_time():
+                raise UnauthorizedAccessException("Token Expired or Invalid")
+        except Exception as e:
+            JWTUtils.invalid_tokens.set(token, str(e))
+            raise JWTUtils.get_exception(str(e)) from e
+
+        return payload
+
+    @staticmethod
+    def get_exception(message: str) -> UnauthorizedAccessException:
+        return UnauthorizedAccessException(
+            {
+                "hasError": True,
+                "message": {"general": [message]},
+                "statusCode": 1000,
+            }
         )
-        roles = payload.get("roles")
+
+    @staticmethod
+    def fetch_role(request):
+        roles = JWTUtils.get_payload(request).get("roles")
         if roles is None:
             raise Exception(
                 "The corresponding JWT token does not contain the 'roles' key"
@@ -82,11 +166,7 @@ class JWTUtils:
 
     @staticmethod
     def fetch_user_id(request):
-        token = authentication.get_authorization_header(request).decode("utf-8").split()
-        payload = jwt.decode(
-            token[1], settings.SECRET_KEY, algorithms=["HS256"], verify=True
-        )
-        user_id = payload.get("id")
+        user_id = JWTUtils.get_payload(request).get("id")
         if user_id is None:
             raise Exception(
                 "The corresponding JWT token does not contain the 'user_id' key"
@@ -95,11 +175,7 @@ class JWTUtils:
 
     @staticmethod
     def fetch_muid(request):
-        token = authentication.get_authorization_header(request).decode("utf-8").split()
-        payload = jwt.decode(
-            token[1], settings.SECRET_KEY, algorithms=["HS256"], verify=True
-        )
-        muid = payload.get("muid")
+        muid = JWTUtils.get_payload(request).get("muid")
         if muid is None:
             raise Exception(
                 "The corresponding JWT token does not contain the 'muid' key"
@@ -108,57 +184,12 @@ class JWTUtils:
 
     @staticmethod
     def is_jwt_authenticated(request):
-        token_prefix = "Bearer"
-        secret_key = SECRET_KEY
-        try:
-            auth_header = get_authorization_header(request).decode("utf-8")
-            if not auth_header or not auth_header.startswith(token_prefix):
-                raise UnauthorizedAccessException("Invalid token header")
-
-            token = auth_header[len(token_prefix):].strip()
-            if not token:
-                raise UnauthorizedAccessException("Empty Token")
-
-            payload = jwt.decode(token, secret_key, algorithms=["HS256"], verify=True)
-
-            user_id = payload.get("id")
-            expiry = datetime.strptime(payload.get("expiry"), "%Y-%m-%d %H:%M:%S%z")
-
-            if not user_id or expiry < DateTimeUtils.get_current_utc_time():
-                raise UnauthorizedAccessException("Token Expired or Invalid")
-
-            return None, payload
-        except jwt.exceptions.InvalidSignatureError as e:
-            raise UnauthorizedAccessException(
-                {
-                    "hasError": True,
-                    "message": {"general": [str(e)]},
-                    "statusCode": 1000,
-                }
-            ) from e
-        except jwt.exceptions.DecodeError as e:
-            raise UnauthorizedAccessException(
-                {
-                    "hasError": True,
-                    "message": {"general": [str(e)]},
-                    "statusCode": 1000,
-                }
-            ) from e
-        except AuthenticationFailed as e:
-            raise UnauthorizedAccessException(str(e)) from e
-        except Exception as e:
-            raise UnauthorizedAccessException(
-                {
-                    "hasError": True,
-                    "message": {"general": [str(e)]},
-                    "statusCode": 1000,
-                }
-            ) from e
+        return None, JWTUtils.get_payload(request)
 
     @staticmethod
     def is_logged_in(request):
         try:
-            JWTUtils.is_jwt_authenticated(request)
+            JWTUtils.get_payload(request)
             return True
         except UnauthorizedAccessException:
             return False
@@ -166,6 +197,7 @@ class JWTUtils:
 
 def role_required(roles):
     def decorator(view_func):
+        @wraps(view_func)
         def wrapped_view_func(obj, request, *args, **kwargs):
             for role in JWTUtils.fetch_role(request):
                 if role in roles:
@@ -181,18 +213,58 @@ def role_required(roles):
     return decorator
 
 
+class DynamicPermissionTable:
+    """
+    Dynamic roles and users allowed per management type.
+
+    Tables are cached in Redis under a shared version and kept in process
+    memory as sets. A permission check costs one cache read of the version and
+    no database queries until a dynamic role or user is written.
+    """
+
+    version_key = "dynamic_permission:version"
+    tables = {}
+
+    @classmethod
+    def get_version(cls) -> str:
+        if (version := cache.get(cls.version_key)) is None:
+            cache.add(cls.version_key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(cls.version_key)
+        return version
+
+    @classmethod
+    def get_table(cls, type) -> tuple[frozenset, frozenset]:
+        """
+        Returns:
+            tuple: (role titles, user ids) allowed for the type.
+        """
+        version = cls.get_version()
+        if (local := cls.tables.get(type)) and local[0] == version:
+            return local[1], local[2]
+
+        key = f"dynamic_permission:{version}:{type}"
+        if (table := cache.get(key)) is None:
+            table = (
+                list(DynamicRole.objects.filter(type=type).values_list('role__title', flat=True)),
+                list(DynamicUser.objects.filter(type=type).values_list('user__id', flat=True)),
+            )
+            cache.set(key, table, timeout=None)
+
+        roles, users = frozenset(table[0]), frozenset(table[1])
+        cls.tables[type] = (version, roles, users)
+        return roles, users
+
+    @classmethod
+    def invalidate(cls):
+        cache.set(cls.version_key, uuid.uuid4().hex, timeout=None)
+        cls.tables.clear()
+
+
 def dynamic_role_required(type):
     def decorator(view_func):
         def wrapped_view_func(obj, request, *args, **kwargs):
-            dynamic_roles = DynamicRole.objects.filter(type=type).values_list('role__title', flat=True)
-            roles = set(dynamic_roles)
-            for role in JWTUtils.fetch_role(request):
-                if role in roles:
-                    response = view_func(obj, request, *args, **kwargs)
-                    return response
-            dynamic_users = DynamicUser.objects.filter(type=type).values_list('user__id', flat=True)
-            user = JWTUtils.fetch_user_id(request)
-            if user in dynamic_users:
+            roles, users = DynamicPermissionTable.get_table(type)
+            if not roles.isdisjoint(JWTUtils.fetch_role(request)) or JWTUtils.fetch_user_id(request) in users:
                 response = view_func(obj, request, *args, **kwargs)
                 return response
             res = CustomResponse().get_unauthorized_response()
@@ -0,0 +1,285 @@
+import inspect
+import json
+import re
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import jwt
+from decouple import config
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client
+from django.urls import Resolver404, resolve
+
+from api.dashboard.error_log.log_helper import ManageURLPatterns
+from db.hackathon import Hackathon
+from db.learning_circle import CircleMeetingLog, UserCircleLink
+from db.task import VoucherLog
+from db.url_shortener import UrlShortener
+from db.user import User
+from utils.request_metrics import QueryCounter
+from utils.synthetic_data import SyntheticDataset
+from utils.types import IntegrationType, OrganizationType, RoleType
+from utils.utils import DateTimeUtils
+
+# Queries a GET request may run when its route declares no budget of its own
+DEFAULT_QUERY_BUDGET = 15
+
+# Routes that need more queries than the default, with the number they were
+# measured to run. Keep a budget at its measured count and lower it whenever the
+# route gets cheaper; a route whose count grows with its rows needs a fix, not
+# a budget.
+QUERY_BUDGETS = {
+    # the first request of a user creates their rank index entry
+    "api/v1/dashboard/profile/user-profile/": 17,
+}
+
+# Routes whose query count is known to grow with the rows they return, with
+# the reason they cannot be fixed yet. They are reported but do not fail the
+# check, remove a route once it is fixed.
+KNOWN_SCALING_ROUTES = {}
+
+# Routes calling external services on GET, they are never requested
+EXTERNAL_ROUTES = {
+    "api/v1/common/gta-sandshore/",
+    "api/v1/dashboard/profile/share-user-profile/<str:uuid>/",
+    "api/v1/integrations/kkem/user/<str:encrypted_data>/",
+    "api/v1/integrations/wadhwani/course-details/",
+    "api/v1/integrations/wadhwani/course-enroll-status/",
+    "api/v1/integrations/wadhwani/course-quiz-data/",
+    "api/v1/public/gta-sandshore/",
+}
+
+# Routes authenticating with the token of an integration instead of a user's
+INTEGRATION_ROUTES = {
+    "api/v1/integrations/kkem/users/",
+    "api/v1/integrations/kkem/users/<str:muid>/",
+    "api/v1/integrations/kkem/hackathon-stats/",
+}
+
+# Route parameters taking the route value of another name
+ROUTE_VALUES = {
+    "api/v1/integrations/kkem/users/<str:muid>/": {"muid": "kkem_muid"},
+}
+
+# Query strings and JSON bodies of routes that need more than their URL, each
+# value is the name of a route value
+ROUTE_QUERIES = {
+    "api/v1/register/location/": {"q": "district_name"},
+}
+ROUTE_BODIES = {
+    "api/v1/dashboard/organisation/merge_organizations/<str:organisation_id>/": {"source_org": "source_org_code"},
+}
+
+# Page size requested from paginated lists, large enough to hold both batches
+PER_PAGE = 1000
+
+ROUTE_PARAMETER = re.compile(r"<(?:\w+:)?(\w+)>")
+
+
+class QueryBudgetCheck:
+    """
+    Counts the queries of every GET endpoint against a synthetic dataset.
+
+    Each route found by ManageURLPatterns is requested once after a first
+    batch of the dataset and once after a second one, as a user holding every
+    role. A route fails when it responds with a server error, when it runs
+    more queries than its budget, or when the second batch made it run more
+    queries than the first: the number of queries should not depend on the
+    number of rows. Routes answering with a client error are skipped, their
+    counts do not measure the work of a successful request.
+
+    The check writes to the default and sequence databases, run it on
+    throwaway ones.
+    """
+
+    def __init__(self, seed: int = 0, scale: int = 1, routes: list[str] = None):
+        self.dataset = SyntheticDataset(seed=seed)
+        self.scale = scale
+        self.routes = routes
+        self.values = {}
+        self.token = None
+        self.client = None
+
+    def get_routes(self) -> list[str]:
+        routes = list(dict.fromkeys(ManageURLPatterns().urlpatterns))
+        if self.routes:
+            routes = [route for route in routes if any(part in route for part in self.routes)]
+        return routes
+
+    @staticmethod
+    def get_token(user) -> str:
+        expiry = DateTimeUtils.get_current_utc_time() + timedelta(hours=1)
+        payload = {
+            "id": user.id,
+            "muid": user.muid,
+            "roles": [role.value for role in RoleType],
+            "expiry": expiry.strftime("%Y-%m-%d %H:%M:%S%z"),
+            "tokenType": "accessToken",
+        }
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+
+    def get_route_values(self) -> dict:
+        """
+        Picks the rows the route parameters point to from the first batch:
+        the lead of a learning circle with a public profile, the circle, its
+        college and its place.
+        """
+        link = (
+            UserCircleLink.objects.select_related("user", "circle")
+            .filter(
+                circle__in=self.dataset.circles,
+                lead=True,
+                user__user_settings_user__is_public=True,
+            )
+            .order_by("circle__name")
+            .first()
+        )
+        circle, lead = link.circle, link.user
+        district = circle.org.district
+        zone = district.zone
+        self.token = self.get_token(lead)
+
+        return {
+            "muid": lead.muid,
+            "user_id": lead.id,
+            "member_id": lead.id,
+            "new_lead_id": lead.id,
+            "uuid": lead.id,
+            "circle_id": circle.id,
+            "circle_code": circle.circle_code,
+            "report_id": CircleMeetingLog.objects.filter(circle=circle).order_by("meet_time").values_list("id", flat=True).first(),
+            "org_code": circle.org.code,
+            "college_code": circle.org.code,
+            "organisation_id": circle.org.id,
+            "source_org_code": next(org.code for org in self.dataset.organizations if org.id != circle.org.id),
+            "org_type": OrganizationType.COLLEGE.value,
+            "organisation_type": OrganizationType.COLLEGE.value,
+            "district_id": district.id,
+            "district_name": district.name,
+            "zone_id": zone.id,
+            "state_id": zone.state.id,
+            "country_id": zone.state.country.id,
+            "affiliation_id": circle.org.affiliation.id,
+            "department_id": self.dataset.departments[0].id,
+            "role_id": self.dataset.roles[RoleType.STUDENT.value].id,
+            "roles_id": self.dataset.roles[RoleType.STUDENT.value].id,
+            "pk": circle.ig.id,
+            "task_id": self.dataset.tasks[0].id,
+            "task_type_id": self.dataset.tasks[0].type.id,
+            "channel_id": self.dataset.tasks[0].channel.id,
+            "url_id": UrlShortener.objects.order_by("-count", "short_url").values_list("id", flat=True).first(),
+            "voucher_id": VoucherLog.objects.order_by("code").values_list("id", flat=True).first(),
+            "hackathon_id": Hackathon.objects.order_by("title").values_list("id", flat=True).first(),
+            "kkem_muid": User.objects.filter(
+                integration_authorization_user__integration__name=IntegrationType.KKEM.value,
+                integration_authorization_user__verified=True,
+            ).order_by("muid").values_list("muid", flat=True).first(),
+            "log_name": "error",
+        }
+
+    def get_url(self, route: str) -> tuple[str | None, str | None]:
+        """
+        Returns:
+            tuple: The URL of the route, or None and the reason it is skipped.
+        """
+        if route in EXTERNAL_ROUTES:
+            return None, "calls an external service"
+        if route.startswith("^"):
+            return None, "regular expression route"
+
+        names = ROUTE_VALUES.get(route, {})
+        missing = [name for name in ROUTE_PARAMETER.findall(route) if self.values.get(names.get(name, name)) is None]
+        if missing:
+            return None, f"no value for {', '.join(missing)}"
+
+        url = "/" + ROUTE_PARAMETER.sub(lambda match: str(self.values[names.get(match[1], match[1])]), route)
+        try:
+            match = resolve(url)
+        except Resolver404:
+            return None, "does not resolve"
+
+        if match.func.__module__.startswith("debug_toolbar."):
+            return None, "debug toolbar view"
+
+        view_class = getattr(match.func, "view_class", None)
+        if view_class is not None:
+            if not hasattr(view_class, "get"):
+                return None, "no GET handler"
+            try:
+                inspect.signature(view_class.get).bind(None, None, *match.args, **match.kwargs)
+            except TypeError:
+                return None, "its GET handler does not take the route parameters"
+        return url, None
+
+    def get_request(self, route: str) -> dict:
+        """
+        Returns:
+            dict: The arguments of `Client.generic` requesting the route.
+        """
+        query = {"perPage": PER_PAGE}
+        query.update({name: self.values[value] for name, value in ROUTE_QUERIES.get(route, {}).items()})
+        body = {name: self.values[value] for name, value in ROUTE_BODIES.get(route, {}).items()}
+        request = {"QUERY_STRING": urlencode(query), "data": json.dumps(body) if body else ""}
+        if body:
+            request["content_type"] = "application/json"
+        if route in INTEGRATION_ROUTES:
+            request["HTTP_AUTHORIZATION"] = f"Bearer {self.dataset.integration.token}"
+        return request
+
+    def measure(self, route: str, url: str) -> tuple[int, int]:
+        """
+        Returns:
+            tuple: The status code of the response and the queries it ran.
+        """
+        cache.clear()
+        queries = QueryCounter()
+        with queries.wrap_connections():
+            response = self.client.generic("GET", url, **self.get_request(route))
+        return response.status_code, queries.count
+
+    def run(self) -> list[dict]:
+        """
+        Returns:
+            list: One result per route with its URL, status codes, query counts,
+                budget and verdict.
+        """
+        self.dataset.generate(self.scale)
+        self.values = self.get_route_values()
+        self.client = Client(
+            raise_request_exception=False,
+            headers={
+                "Authorization": f"Bearer {self.token}",
+                "protectionKey": config("PROTECTED_API_KEY"),
+            },
+        )
+
+        results = []
+        for route in self.get_routes():
+            url, reason = self.get_url(route)
+            results.append({"route": route, "url": url, "skipped": reason})
+        measured = [result for result in results if not result["skipped"]]
+
+        for result in measured:
+            result["status"], result["queries"] = self.measure(result["route"], result["url"])
+
+        self.dataset.generate(self.scale)
+        for result in measured:
+            status, queries = self.measure(result["route"], result["url"])
+            route = result["route"]
+            budget = QUERY_BUDGETS.get(route, DEFAULT_QUERY_BUDGET)
+            result.update(status=[result["status"], status], queries=[result["queries"], queries], budget=budget)
+
+            if max(result["status"]) >= 500:
+                result["failure"] = f"responds with status {max(result['status'])}"
+                continue
+            if max(result["status"]) >= 400:
+                result["skipped"] = f"responds with status {max(result['status'])}"
+                continue
+            if route in KNOWN_SCALING_ROUTES:
+                continue
+            if max(result["queries"]) > budget:
+                result["failure"] = f"runs {max(result['queries'])} queries, its budget is {budget}"
+            elif queries > result["queries"][0]:
+                result["failure"] = f"queries grew from {result['queries'][0]} to {queries} with the rows"
+        return results
@@ -0,0 +1,221 @@
+import uuid
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from db.task import UserRankIndex, Wallet
+from db.user import UserRoleLink
+from utils.types import MainRoles
+
+
+class RankIndex:
+    """
+    Maintains the `user_rank_index` table, which holds one row per ranked user
+    with their segment (Student, Mentor or Enabler) and karma.
+
+    A rank is answered with a single range count over the (segment, karma)
+    index. Users with equal karma share a rank.
+
+    Wallet and role link saves refresh the index through signals. Writes
+    skipping them, `bulk_create`, queryset `update` or other services writing
+    the wallet table, must call `refresh` or `refresh_many`; whatever is
+    missed is repaired by `check_rank_index --fix --interval <seconds>`.
+    """
+
+    BATCH_SIZE = 5000
+
+    @staticmethod
+    def get_segment(user_id) -> str | None:
+        """
+        Resolves the ranking segment of a user.
+
+        Verified mentors rank among mentors, verified enablers among enablers
+        and users without any mentor or enabler role link among students.
+        Users holding an unverified mentor or enabler link are not ranked.
+        """
+        links = set(
+            UserRoleLink.objects.filter(
+                user_id=user_id,
+                role__title__in=[MainRoles.MENTOR.value, MainRoles.ENABLER.value],
+            ).values_list("role__title", "verified")
+        )
+        if not links:
+            return MainRoles.STUDENT.value
+        if (MainRoles.MENTOR.value, True) in links:
+            return MainRoles.MENTOR.value
+        if (MainRoles.ENABLER.value, True) in links:
+            return MainRoles.ENABLER.value
+        return None
+
+    @staticmethod
+    def refresh(user_id, karma: int = None) -> tuple[str, int] | None:
+        """
+        Recomputes the index row of a single user.
+
+        Returns:
+            tuple: (segment, karma) of the user, or None if the user is not ranked.
+        """
+        if karma is None:
+            karma = (
+                Wallet.objects.filter(user_id=user_id)
+                .values_list("karma", flat=True)
+                .first()
+            )
+        segment = RankIndex.get_segment(user_id)
+
+        if karma is None or segment is None:
+            UserRankIndex.objects.filter(user_id=user_id).delete()
+            return None
+
+        UserRankIndex.objects.update_or_create(
+            user_id=user_id,
+            defaults={"segment": segment, "karma": karma},
+        )
+        return segment, karma
+
+    @staticmethod
+    def get_rank(user_id, karma: int) -> int | None:
+        """
+        Returns the rank of a user within their segment.
+
+        `karma` is the wallet karma already loaded by the caller; a missing or
+        stale index row is refreshed before counting.
+        """
+        entry = (
+            UserRankIndex.objects.filter(user_id=user_id)
+            .values_list("segment", "karma")
+            .first()
+        )
+        if entry is None or entry[1] != karma:
+            entry = RankIndex.refresh(user_id, karma)
+        if entry is None:
+            return None
+
+        segment, karma = entry
+        return UserRankIndex.objects.filter(segment=segment, karma__gt=karma).count() + 1
+
+    @staticmethod
+    def refresh_many(user_ids) -> int:
+        """
+        Recomputes the index rows of several users in bulk, after writes
+        that skip the signals.
+
+        Returns:
+            int: Number of indexed users among them.
+        """
+        user_ids = list(user_ids)
+        count = 0
+        for start in range(0, len(user_ids), RankIndex.BATCH_SIZE):
+            batch = user_ids[start:start + RankIndex.BATCH_SIZE]
+            entries = RankIndex.build_entries(batch)
+            with transaction.atomic():
+                UserRankIndex.objects.filter(user_id__in=batch).delete()
+                UserRankIndex.objects.bulk_create(
+                    [
+                        UserRankIndex(id=uuid.uuid4(), user_id=user_id, segment=segment, karma=karma)
+                        for user_id, (segment, karma) in entries.items()
+                    ]
+                )
+            count += len(entries)
+        return count
+
+    @staticmethod
+    def build_entries(user_ids=None) -> dict:
+        """
+        Computes the expected index for every wallet in bulk, or only for the
+        wallets of `user_ids`.
+
+        Returns:
+            dict: user_id mapped to (segment, karma).
+        """
+        links = UserRoleLink.objects.filter(
+            role__title__in=[MainRoles.MENTOR.value, MainRoles.ENABLER.value]
+        ).values_list("user_id", "role__title", "verified")
+        wallets = Wallet.objects.values_list("user_id", "karma")
+        if user_ids is not None:
+            links = links.filter(user_id__in=user_ids)
+            wallets = wallets.filter(user_id__in=user_ids)
+
+        linked_users = set()
+        mentors = set()
+        enablers = set()
+        for user_id, title, verified in links.iterator(chunk_size=RankIndex.BATCH_SIZE):
+            linked_users.add(user_id)
+            if not verified:
+                continue
+            if title == MainRoles.MENTOR.value:
+                mentors.add(user_id)
+            else:
+                enablers.add(user_id)
+
+        entries = {}
+        for user_id, karma in wallets.iterator(chunk_size=RankIndex.BATCH_SIZE):
+            if user_id in mentors:
+                entries[user_id] = (MainRoles.MENTOR.value, karma)
+            elif user_id in enablers:
+                entries[user_id] = (MainRoles.ENABLER.value, karma)
+            elif user_id not in linked_users:
+                entries[user_id] = (MainRoles.STUDENT.value, karma)
+        return entries
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Rebuilds the whole index from wallets and role links.
+
+        Returns:
+            int: Number of indexed users.
+        """
+        entries = RankIndex.build_entries()
+        with transaction.atomic():
+            UserRankIndex.objects.all().delete()
+            UserRankIndex.objects.bulk_create(
+                [
+                    UserRankIndex(id=uuid.uuid4(), user_id=user_id, segment=segment, karma=karma)
+                    for user_id, (segment, karma) in entries.items()
+                ],
+                batch_size=RankIndex.BATCH_SIZE,
+            )
+        return len(entries)
+
+    @staticmethod
+    def check() -> dict:
+        """
+        Compares the stored index against wallets and role links.
+
+        Returns:
+            dict: Lists of user ids that are `missing` from the index, `stale`
+            (wrong segment or karma) or `orphaned` (indexed but not ranked).
+        """
+        expected = RankIndex.build_entries()
+        stored = {
+            user_id: (segment, karma)
+            for user_id, segment, karma in UserRankIndex.objects.values_list(
+                "user_id", "segment", "karma"
+            ).iterator(chunk_size=RankIndex.BATCH_SIZE)
+        }
+        return {
+            "missing": [user_id for user_id in expected if user_id not in stored],
+            "stale": [
+                user_id
+                for user_id, entry in stored.items()
+                if user_id in expected and expected[user_id] != entry
+            ],
+            "orphaned": [user_id for user_id in stored if user_id not in expected],
+        }
+
+
+@receiver(post_save, sender=Wallet)
+def wallet_rank_signal(sender, instance, *args, **kwargs):
+    updated = UserRankIndex.objects.filter(user_id=instance.user_id).update(
+        karma=instance.karma
+    )
+    if not updated:
+        RankIndex.refresh(instance.user_id, instance.karma)
+
+
+@receiver(post_save, sender=UserRoleLink)
+@receiver(post_delete, sender=UserRoleLink)
+def role_rank_signal(sender, instance, *args, **kwargs):
+    RankIndex.refresh(instance.user_id)
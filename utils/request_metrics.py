@@ -0,0 +1,284 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger("django")
+
+# Upper bounds of the histogram buckets, every histogram has a last unbounded bucket
+HISTOGRAM_BUCKETS = {
+    "duration_seconds": [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+    "db_seconds": [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+    "db_queries": [0, 1, 2, 5, 10, 20, 50, 100, 200, 500],
+    "response_bytes": [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304],
+}
+# Seconds covered by one stored slot of the rolling window
+SLOT_SECONDS = 60
+
+
+class QueryCounter:
+    """
+    A `connection.execute_wrapper` counting the queries run inside it and
+    the time spent in them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    @contextmanager
+    def wrap_connections(self):
+        """
+        Counts the queries of every database alias of the current thread,
+        voucher codes for instance are reserved on the `sequence` connection.
+        """
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class RequestMetrics:
+    """
+    Aggregates request measurements per URL route into histograms over a
+    rolling window of REQUEST_METRICS_WINDOW seconds.
+
+    Each process aggregates the current minute in memory and stores it in the
+    cache every REQUEST_METRICS_FLUSH_INTERVAL seconds, under a key of its
+    own, so processes never overwrite each other. Every process also adds
+    its name once per minute to that minute's registry, and readers merge the
+    stored minutes of the processes registered within the window.
+    """
+
+    cache_prefix = "request_metrics"
+
+    def __init__(self):
+        self.process = f"{socket.gethostname()}:{os.getpid()}"
+        self.lock = threading.Lock()
+        self.slot = None
+        self.routes = {}
+        self.next_flush = 0
+        self.registered_slot = None
+
+    @staticmethod
+    def should_sample() -> bool:
+        rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+    @staticmethod
+    def new_route() -> dict:
+        return {
+            "requests": 0,
+            "statuses": {},
+            "histograms": {
+                name: {"buckets": [0] * (len(bounds) + 1), "sum": 0, "count": 0}
+                for name, bounds in HISTOGRAM_BUCKETS.items()
+            },
+        }
+
+    @staticmethod
+    def get_slot(now: float) -> int:
+        return int(now // SLOT_SECONDS)
+
+    def get_key(self, process: str, slot: int) -> str:
+        return f"{self.cache_prefix}:{process}:{slot}"
+
+    def get_registry_key(self, slot: int) -> str:
+        """
+        Key of the number of processes that stored a slot, the name of each
+        one is kept under this key followed by its number.
+        """
+        return f"{self.cache_prefix}:processes:{slot}"
+
+    def record(self, route: str, status: int, observations: dict = None):
+        """
+        Counts a request and adds its sampled observations to the histograms.
+
+        Args:
+            observations (dict, optional): Values keyed by HISTOGRAM_BUCKETS names,
+                None when the request was not sampled.
+        """
+        now = time.time()
+        slot = self.get_slot(now)
+
+        with self.lock:
+            if slot != self.slot:
+                if self.slot is not None:
+                    self.flush_locked()
+                self.slot = slot
+                self.routes = {}
+
+            entry = self.routes.get(route)
+            if entry is None:
+                entry = self.routes[route] = self.new_route()
+            entry["requests"] += 1
+            status = str(status)
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+
+            for name, value in (observations or {}).items():
+                histogram = entry["histograms"][name]
+                histogram["buckets"][bisect_left(HISTOGRAM_BUCKETS[name], value)] += 1
+                histogram["sum"] += value
+                histogram["count"] += 1
+
+            if now >= self.next_flush:
+                self.flush_locked()
+
+    def flush(self):
+        with self.lock:
+            if self.slot is not None:
+                self.flush_locked()
+
+    def flush_locked(self):
+        self.next_flush = time.time() + settings.REQUEST_METRICS_FLUSH_INTERVAL
+        timeout = settings.REQUEST_METRICS_WINDOW + SLOT_SECONDS
+        try:
+            cache.set(self.get_key(self.process, self.slot), self.routes, timeout=timeout)
+            if self.registered_slot != self.slot:
+                # numbered entries of the slot's registry, a concurrent process
+                # never overwrites the entry of another one
+                count_key = self.get_registry_key(self.slot)
+                index = 1 if cache.add(count_key, 1, timeout=timeout) else cache.incr(count_key)
+                cache.set(f"{count_key}:{index}", self.process, timeout=timeout)
+                self.registered_slot = self.slot
+        except Exception:
+            logger.exception("Could not store the request metrics")
+
+    def get_routes(self) -> dict:
+        """
+        Returns the measurements of every process within the window, merged
+        per route.
+        """
+        self.flush()
+        current = self.get_slot(time.time())
+        first = current - settings.REQUEST_METRICS_WINDOW // SLOT_SECONDS + 1
+
+        count_keys = {self.get_registry_key(slot): slot for slot in range(first, current + 1)}
+        entry_keys = {
+            f"{count_key}:{index}": count_keys[count_key]
+            for count_key, count in cache.get_many(list(count_keys)).items()
+            for index in range(1, count + 1)
+        }
+        keys = [
+            self.get_key(process, entry_keys[entry_key])
+            for entry_key, process in cache.get_many(list(entry_keys)).items()
+        ]
+
+        merged = {}
+        for routes in cache.get_many(keys).values():
+            for route, entry in routes.items():
+                total = merged.get(route)
+                if total is None:
+                    total = merged[route] = self.new_route()
+                total["requests"] += entry["requests"]
+                for status, count in entry["statuses"].items():
+                    total["statuses"][status] = total["statuses"].get(status, 0) + count
+                for name, histogram in entry["histograms"].items():
+                    total_histogram = total["histograms"][name]
+                    total_histogram["buckets"] = [
+                        a + b for a, b in zip(total_histogram["buckets"], histogram["buckets"])
+                    ]
+                    total_histogram["sum"] += histogram["sum"]
+                    total_histogram["count"] += histogram["count"]
+        return merged
+
+    @staticmethod
+    def get_quantile(name: str, histogram: dict, quantile: float):
+        """
+        Estimates a quantile as the upper bound of the bucket holding it.
+        Values in the unbounded bucket are reported as the last bound.
+        """
+        if not histogram["count"]:
+            return None
+        rank = quantile * histogram["count"]
+        seen = 0
+        bounds = HISTOGRAM_BUCKETS[name]
+        for bound, count in zip(bounds, histogram["buckets"]):
+            seen += count
+            if seen >= rank:
+                return bound
+        return bounds[-1]
+
+    def get_summary(self) -> dict:
+        """
+        Returns the request count, status counts and the mean, p50, p95 and
+        p99 of every histogram, per route.
+        """
+        return {
+            route: {
+                "requests": entry["requests"],
+                "statuses": entry["statuses"],
+                **{
+                    name: {
+                        "count": histogram["count"],
+                        "mean": histogram["sum"] / histogram["count"] if histogram["count"] else None,
+                        "p50": self.get_quantile(name, histogram, 0.5),
+                        "p95": self.get_quantile(name, histogram, 0.95),
+                        "p99": self.get_quantile(name, histogram, 0.99),
+                    }
+                    for name, histogram in entry["histograms"].items()
+                },
+            }
+            for route, entry in sorted(self.get_routes().items())
+        }
+
+    @staticmethod
+    def escape_label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    def get_prometheus(self, gauges: dict = None) -> str:
+        """
+        Renders the window in the Prometheus text format. The values cover the
+        last REQUEST_METRICS_WINDOW seconds, so every series is a gauge.
+
+        Args:
+            gauges (dict, optional): Extra metric names mapped to their values.
+        """
+        routes = self.get_routes()
+        lines = [
+            "# HELP mulearn_http_requests Requests per route and status within the window",
+            "# TYPE mulearn_http_requests gauge",
+        ]
+        for route, entry in sorted(routes.items()):
+            label = self.escape_label(route)
+            for status, count in sorted(entry["statuses"].items()):
+                lines.append(f'mulearn_http_requests{{route="{label}",status="{status}"}} {count}')
+
+        for name, bounds in HISTOGRAM_BUCKETS.items():
+            metric = f"mulearn_http_request_{name}"
+            lines.append(f"# HELP {metric} Sampled request {name.replace('_', ' ')} within the window")
+            lines.append(f"# TYPE {metric} gauge")
+            for route, entry in sorted(routes.items()):
+                label = self.escape_label(route)
+                histogram = entry["histograms"][name]
+                cumulative = 0
+                for bound, count in zip([*bounds, "+Inf"], histogram["buckets"]):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{route="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{route="{label}"}} {histogram["sum"]}')
+                lines.append(f'{metric}_count{{route="{label}"}} {histogram["count"]}')
+
+        for name, value in (gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,360 @@
+import re
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.query import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from db.organization import Organization
+from db.search import SearchDocument
+from db.task import TaskList, VoucherLog
+from db.user import User
+
+# Indexed lists: the model of each entity and the fields its list searches.
+# A search on exactly these fields reads the index, any other one, a subset
+# included, still matches the fields themselves.
+SEARCH_ENTITIES = {
+    "user": {
+        "model": User,
+        "fields": ["muid", "full_name", "email", "mobile", "user_lvl_link_user__level__name"],
+    },
+    "organization": {
+        "model": Organization,
+        "fields": [
+            "title",
+            "code",
+            "affiliation__title",
+            "district__name",
+            "district__zone__name",
+            "district__zone__state__name",
+            "district__zone__state__country__name",
+        ],
+    },
+    "task": {
+        "model": TaskList,
+        "fields": [
+            "hashtag",
+            "title",
+            "description",
+            "karma",
+            "channel__name",
+            "type__title",
+            "active",
+            "variable_karma",
+            "usage_count",
+            "level__name",
+            "org__title",
+            "ig__name",
+            "event",
+            "updated_at",
+            "updated_by__full_name",
+            "created_by__full_name",
+            "created_at",
+        ],
+    },
+    "voucher": {
+        "model": VoucherLog,
+        "fields": [
+            "user__full_name",
+            "task__title",
+            "karma",
+            "month",
+            "week",
+            "claimed",
+            "updated_by__full_name",
+            "created_by__full_name",
+            "description",
+            "event",
+            "code",
+        ],
+    },
+}
+
+# Fields of an entity also stored in their own indexed column, matched by prefix
+PREFIX_FIELDS = ["muid", "email", "mobile"]
+
+# Shortest word held by a MySQL FULLTEXT index, innodb_ft_min_token_size
+FULLTEXT_MIN_WORD = 3
+
+
+class ContainsSearchBackend:
+    """
+    Matches the query as a substring of the indexed content, the semantics of
+    the `icontains` search it replaces, on a single table without joins.
+    """
+
+    def get_condition(self, query: str) -> Q:
+        query = query.lower()
+        condition = Q(content__contains=query)
+        for field in PREFIX_FIELDS:
+            condition |= Q(**{f"{field}__startswith": query})
+        return condition
+
+
+class FullTextSearchBackend(ContainsSearchBackend):
+    """
+    Matches every word of the query as a word prefix with the FULLTEXT index
+    of the content, and the whole query as a prefix of muid, email or mobile.
+    Queries with words shorter than the index holds fall back to a substring
+    match.
+    """
+
+    def get_condition(self, query: str) -> Q:
+        words = re.findall(r"\w+", query.lower())
+        if not words or min(len(word) for word in words) < FULLTEXT_MIN_WORD:
+            return super().get_condition(query)
+
+        match = RawSQL(
+            f"MATCH ({SearchDocument._meta.db_table}.content) AGAINST (%s IN BOOLEAN MODE)",
+            [" ".join(f"+{word}*" for word in words)],
+            output_field=BooleanField(),
+        )
+        condition = Q(match)
+        for field in PREFIX_FIELDS:
+            condition |= Q(**{f"{field}__startswith": query.lower()})
+        return condition
+
+
+SEARCH_BACKENDS = {
+    "contains": ContainsSearchBackend,
+    "fulltext": FullTextSearchBackend,
+}
+
+
+class SearchIndex:
+    """
+    Maintains the `search_document` table, which holds one row per user,
+    organisation, task and voucher with the lowercased values of the fields
+    its list searches, joined ones included, and prefix columns for muid,
+    email and mobile.
+
+    Rows are refreshed by signals when an indexed row or a row one of its
+    fields is read from changes; `bulk_create` and `update` skip them, run
+    rebuild_search_index after such writes.
+    """
+
+    BATCH_SIZE = 2000
+
+    @staticmethod
+    def get_backend():
+        name = settings.SEARCH_BACKEND
+        if name == "fields":
+            return None
+        if name == "auto":
+            name = "fulltext" if connection.vendor == "mysql" else "contains"
+        return SEARCH_BACKENDS[name]()
+
+    @staticmethod
+    def get_entity(model, search_fields) -> str | None:
+        for name, entity in SEARCH_ENTITIES.items():
+            # the content holds every field of the entity, a list searching
+            # fewer of them would match rows on the others
+            if entity["model"] is model and set(search_fields) == set(entity["fields"]):
+                return name
+        return None
+
+    @staticmethod
+    def search(queryset: QuerySet, search_fields, query: str) -> QuerySet | None:
+        """
+        Filters the queryset on the index.
+
+        Returns:
+            QuerySet: The matching rows, or None when the fields are not
+            indexed or the index is disabled.
+        """
+        if not isinstance(queryset, QuerySet) or (backend := SearchIndex.get_backend()) is None:
+            return None
+        if (entity := SearchIndex.get_entity(queryset.model, search_fields)) is None:
+            return None
+
+        matches = SearchDocument.objects.filter(backend.get_condition(query), entity=entity)
+        return queryset.filter(pk__in=matches.values("object_id"))
+
+    @staticmethod
+    def format_value(value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            # matches the way MySQL compares a boolean column with a string
+            return str(int(value))
+        return str(value).lower()
+
+    @staticmethod
+    def get_documents(entity: str, queryset: QuerySet):
+        """
+        Yields unsaved documents for the rows of the queryset, a row joined
+        to several related rows gets the values of all of them.
+        """
+        fields = SEARCH_ENTITIES[entity]["fields"]
+        now = timezone.now()
+        rows = queryset.order_by("pk").values_list("pk", *fields)
+
+        document = None
+        for pk, *values in rows.iterator(chunk_size=SearchIndex.BATCH_SIZE):
+            values = [SearchIndex.format_value(value) for value in values]
+            if document is not None and document.object_id == pk:
+                document.content += "\n" + "\n".join(values)
+                continue
+            if document is not None:
+                yield document
+
+            prefixes = {
+                field: values[fields.index(field)] or None
+                for field in PREFIX_FIELDS
+                if field in fields
+            }
+            document = SearchDocument(
+                id=uuid.uuid4(),
+                entity=entity,
+                object_id=pk,
+                content="\n".join(values),
+                updated_at=now,
+                **prefixes,
+            )
+        if document is not None:
+            yield document
+
+    @staticmethod
+    def refresh(entity: str, ids) -> int:
+        """
+        Recomputes the documents of some rows of an entity, rows that no
+        longer exist lose theirs.
+
+        Returns:
+            int: Number of indexed rows.
+        """
+        model = SEARCH_ENTITIES[entity]["model"]
+        ids = list(ids)
+        count = 0
+        for start in range(0, len(ids), SearchIndex.BATCH_SIZE):
+            batch = ids[start:start + SearchIndex.BATCH_SIZE]
+            documents = list(SearchIndex.get_documents(entity, model._base_manager.filter(pk__in=batch)))
+            with transaction.atomic():
+                SearchDocument.objects.filter(entity=entity, object_id__in=batch).delete()
+                SearchDocument.objects.bulk_create(documents)
+            count += len(documents)
+        return count
+
+    @staticmethod
+    def rebuild(entities=None) -> dict:
+        """
+        Rebuilds the documents of the entities, all of them by default.
+
+        Returns:
+            dict: Number of indexed rows per entity.
+        """
+        counts = {}
+        for entity in entities or SEARCH_ENTITIES:
+            model = SEARCH_ENTITIES[entity]["model"]
+            documents = SearchIndex.get_documents(entity, model._base_manager.all())
+            counts[entity] = 0
+            with transaction.atomic():
+                SearchDocument.objects.filter(entity=entity).delete()
+                batch = []
+                for document in documents:
+                    batch.append(document)
+                    if len(batch) == SearchIndex.BATCH_SIZE:
+                        SearchDocument.objects.bulk_create(batch)
+                        counts[entity] += len(batch)
+                        batch = []
+                SearchDocument.objects.bulk_create(batch)
+                counts[entity] += len(batch)
+        return counts
+
+
+def get_dependencies() -> dict:
+    """
+    Finds the models the indexed fields are read from through a relation.
+
+    Returns:
+        dict: Each model mapped to (entity, path from the entity to the model,
+        fields of the model the entity reads, whether the path ends with a
+        reverse relation) tuples.
+    """
+    dependencies = {}
+    for entity, spec in SEARCH_ENTITIES.items():
+        for field in spec["fields"]:
+            parts = field.split("__")
+            model = spec["model"]
+            for depth, part in enumerate(parts[:-1], start=1):
+                relation = model._meta.get_field(part)
+                model = relation.related_model
+                path = "__".join(parts[:depth])
+                watched = parts[depth]
+                for dependency in dependencies.setdefault(model, []):
+                    if dependency[:2] == (entity, path):
+                        dependency[2].add(watched)
+                        break
+                else:
+                    dependencies[model].append((entity, path, {watched}, not relation.concrete))
+    return dependencies
+
+
+SEARCH_DEPENDENCIES = get_dependencies()
+
+
+def get_watched_values(instance, fields) -> dict:
+    """
+    Reads the watched fields of an instance, foreign keys by their id.
+    """
+    values = {}
+    for name in fields:
+        field = instance._meta.get_field(name)
+        if field.concrete:
+            values[name] = getattr(instance, field.attname)
+    return values
+
+
+def search_document_pre_save(sender, instance, *args, **kwargs):
+    # remember the values the documents of other entities are built from,
+    # their documents are only refreshed when one of them changes
+    fields = set().union(*(watched for _, _, watched, _ in SEARCH_DEPENDENCIES[sender]))
+    names = [name for name in fields if sender._meta.get_field(name).concrete]
+    if instance._state.adding or not names:
+        instance._search_index_values = None
+        return
+    old = sender._base_manager.filter(pk=instance.pk).values(
+        *[sender._meta.get_field(name).attname for name in names]
+    ).first()
+    instance._search_index_values = old and {
+        name: old[sender._meta.get_field(name).attname] for name in names
+    }
+
+
+def search_document_save_signal(sender, instance, *args, **kwargs):
+    for entity, spec in SEARCH_ENTITIES.items():
+        if spec["model"] is sender:
+            SearchIndex.refresh(entity, [instance.pk])
+
+    old = getattr(instance, "_search_index_values", None)
+    for entity, path, watched, reverse in SEARCH_DEPENDENCIES.get(sender, []):
+        if kwargs.get("created") and not reverse:
+            # no indexed row points to a new row yet
+            continue
+        if old is not None and get_watched_values(instance, watched) == {
+            name: value for name, value in old.items() if name in watched
+        }:
+            continue
+        model = SEARCH_ENTITIES[entity]["model"]
+        ids = model._base_manager.filter(**{path: instance.pk}).values_list("pk", flat=True)
+        SearchIndex.refresh(entity, ids)
+
+
+def search_document_delete_signal(sender, instance, *args, **kwargs):
+    for entity, spec in SEARCH_ENTITIES.items():
+        if spec["model"] is sender:
+            SearchDocument.objects.filter(entity=entity, object_id=instance.pk).delete()
+
+
+for _model in {spec["model"] for spec in SEARCH_ENTITIES.values()} | set(SEARCH_DEPENDENCIES):
+    post_save.connect(search_document_save_signal, sender=_model, dispatch_uid=f"search_{_model.__name__}_save")
+for _model in SEARCH_DEPENDENCIES:
+    pre_save.connect(search_document_pre_save, sender=_model, dispatch_uid=f"search_{_model.__name__}_pre_save")
+for _spec in SEARCH_ENTITIES.values():
+    post_delete.connect(
+        search_document_delete_signal, sender=_spec["model"], dispatch_uid=f"search_{_spec['model'].__name__}_delete"
+    )
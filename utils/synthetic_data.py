@@ -0,0 +1,783 @@
+import importlib
+import pkgutil
+import random
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+
+import db
+
+from db.hackathon import Hackathon, HackathonForm, HackathonOrganiserLink, HackathonUserSubmission
+from db.integrations import Integration, IntegrationAuthorization
+from db.learning_circle import CircleMeetingLog, LearningCircle, UserCircleLink
+from db.notification import Notification
+from db.organization import (
+    College,
+    Country,
+    Department,
+    District,
+    OrgAffiliation,
+    OrgDiscordLink,
+    OrgKarmaLog,
+    OrgKarmaType,
+    Organization,
+    State,
+    UserOrganizationLink,
+    Zone,
+)
+from db.settings import Device, SystemSetting
+from db.task import (
+    Channel,
+    Events,
+    InterestGroup,
+    KarmaActivityLog,
+    Level,
+    MucoinActivityLog,
+    MucoinInviteLog,
+    TaskList,
+    TaskType,
+    UserIgLink,
+    UserLvlLink,
+    VoucherLog,
+    Wallet,
+)
+from db.url_shortener import UrlShortener, UrlShortenerTracker
+from db.user import (
+    DynamicRole,
+    DynamicUser,
+    Role,
+    Socials,
+    User,
+    UserCouponLink,
+    UserMentor,
+    UserReferralLink,
+    UserRoleLink,
+    UserSettings,
+)
+from utils import types
+from utils.types import (
+    DEFAULT_HACKATHON_FORM_FIELDS,
+    IntegrationType,
+    Lc,
+    ManagementType,
+    OrganizationType,
+    RoleType,
+    TasksTypesHashtag,
+)
+from utils.utils import DateTimeUtils
+
+INTEREST_GROUPS = [
+    ("Web Development", "WEB"),
+    ("Artificial Intelligence", "AI"),
+    ("Mobile Development", "MOB"),
+    ("Cyber Security", "CYB"),
+    ("Internet Of Things", "IOT"),
+    ("UI UX", "UIUX"),
+    ("Product Management", "PM"),
+    ("Cloud And DevOps", "CLD"),
+]
+# (level, karma needed to reach it)
+LEVELS = [(1, 0), (2, 100), (3, 500), (4, 1500), (5, 4000), (6, 8000), (7, 15000)]
+TASK_TYPES = ["General", "Interest Group", "Event", "Voucher"]
+# Locations of the first batch: states of a country, zones per state, districts per zone
+STATES = ["Kerala", "Tamil Nadu", "Karnataka"]
+ZONES_PER_STATE = 2
+DISTRICTS_PER_ZONE = 3
+DEPARTMENTS = ["Computer Science", "Electronics", "Mechanical", "Civil", "Electrical"]
+BROWSERS = ["Chrome", "Firefox", "Safari", "Edge"]
+DEVICES = ["mobile", "pc", "tablet"]
+OPERATING_SYSTEMS = ["Android", "Windows", "iOS", "Linux"]
+SOCIALS = ["github", "linkedin", "instagram", "facebook", "medium", "stackoverflow"]
+ORG_KARMA_TYPES = [("Hackathon Hosted", 500), ("Event Hosted", 200), ("Campus Activity", 50)]
+
+
+def create_tables():
+    """
+    Creates the tables of every model of `db` in an empty database. The
+    models are unmanaged, the schema of a real database comes from alter-scripts.
+    """
+    for module in pkgutil.iter_modules(db.__path__):
+        importlib.import_module(f"db.{module.name}")
+    with connection.schema_editor() as schema_editor:
+        for model in apps.get_app_config("db").get_models():
+            schema_editor.create_model(model)
+
+
+class SyntheticDataset:
+    """
+    Writes a consistent synthetic dataset for local performance work.
+
+    Every call to `generate` appends one more batch of organisations, users
+    and their activity on top of a shared set of locations, roles, levels,
+    interest groups and tasks, so measuring before and after a second batch
+    shows how a query count grows with the data. Values are drawn from a
+    random generator seeded with `seed`, the same seed and scale always write
+    the same rows. Sizes are skewed: a few colleges hold most students, a few
+    interest groups most members and a few users most of the karma.
+
+    Every model of `db` gets rows except the work queues and indexes the
+    application fills itself (mail outbox, webhook queue, import jobs, error
+    log index, voucher code sequences) and the tokens of forgotten passwords.
+    The rank index and leaderboard snapshots are derived from the dataset,
+    rebuild them once it is written, as `bulk_create` sends no signals.
+    """
+
+    # Users and organisations written per batch at scale 1
+    USERS = 40
+    COLLEGES = 4
+    COMPANIES = 1
+    COMMUNITIES = 1
+
+    def __init__(self, seed: int = 0, batch_size: int = 1000):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.batch = 0
+        self.now = DateTimeUtils.get_current_utc_time()
+        self.admin_id = settings.SYSTEM_ADMIN_ID
+        self.counts = {}
+
+        self.roles = {}
+        self.levels = []
+        self.interest_groups = []
+        self.tasks = []
+        self.districts = []
+        self.departments = []
+        self.affiliations = []
+        self.users = []
+        self.students = {}
+        self.mentors = set()
+        self.organizations = []
+        self.circles = []
+        self.special_tasks = {}
+        self.org_karma_types = []
+        self.integration = None
+
+    def get_id(self) -> str:
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def skewed_choice(self, items: list, alpha: float = 1.0):
+        """
+        Picks an item with a Zipf-like weight, the first items are picked most.
+        """
+        weights = [1 / (rank ** alpha) for rank in range(1, len(items) + 1)]
+        return self.random.choices(items, weights=weights)[0]
+
+    def pareto(self, alpha: float, cap: int) -> int:
+        return min(int(self.random.paretovariate(alpha)) - 1, cap)
+
+    def audit(self) -> dict:
+        return {"created_by_id": self.admin_id, "updated_by_id": self.admin_id}
+
+    def write(self, model, objects: list):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(objects)
+
+    def generate(self, scale: int = 1) -> dict:
+        """
+        Writes one batch of the dataset.
+
+        Returns:
+            dict: Number of rows written per model by every batch so far.
+        """
+        with transaction.atomic():
+            if not self.batch:
+                self.generate_reference()
+            self.batch += 1
+            self.generate_organizations(scale)
+            self.generate_users(scale)
+            self.generate_karma()
+            self.generate_referrals()
+            self.generate_learning_circles()
+            self.generate_vouchers()
+            self.generate_url_shorteners(scale)
+            self.generate_profiles()
+            self.generate_mucoin()
+            self.generate_hackathons(scale)
+        return self.counts
+
+    @staticmethod
+    def get_schema_version() -> str:
+        """
+        Returns the version the last alter script sets, the schema the tables were created with.
+        """
+        versions = [
+            path.stem.removeprefix("alter-") for path in Path(settings.BASE_DIR, "alter-scripts").glob("alter-*.py")
+        ]
+        return max(versions, key=lambda version: tuple(map(int, version.split("."))), default="0")
+
+    def generate_reference(self):
+        if not User.every.filter(id=self.admin_id).exists():
+            User.every.create(
+                id=self.admin_id,
+                muid="system@mulearn",
+                full_name="System",
+                email="system@mulearn.org",
+            )
+
+        self.roles = {role.value: Role(id=self.get_id(), title=role.value, **self.audit()) for role in RoleType}
+        self.write(Role, list(self.roles.values()))
+
+        self.levels = [
+            Level(id=self.get_id(), level_order=order, name=f"lvl{order}", karma=karma, **self.audit())
+            for order, karma in LEVELS
+        ]
+        self.write(Level, self.levels)
+
+        self.interest_groups = [
+            InterestGroup(id=self.get_id(), name=name, code=code, icon=code.lower(), **self.audit())
+            for name, code in INTEREST_GROUPS
+        ]
+        self.write(InterestGroup, self.interest_groups)
+
+        task_types = [TaskType(id=self.get_id(), title=title, **self.audit()) for title in TASK_TYPES]
+        self.write(TaskType, task_types)
+        channel = Channel(id=self.get_id(), name="general", discord_id=str(self.random.getrandbits(60)), **self.audit())
+        self.write(Channel, [channel])
+
+        self.tasks = [
+            TaskList(
+                id=self.get_id(),
+                hashtag=f"#{ig.code.lower()}-{level.level_order}-{number}",
+                title=f"{ig.name} level {level.level_order} task {number}",
+                karma=self.random.choice([50, 100, 200, 300, 500]),
+                channel=channel,
+                type=task_types[1],
+                level=level,
+                ig=ig,
+                **self.audit(),
+            )
+            for ig in self.interest_groups
+            for level in self.levels[:4]
+            for number in range(2)
+        ] + [
+            TaskList(
+                id=self.get_id(),
+                hashtag=f"#general-{number}",
+                title=f"General task {number}",
+                karma=self.random.choice([20, 50, 100]),
+                type=task_types[0],
+                **self.audit(),
+            )
+            for number in range(5)
+        ]
+        self.write(TaskList, self.tasks)
+
+        # tasks the application looks up by title or hashtag
+        self.special_tasks = {
+            value: TaskList(
+                id=self.get_id(),
+                hashtag=value if value.startswith("#") else f"#{value}",
+                title=value,
+                karma=Lc.KARMA.value if value == Lc.TASK_HASHTAG.value else 50,
+                type=task_types[0],
+                **self.audit(),
+            )
+            for value in [*[hashtag.value for hashtag in TasksTypesHashtag], Lc.TASK_HASHTAG.value]
+        }
+        self.write(TaskList, list(self.special_tasks.values()))
+
+        country = Country(id=self.get_id(), name="India", **self.audit())
+        states = [State(id=self.get_id(), name=name, country=country, **self.audit()) for name in STATES]
+        zones = [
+            Zone(id=self.get_id(), name=f"{state.name} Zone {number}", state=state, **self.audit())
+            for state in states
+            for number in range(1, ZONES_PER_STATE + 1)
+        ]
+        self.districts = [
+            District(id=self.get_id(), name=f"{zone.name} District {number}", zone=zone, **self.audit())
+            for zone in zones
+            for number in range(1, DISTRICTS_PER_ZONE + 1)
+        ]
+        self.write(Country, [country])
+        self.write(State, states)
+        self.write(Zone, zones)
+        self.write(District, self.districts)
+
+        self.affiliations = [
+            OrgAffiliation(id=self.get_id(), title=title, **self.audit())
+            for title in ["University A", "University B", "Autonomous"]
+        ]
+        self.departments = [Department(id=self.get_id(), title=title, **self.audit()) for title in DEPARTMENTS]
+        self.write(OrgAffiliation, self.affiliations)
+        self.write(Department, self.departments)
+
+        self.write(
+            Events,
+            [Events(id=self.get_id(), name=event, **self.audit()) for event in types.Events.get_all_values()],
+        )
+        self.org_karma_types = [
+            OrgKarmaType(id=self.get_id(), title=title, karma=karma, **self.audit()) for title, karma in ORG_KARMA_TYPES
+        ]
+        self.write(OrgKarmaType, self.org_karma_types)
+        self.write(
+            DynamicRole,
+            [
+                DynamicRole(id=self.get_id(), type=management_type, role=self.roles[RoleType.ADMIN.value], **self.audit())
+                for management_type in ManagementType.get_all_values()
+            ],
+        )
+        self.integration = Integration(
+            id=self.get_id(),
+            name=IntegrationType.KKEM.value,
+            token=self.get_id(),
+            auth_token=self.get_id(),
+            base_url="https://kkem.example.com",
+        )
+        self.write(Integration, [self.integration])
+        self.write(
+            SystemSetting,
+            [SystemSetting(key="db.version", value=self.get_schema_version(), updated_at=self.now, created_at=self.now)],
+        )
+
+    def generate_organizations(self, scale: int):
+        # organisations grow with the square root of the scale, larger batches get larger colleges
+        counts = [
+            (OrganizationType.COLLEGE.value, round(self.COLLEGES * scale ** 0.5)),
+            (OrganizationType.COMPANY.value, round(self.COMPANIES * scale ** 0.5)),
+            (OrganizationType.COMMUNITY.value, round(self.COMMUNITIES * scale ** 0.5)),
+        ]
+        org_types = [org_type for org_type, count in counts for _ in range(count)]
+        organizations = [
+            Organization(
+                id=self.get_id(),
+                title=f"{org_type} {self.batch}-{number}",
+                code=f"ORG{self.batch:03d}{number:05d}",
+                org_type=org_type,
+                affiliation=self.random.choice(self.affiliations) if org_type == OrganizationType.COLLEGE.value else None,
+                district=self.skewed_choice(self.districts, 0.5),
+                **self.audit(),
+            )
+            for number, org_type in enumerate(org_types)
+        ]
+        self.write(Organization, organizations)
+        self.write(
+            College,
+            [
+                College(id=self.get_id(), org=org, level=self.random.randint(0, 4), **self.audit())
+                for org in organizations
+                if org.org_type == OrganizationType.COLLEGE.value
+            ],
+        )
+        self.write(
+            OrgDiscordLink,
+            [
+                OrgDiscordLink(id=self.get_id(), discord_id=str(self.random.getrandbits(60)), org=org, **self.audit())
+                for org in organizations
+                if self.random.random() < 0.5
+            ],
+        )
+        self.write(
+            OrgKarmaLog,
+            [
+                OrgKarmaLog(id=self.get_id(), org=org, karma=karma_type.karma, type=karma_type, **self.audit())
+                for org in organizations
+                for karma_type in [self.skewed_choice(self.org_karma_types) for _ in range(self.pareto(1.5, 30))]
+            ],
+        )
+        self.organizations = organizations
+
+    def generate_users(self, scale: int):
+        users = [
+            User(
+                id=self.get_id(),
+                discord_id=str(self.random.getrandbits(60)),
+                muid=f"user-{self.batch}-{number}@mulearn",
+                full_name=f"User {self.batch} {number}",
+                email=f"user-{self.batch}-{number}@example.com",
+                mobile=f"9{self.batch:03d}{number:06d}",
+                gender=self.random.choice(["Male", "Female", None]),
+                dob=date(self.random.randint(1995, 2006), self.random.randint(1, 12), self.random.randint(1, 28)),
+                exist_in_guild=self.random.random() < 0.85,
+                district=self.skewed_choice(self.districts, 0.5),
+            )
+            for number in range(self.USERS * scale)
+        ]
+        self.write(User, users)
+        self.users = users
+
+        colleges = [org for org in self.organizations if org.org_type == OrganizationType.COLLEGE.value]
+        others = [org for org in self.organizations if org.org_type != OrganizationType.COLLEGE.value]
+        organization_links, role_links, ig_links = [], [], []
+        self.mentors = set()
+
+        for user in users:
+            kind = self.random.choices(
+                [RoleType.STUDENT.value, RoleType.MENTOR.value, RoleType.ENABLER.value], weights=[85, 10, 5]
+            )[0]
+            org = self.skewed_choice(colleges) if kind == RoleType.STUDENT.value else self.random.choice(others)
+            organization_links.append(
+                UserOrganizationLink(
+                    id=self.get_id(),
+                    user=user,
+                    org=org,
+                    department=self.random.choice(self.departments) if kind == RoleType.STUDENT.value else None,
+                    graduation_year=str(self.random.randint(2024, 2028)),
+                    verified=True,
+                    is_alumni=0,
+                    created_by_id=self.admin_id,
+                )
+            )
+            role_links.append(
+                UserRoleLink(id=self.get_id(), user=user, role=self.roles[kind], verified=True, created_by_id=self.admin_id)
+            )
+            if kind == RoleType.MENTOR.value:
+                self.mentors.add(user.id)
+            for ig in self.random.sample(self.interest_groups, self.random.randint(0, 3)):
+                ig_links.append(UserIgLink(id=self.get_id(), user=user, ig=ig, created_by_id=self.admin_id))
+
+        for org in colleges:
+            if students := [link.user for link in organization_links if link.org is org]:
+                role_links.append(
+                    UserRoleLink(
+                        id=self.get_id(),
+                        user=students[0],
+                        role=self.roles[RoleType.CAMPUS_LEAD.value],
+                        verified=True,
+                        created_by_id=self.admin_id,
+                    )
+                )
+
+        self.students = {}
+        for link in organization_links:
+            if link.department is not None:
+                self.students.setdefault(link.org.id, []).append(link.user.id)
+
+        self.write(UserOrganizationLink, organization_links)
+        self.write(UserRoleLink, role_links)
+        self.write(UserIgLink, ig_links)
+        self.write(
+            UserSettings,
+            [UserSettings(id=self.get_id(), user=user, is_public=self.random.random() < 0.7, **self.audit()) for user in users],
+        )
+
+    def generate_karma(self):
+        """
+        Writes the karma activity of the batch, a few users earn most of it,
+        and wallets and levels that agree with it.
+        """
+        logs, wallets, level_links = [], [], []
+        for user in self.users:
+            karma = 0
+            for _ in range(self.pareto(1.2, 60)):
+                task = self.random.choice(self.tasks)
+                logs.append(
+                    KarmaActivityLog(
+                        id=self.get_id(),
+                        karma=task.karma,
+                        task=task,
+                        user=user,
+                        peer_approved=True,
+                        peer_approved_by_id=self.admin_id,
+                        appraiser_approved=True,
+                        appraiser_approved_by_id=self.admin_id,
+                        **self.audit(),
+                    )
+                )
+                karma += task.karma
+
+            wallets.append(Wallet(id=self.get_id(), user=user, karma=karma, coin=karma / 1000, **self.audit()))
+            level = [level for level in self.levels if level.karma <= karma][-1]
+            level_links.append(UserLvlLink(id=self.get_id(), user=user, level=level, **self.audit()))
+
+        self.write(KarmaActivityLog, logs)
+        self.write(Wallet, wallets)
+        self.write(UserLvlLink, level_links)
+
+    def generate_referrals(self):
+        referrers = self.users[: max(1, len(self.users) // 10)]
+        self.write(
+            UserReferralLink,
+            [
+                UserReferralLink(
+                    id=self.get_id(),
+                    user=self.skewed_choice(referrers),
+                    referral=user,
+                    is_coin=self.random.random() < 0.2,
+                    **self.audit(),
+                )
+                for user in self.users[len(referrers):]
+                if self.random.random() < 0.3
+            ],
+        )
+
+    def generate_learning_circles(self):
+        circles, members = [], []
+        for org in self.organizations:
+            students = self.students.get(org.id, [])
+            for number in range(len(students) // 5):
+                ig = self.skewed_choice(self.interest_groups)
+                circle = LearningCircle(
+                    id=self.get_id(),
+                    name=f"{ig.code} circle {org.code}-{number}",
+                    circle_code=f"{ig.code}{org.code}{number:02d}",
+                    ig=ig,
+                    org=org,
+                    meet_place="Library",
+                    meet_time="17:00",
+                    day=self.random.choice(["Monday", "Wednesday", "Friday"]),
+                    **self.audit(),
+                )
+                circles.append(circle)
+                for index, user_id in enumerate(self.random.sample(students, min(len(students), self.random.randint(2, 6)))):
+                    members.append(
+                        UserCircleLink(
+                            id=self.get_id(),
+                            user_id=user_id,
+                            circle=circle,
+                            lead=index == 0,
+                            accepted=True,
+                            accepted_at=self.now,
+                        )
+                    )
+
+        meetings = []
+        for circle in circles:
+            attendees = [member.user_id for member in members if member.circle is circle]
+            for number in range(self.pareto(1.3, 20)):
+                meetings.append(
+                    CircleMeetingLog(
+                        id=self.get_id(),
+                        circle=circle,
+                        meet_time=self.now - timedelta(days=7 * (number + 1)),
+                        meet_place=circle.meet_place,
+                        day=circle.day,
+                        attendees=",".join(attendees[:5]),
+                        agenda=f"Week {number + 1} of {circle.name}",
+                        images="lc/meet-report/synthetic.png",
+                        **self.audit(),
+                    )
+                )
+
+        self.write(LearningCircle, circles)
+        self.write(UserCircleLink, members)
+        self.write(CircleMeetingLog, meetings)
+        self.circles = circles
+
+    def generate_vouchers(self):
+        month = self.now.strftime("%B")
+        self.write(
+            VoucherLog,
+            [
+                VoucherLog(
+                    id=self.get_id(),
+                    code=f"SYN{self.batch}-{number:06d}",
+                    user=self.random.choice(self.users),
+                    task=self.random.choice(self.tasks),
+                    karma=self.random.choice([50, 100, 200]),
+                    week=str(self.random.randint(1, 4)),
+                    month=month,
+                    claimed=self.random.random() < 0.6,
+                    **self.audit(),
+                )
+                for number in range(len(self.users) // 4)
+            ],
+        )
+
+    def generate_url_shorteners(self, scale: int):
+        urls = [
+            UrlShortener(
+                id=self.get_id(),
+                title=f"Link {self.batch}-{number}",
+                short_url=f"syn{self.batch}-{number}",
+                long_url=f"https://example.com/{self.batch}/{number}",
+                **self.audit(),
+            )
+            for number in range(5 * scale)
+        ]
+        hits = [
+            UrlShortenerTracker(
+                id=self.get_id(),
+                ip_address=f"10.0.{self.random.randint(0, 255)}.{self.random.randint(1, 254)}",
+                browser=self.skewed_choice(BROWSERS),
+                operating_system=self.random.choice(OPERATING_SYSTEMS),
+                device_type=self.skewed_choice(DEVICES),
+                url_shortener=url,
+                city="Kochi",
+                region="Kerala",
+                country="India",
+            )
+            for url in urls
+            for _ in range(self.pareto(1.1, 200))
+        ]
+        for url in urls:
+            url.count = sum(hit.url_shortener is url for hit in hits)
+        self.write(UrlShortener, urls)
+        self.write(UrlShortenerTracker, hits)
+
+    def generate_profiles(self):
+        """
+        Writes what users add to their profile over time: socials, devices,
+        notifications, mentor details, coupons and integration accounts.
+        """
+        socials, devices, notifications, mentors, coupons, authorizations, dynamic_users = [], [], [], [], [], [], []
+        for user in self.users:
+            if self.random.random() < 0.4:
+                socials.append(
+                    Socials(
+                        id=self.get_id(),
+                        user=user,
+                        **{name: f"user{user.mobile}" for name in self.random.sample(SOCIALS, self.random.randint(1, 3))},
+                        **self.audit(),
+                    )
+                )
+            for _ in range(self.random.randint(1, 2)):
+                devices.append(
+                    Device(
+                        id=self.get_id(),
+                        browser=self.skewed_choice(BROWSERS),
+                        os=self.random.choice(OPERATING_SYSTEMS),
+                        user_id=user,
+                        last_log_in=self.now - timedelta(hours=self.pareto(0.8, 24 * 90)),
+                    )
+                )
+            for number in range(self.pareto(1.2, 50)):
+                notifications.append(
+                    Notification(
+                        id=uuid.UUID(int=self.random.getrandbits(128), version=4),
+                        user=user,
+                        title=f"Notification {number}",
+                        description="Your task was approved",
+                        created_by_id=self.admin_id,
+                    )
+                )
+            if user.id in self.mentors:
+                mentors.append(
+                    UserMentor(
+                        id=self.get_id(),
+                        user=user,
+                        about="Mentor",
+                        reason="To help students",
+                        hours=self.random.randint(1, 10),
+                        updated_at=self.now,
+                        created_at=self.now,
+                        **self.audit(),
+                    )
+                )
+            if self.random.random() < 0.05:
+                coupons.append(
+                    UserCouponLink(
+                        id=self.get_id(),
+                        user=user,
+                        coupon=f"C{self.batch:04d}{len(coupons):06d}",
+                        type="event",
+                        created_by_id=self.admin_id,
+                        created_at=self.now,
+                    )
+                )
+            if self.random.random() < 0.1:
+                authorizations.append(
+                    IntegrationAuthorization(
+                        id=self.get_id(),
+                        integration=self.integration,
+                        user=user,
+                        integration_value=str(self.random.getrandbits(32)),
+                        additional_field=user.email,
+                        verified=self.random.random() < 0.8,
+                    )
+                )
+
+        for user in self.random.sample(self.users, min(len(self.users), 2)):
+            dynamic_users.append(
+                DynamicUser(
+                    id=self.get_id(),
+                    type=self.random.choice(ManagementType.get_all_values()),
+                    user=user,
+                    **self.audit(),
+                )
+            )
+
+        self.write(Socials, socials)
+        self.write(Device, devices)
+        self.write(Notification, notifications)
+        self.write(UserMentor, mentors)
+        self.write(UserCouponLink, coupons)
+        self.write(IntegrationAuthorization, authorizations)
+        self.write(DynamicUser, dynamic_users)
+
+    def generate_mucoin(self):
+        inviters = self.random.sample(self.users, max(1, len(self.users) // 20))
+        invites, activity = [], []
+        for user in inviters:
+            for _ in range(self.pareto(1.5, 10) + 1):
+                invites.append(
+                    MucoinInviteLog(
+                        id=self.get_id(),
+                        user=user,
+                        email=f"invite-{len(invites)}-{user.email}",
+                        invite_code=self.get_id(),
+                        created_by=user,
+                    )
+                )
+                activity.append(
+                    MucoinActivityLog(
+                        id=self.get_id(),
+                        user=user,
+                        coin=1,
+                        status="Debit",
+                        task=self.special_tasks[TasksTypesHashtag.MUCOIN.value],
+                        created_by=user,
+                        updated_by=user,
+                    )
+                )
+        self.write(MucoinInviteLog, invites)
+        self.write(MucoinActivityLog, activity)
+
+    def generate_hackathons(self, scale: int):
+        colleges = [org for org in self.organizations if org.org_type == OrganizationType.COLLEGE.value]
+        hackathons, forms, organisers, submissions = [], [], [], []
+        for number in range(round(scale ** 0.5)):
+            org = self.skewed_choice(colleges)
+            start = self.now + timedelta(days=self.random.randint(-60, 60))
+            hackathon = Hackathon(
+                id=self.get_id(),
+                title=f"Hackathon {self.batch}-{number}",
+                tagline="Build something",
+                type=self.random.choice(["offline", "online"]),
+                org=org,
+                district=org.district,
+                place=org.title,
+                is_open_to_all=self.random.random() < 0.5,
+                application_start=start - timedelta(days=30),
+                application_ends=start - timedelta(days=3),
+                event_start=start,
+                event_end=start + timedelta(days=2),
+                status=self.random.choices(["Published", "Draft"], weights=[80, 20])[0],
+                **self.audit(),
+            )
+            hackathons.append(hackathon)
+            forms += [
+                HackathonForm(
+                    id=self.get_id(),
+                    hackathon=hackathon,
+                    field_name=field_name,
+                    field_type=field_type,
+                    is_required=field_type == "system",
+                    **self.audit(),
+                )
+                for field_name, field_type in DEFAULT_HACKATHON_FORM_FIELDS.items()
+            ]
+            organisers.append(
+                HackathonOrganiserLink(
+                    id=self.get_id(), organiser=self.random.choice(self.users), hackathon=hackathon, **self.audit()
+                )
+            )
+            participants = self.random.sample(self.users, min(len(self.users), self.pareto(0.9, 300)))
+            submissions += [
+                HackathonUserSubmission(
+                    id=self.get_id(),
+                    user=user,
+                    hackathon=hackathon,
+                    data={"name": user.full_name, "email": user.email, "github": f"user{user.mobile}"},
+                    **self.audit(),
+                )
+                for user in participants
+            ]
+
+        self.write(Hackathon, hackathons)
+        self.write(HackathonForm, forms)
+        self.write(HackathonOrganiserLink, organisers)
+        self.write(HackathonUserSubmission, submissions)
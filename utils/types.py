@@ -91,6 +91,49 @@ class WebHookCategory(Enum):
     KARMA_INFO = 'karma-info'
 
 
+class LeaderboardType(Enum):
+    STUDENTS = 'students'
+    STUDENTS_MONTHLY = 'students-monthly'
+    COLLEGE = 'college'
+    COLLEGE_MONTHLY = 'college-monthly'
+
+
+class CacheTag(Enum):
+    INTEREST_GROUP = 'interest-group'
+    LOCATION = 'location'
+    ORGANIZATION = 'organization'
+    LANDING_STATS = 'landing-stats'
+
+
+class ImportJobType(Enum):
+    TASK = 'task'
+    VOUCHER = 'voucher'
+    USER_ROLE = 'user-role'
+    ORGANISATION = 'organisation'
+
+
+class ImportJobStatus(Enum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+
+class ImportJobRowStatus(Enum):
+    SUCCESS = 'success'
+    FAILED = 'failed'
+
+    @classmethod
+    def get_all_values(cls):
+        return [member.value for member in cls]
+
+
+class EmailOutboxStatus(Enum):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+
 class RefferalType(Enum):
     KARMA = 'Karma'
     MUCOIN = 'Mucoin'
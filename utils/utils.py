@@ -1,21 +1,29 @@
+import codecs
 import csv
 import datetime
-import gzip
-import io
+import decimal
+import hashlib
+import math
+import re
+import uuid
+import zlib
 from datetime import timedelta
 
 import openpyxl
 import pytz
-import requests
-from decouple import config
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.core.mail import EmailMessage, send_mail
+from django.core import signing
+from django.core.cache import cache
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import F, Q
 from django.db.models.query import QuerySet
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.template.loader import render_to_string
 
+from utils.search_index import SearchIndex
+
 
 class CommonUtils:
     @staticmethod
@@ -38,6 +46,12 @@ class CommonUtils:
 
         Returns:
             - QuerySet or dict: The paginated queryset or a dictionary containing the paginated queryset and pagination information.
+
+        Searches over the fields of a list kept in the search index, see
+        `SearchIndex`, read the index instead of matching every field.
+
+        A request carrying a `cursor` parameter, empty for the first page, is
+        paginated by keyset instead of by page number; see `_get_cursor_page`.
         """
         if sort_fields is None:
             sort_fields = {}
@@ -48,11 +62,15 @@ class CommonUtils:
         sort_by = request.query_params.get("sortBy")
 
         if search_query:
-            query = Q()
-            for field in search_fields:
-                query |= Q(**{f"{field}__icontains": search_query})
+            searched = SearchIndex.search(queryset, search_fields, search_query)
+            if searched is not None:
+                queryset = searched
+            else:
+                query = Q()
+                for field in search_fields:
+                    query |= Q(**{f"{field}__icontains": search_query})
 
-            queryset = queryset.filter(query)
+                queryset = queryset.filter(query)
 
         if sort_by:
             sort = sort_by[1:] if sort_by.startswith("-") else sort_by
@@ -61,6 +79,10 @@ class CommonUtils:
                     sort_field_name = f"-{sort_field_name}"
 
                 queryset = queryset.order_by(sort_field_name)
+        cursor = request.query_params.get("cursor")
+        if is_pagination and cursor is not None and isinstance(queryset, QuerySet):
+            with_count = request.query_params.get("withCount", "true").lower() != "false"
+            return CommonUtils._get_cursor_page(queryset, cursor, per_page, with_count)
         if is_pagination:
             paginator = Paginator(queryset, per_page)
             try:
@@ -86,24 +108,228 @@ class CommonUtils:
         return queryset
 
     @staticmethod
-    def generate_csv(queryset: QuerySet, csv_name: str) -> HttpResponse:
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = f'attachment; filename="{csv_name}.csv"'
-        fieldnames = list(queryset[0].keys())
-        writer = csv.DictWriter(response, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(queryset)
-
-        compressed_response = HttpResponse(
-            gzip.compress(response.content),
-            content_type="text/csv",
+    def _get_cursor_page(queryset: QuerySet, cursor: str, per_page: int, with_count: bool) -> dict:
+        """
+        Returns a page of a queryset by keyset pagination.
+
+        Rows are ordered by the first ordering field of the queryset, or its
+        primary key, with the primary key as tie-breaker. A page is read as
+        the rows following the sort key and primary key stored in the cursor,
+        so deep pages cost no OFFSET scan. The response keeps the shape of
+        page number pagination, with `nextCursor` and `prevCursor` tokens
+        added; `nextPage` is always None. The total count is cached for
+        PAGINATION_COUNT_CACHE_TIMEOUT seconds, and left out, as
+        `count` and `totalPages` None, when `with_count` is False.
+
+        Args:
+            - queryset (QuerySet): The filtered and ordered queryset.
+            - cursor (str): A token of a previous page, empty for the first page.
+            - per_page (int): Rows per page.
+            - with_count (bool): Whether to count the rows of the queryset.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        key = ordering[0] if ordering and isinstance(ordering[0], str) and ordering[0] != "?" else "pk"
+        descending = key.startswith("-")
+        key = key.lstrip("-")
+        if key in ["pk", "id", queryset.model._meta.pk.name]:
+            key = "pk"
+
+        try:
+            position = signing.loads(cursor, salt="pagination.cursor") if cursor else None
+        except signing.BadSignature:
+            position = None
+        if position is not None and position["key"] != f"{'-' if descending else ''}{key}":
+            # the sort changed since the cursor was made, start over
+            position = None
+
+        backwards = position is not None and position["backwards"]
+        reverse = descending != backwards
+        rows = queryset.annotate(_cursor_key=F(key), _cursor_pk=F("pk"))
+        if position is not None:
+            rows = rows.filter(
+                CommonUtils._get_cursor_filter(
+                    CommonUtils._decode_cursor_value(position["value"]), position["pk"], reverse
+                )
+            )
+        if reverse:
+            rows = rows.order_by(F("_cursor_key").desc(nulls_last=True), "-_cursor_pk")
+        else:
+            rows = rows.order_by(F("_cursor_key").asc(nulls_first=True), "_cursor_pk")
+
+        rows = list(rows[: per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if backwards:
+            rows.reverse()
+
+        positions = []
+        for row in rows:
+            if isinstance(row, dict):
+                positions.append((row.pop("_cursor_key"), row.pop("_cursor_pk")))
+            else:
+                positions.append((row._cursor_key, row._cursor_pk))
+
+        is_next = bool(rows) and (backwards or has_more)
+        is_prev = bool(rows) and (has_more if backwards else position is not None)
+        sort_key = f"{'-' if descending else ''}{key}"
+
+        count = None
+        if with_count:
+            sql, params = queryset.query.sql_with_params()
+            count_key = f"pagination_count:{hashlib.sha1(f'{sql}{params}'.encode()).hexdigest()}"
+            count = cache.get(count_key)
+            if count is None:
+                count = queryset.count()
+                cache.set(count_key, count, timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+
+        return {
+            "queryset": rows,
+            "pagination": {
+                "count": count,
+                "totalPages": math.ceil(count / per_page) if count is not None else None,
+                "isNext": is_next,
+                "isPrev": is_prev,
+                "nextPage": None,
+                "nextCursor": CommonUtils._get_cursor(sort_key, *positions[-1], False) if is_next else None,
+                "prevCursor": CommonUtils._get_cursor(sort_key, *positions[0], True) if is_prev else None,
+            },
+        }
+
+    @staticmethod
+    def _get_cursor_filter(value, pk, descending: bool) -> Q:
+        """
+        Matches the rows after (value, pk) in the order of `_cursor_key`, nulls
+        first, then `_cursor_pk`, or in the reverse order when descending.
+        """
+        lookup = "lt" if descending else "gt"
+        pk_after = Q(**{f"_cursor_pk__{lookup}": pk})
+        if value is None:
+            nulls_after = Q(_cursor_key__isnull=True) & pk_after
+            return nulls_after if descending else nulls_after | Q(_cursor_key__isnull=False)
+
+        after = Q(**{f"_cursor_key__{lookup}": value}) | Q(_cursor_key=value) & pk_after
+        return after | Q(_cursor_key__isnull=True) if descending else after
+
+    @staticmethod
+    def _get_cursor(key: str, value, pk, backwards: bool) -> str:
+        return signing.dumps(
+            {
+                "key": key,
+                "value": CommonUtils._encode_cursor_value(value),
+                "pk": CommonUtils._encode_cursor_value(pk)[1],
+                "backwards": backwards,
+            },
+            salt="pagination.cursor",
+            compress=True,
         )
-        compressed_response[
-            "Content-Disposition"
-        ] = f'attachment; filename="{csv_name}.csv"'
-        compressed_response["Content-Encoding"] = "gzip"
 
-        return compressed_response
+    @staticmethod
+    def _encode_cursor_value(value) -> list:
+        if isinstance(value, datetime.datetime):
+            return ["datetime", value.isoformat()]
+        if isinstance(value, datetime.date):
+            return ["date", value.isoformat()]
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            return ["str", str(value)]
+        return ["value", value]
+
+    @staticmethod
+    def _decode_cursor_value(value: list):
+        kind, value = value
+        if kind == "datetime":
+            return datetime.datetime.fromisoformat(value)
+        if kind == "date":
+            return datetime.date.fromisoformat(value)
+        return value
+
+    @staticmethod
+    def generate_csv(
+        data,
+        csv_name: str,
+        serializer=None,
+        context: dict = None,
+        chunk_size: int = 2000,
+    ) -> StreamingHttpResponse:
+        """
+        Streams a gzip-compressed CSV attachment.
+
+        Rows are written and compressed incrementally as the response is sent,
+        so memory stays constant whatever the row count.
+
+        Args:
+            - data (QuerySet or iterable): Rows to export. QuerySets are iterated
+              with `.iterator(chunk_size=chunk_size)`.
+            - csv_name (str): File name of the attachment, without extension.
+            - serializer (Serializer, optional): Serializer class applied to each
+              row. Defaults to None, in which case rows must already be dicts.
+            - context (dict, optional): Context passed to the serializer.
+            - chunk_size (int, optional): Rows fetched and compressed per chunk.
+
+        Returns:
+            - StreamingHttpResponse: The CSV file; empty when there are no rows.
+        """
+        if isinstance(data, QuerySet):
+            data = data.iterator(chunk_size=chunk_size)
+        if serializer is not None:
+            row_serializer = serializer(context=context or {})
+            data = map(row_serializer.to_representation, data)
+
+        response = ChunkedStreamingHttpResponse(
+            CommonUtils._stream_csv(data, chunk_size), content_type="text/csv"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{csv_name}.csv"'
+        response["Content-Encoding"] = "gzip"
+
+        return response
+
+    @staticmethod
+    def _stream_csv(rows, chunk_size: int):
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        writer = None
+        lines = []
+
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(_CSVLineBuffer(), fieldnames=list(row.keys()))
+                lines.append(writer.writeheader())
+            lines.append(writer.writerow(row))
+
+            if len(lines) >= chunk_size:
+                if chunk := compressor.compress("".join(lines).encode()):
+                    yield chunk
+                lines.clear()
+
+        yield compressor.compress("".join(lines).encode()) + compressor.flush()
+
+
+class ChunkedStreamingHttpResponse(StreamingHttpResponse):
+    """
+    A StreamingHttpResponse whose synchronous iterator is also streamed under
+    ASGI. Django reads such an iterator whole into a list before sending the
+    first byte; this response pulls one chunk at a time through
+    sync_to_async instead, on the thread the view ran on.
+    """
+
+    async def __aiter__(self):
+        if self.is_async:
+            async for part in super().__aiter__():
+                yield part
+            return
+
+        parts = self.streaming_content
+        get_next = sync_to_async(next, thread_sensitive=True)
+        while (part := await get_next(parts, None)) is not None:
+            yield part
+
+
+class _CSVLineBuffer:
+    """
+    A file-like object whose write returns the value instead of storing it,
+    so csv writers hand back each formatted line.
+    """
+
+    def write(self, value):
+        return value
 
 
 class DateTimeUtils:
@@ -162,42 +388,106 @@ class DiscordWebhooks:
     @staticmethod
     def general_updates(category, action, *values) -> str:
         """
-        Modify channels and category in Discord
+        Modify channels and category in Discord. The update is queued once
+        the current transaction commits, never for a rolled back one, and
+        posted by the webhook dispatcher in the background.
                 Args:
         category(str): Category of webhook
         action(str): action of webhook
         values(str): values of webhook
         """
+        from utils.discord_webhook import dispatcher
+
         content = f"{category}<|=|>{action}"
         for value in values:
             content = f"{content}<|=|>{value}"
-        url = config("DISCORD_WEBHOOK_LINK")
-        data = {"content": content}
-        requests.post(url, json=data)
+        transaction.on_commit(lambda: dispatcher.enqueue(content))
 
 
 class ImportCSV:
-    def read_excel_file(self, file_obj):
-        workbook = openpyxl.load_workbook(filename=io.BytesIO(file_obj.read()))
+    """
+    Reads .xlsx and .csv uploads lazily, one row dict keyed by the header
+    row at a time. Workbooks are opened in read-only mode so only the row
+    being read is held in memory.
+    """
+
+    def read_file(self, file_obj, file_name: str = None):
+        """
+        Opens an upload and reads its header row.
+
+        Args:
+            file_obj: A seekable binary file, e.g. an UploadedFile.
+            file_name (str, optional): Decides between csv and xlsx. Defaults
+                to the name of `file_obj`.
+
+        Returns:
+            tuple: The headers and a generator of the non blank rows.
+        """
+        file_name = file_name or getattr(file_obj, "name", "") or ""
+        if file_name.lower().endswith(".csv"):
+            return self._read_csv(file_obj)
+        return self._read_xlsx(file_obj)
+
+    def _read_xlsx(self, file_obj):
+        workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
         sheet = workbook.active
+        # the stored dimensions can be wrong, read until the last row instead
+        sheet.reset_dimensions()
 
-        rows = []
-        for row in sheet.iter_rows(values_only=True):
-            row_dict = {
-                header.value: cell_value for header, cell_value in zip(sheet[1], row)
-            }
-            rows.append(row_dict)
-        workbook.close()
+        values = sheet.iter_rows(values_only=True)
+        headers = list(next(values, None) or [])
+        if not any(headers):
+            workbook.close()
+            return [], iter(())
+
+        return headers, self._get_rows(headers, values, workbook.close)
 
-        return rows
+    def _read_csv(self, file_obj):
+        values = csv.reader(codecs.iterdecode(file_obj, "utf-8-sig"))
+        headers = next(values, None) or []
+        if not any(headers):
+            return [], iter(())
+
+        values = ([self._get_csv_value(value) for value in row] for row in values)
+        return headers, self._get_rows(headers, values)
+
+    @staticmethod
+    def _get_csv_value(value: str):
+        """
+        Reads a csv cell the way openpyxl returns a workbook cell: empty cells
+        as None and numbers as int or float. Numbers with a leading zero, such
+        as phone numbers, stay text like a workbook cell formatted as text.
+        """
+        if value == "":
+            return None
+        if re.fullmatch(r"-?(0|[1-9]\d*)", value):
+            return int(value)
+        if re.fullmatch(r"-?(0|[1-9]\d*)\.\d+", value):
+            return float(value)
+        return value
+
+    @staticmethod
+    def _get_rows(headers, values, close=None):
+        columns = [(index, header) for index, header in enumerate(headers) if header is not None]
+        try:
+            for row in values:
+                row_dict = {
+                    header: row[index] if index < len(row) else None
+                    for index, header in columns
+                }
+                if any(row_dict.values()):
+                    yield row_dict
+        finally:
+            if close is not None:
+                close()
 
 
 def send_template_mail(
-    context: dict, subject: str, address: list[str], attachment: str = None
+    context: dict, subject: str, address: list[str], attachment: tuple = None
 ):
     """
-    The function `send_user_mail` sends an email to a user with the provided user data, subject, and
-    address.
+    The function `send_user_mail` queues an email to a user with the provided user data, subject, and
+    address. The email outbox worker delivers it once the current transaction commits.
 
     :param context: A dictionary containing user data such as name, email, and any other relevant
     information
@@ -205,9 +495,10 @@ def send_template_mail(
     :param address: The `address` parameter is a list of strings that represents the path to the email
     template file. It is used to specify the location of the email template file that will be rendered
     and used as the content of the email
-    attachment: The Attachment That send to the user
+    attachment: The Attachment That send to the user, a (filename, content, mimetype) tuple
+    :return: The queued EmailOutbox row
     """
-    status = None
+    from utils.mail_outbox import MailOutbox
 
     email_content = render_to_string(
         f"mails/{'/'.join(map(str, address))}",
@@ -216,23 +507,10 @@ def send_template_mail(
     if not (mail := getattr(context, "email", None)):
         mail = context["email"]
 
-    if attachment is None:
-        return send_mail(
-            subject=subject,
-            message=email_content,
-            from_email=settings.FROM_MAIL,
-            recipient_list=[mail],
-            html_message=email_content,
-            fail_silently=False,
-        )
-
-    email = EmailMessage(
+    return MailOutbox.enqueue(
         subject=subject,
         body=email_content,
-        from_email=settings.FROM_MAIL,
-        to=[context["email"]],
+        to=[mail],
+        html_body=email_content,
+        attachments=[attachment] if attachment is not None else [],
     )
-
-    email.attach(attachment)
-    email.content_subtype = "html"
-    return email.send()
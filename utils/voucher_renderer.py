@@ -0,0 +1,114 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Kept free of Django imports, the pool workers import this module on their own
+
+assets_location = Path(__file__).resolve().parent.parent / 'api' / 'dashboard' / 'karma_voucher'
+image_location = assets_location / 'assets' / 'karmacard.png'
+font_location = str(assets_location / 'fonts' / 'Roboto-Light.ttf')
+
+# Pillow format names mapped to the extension of the attachment
+FORMAT_EXTENSIONS = {
+    'JPEG': 'jpg',
+    'PNG': 'png',
+    'WEBP': 'webp',
+}
+
+# Batches smaller than this are rendered in the calling process
+MIN_POOL_BATCH = 8
+
+# (text field, position, font size) drawn on the template
+VOUCHER_LAYOUT = [
+    ('name', (135, 250), 60),
+    ('hashtag', (135, 450), 45),
+    ('karma', (920, 135), 45),
+    ('code', (135, 135), 20),
+    ('month', (135, 375), 30),
+]
+
+
+class VoucherRenderer:
+    """
+    Draws karma vouchers on a template decoded once per process.
+
+    Fonts are loaded once per size and every voucher starts from a copy of
+    the template, so a render only costs the drawing and the encoding.
+    Bulk renders are spread over a process pool.
+    """
+
+    _executor = None
+    _executor_workers = None
+    _executor_lock = threading.Lock()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_template() -> Image.Image:
+        image = Image.open(image_location).convert('RGB')
+        image.load()
+        return image
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_font(size: int) -> ImageFont.FreeTypeFont:
+        return ImageFont.truetype(font_location, size=size)
+
+    @staticmethod
+    def render(voucher: dict, image_format: str = 'JPEG', quality: int = 75) -> bytes:
+        """
+        Renders one voucher.
+
+        :param voucher: The name, hashtag, karma, code and month to draw
+        :param image_format: A Pillow format name, see FORMAT_EXTENSIONS
+        :param quality: Encoder quality of lossy formats
+        :return: The encoded image
+        """
+        image = VoucherRenderer.get_template().copy()
+        draw = ImageDraw.Draw(image)
+        for field, position, size in VOUCHER_LAYOUT:
+            draw.text(position, voucher[field], fill=(255, 255, 255), font=VoucherRenderer.get_font(size))
+
+        image_data = BytesIO()
+        image.save(image_data, format=image_format, quality=quality)
+        return image_data.getvalue()
+
+    @staticmethod
+    def get_executor(workers: int) -> ProcessPoolExecutor:
+        """
+        Returns the pool of `workers` processes, replacing the pool of another
+        size. Workers are spawned, not forked, so they do not inherit the
+        database connections, locks and threads of the calling process.
+        """
+        with VoucherRenderer._executor_lock:
+            if VoucherRenderer._executor is not None and VoucherRenderer._executor_workers != workers:
+                # renders already submitted to the old pool still finish
+                VoucherRenderer._executor.shutdown(wait=False)
+                VoucherRenderer._executor = None
+            if VoucherRenderer._executor is None:
+                VoucherRenderer._executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+                )
+                VoucherRenderer._executor_workers = workers
+            return VoucherRenderer._executor
+
+    @staticmethod
+    def render_many(vouchers: list[dict], image_format: str = 'JPEG', quality: int = 75,
+                    workers: int = 1) -> list[bytes]:
+        """
+        Renders vouchers in order, on a pool of `workers` processes when there
+        is more than one worker and enough vouchers to pay for the transfer.
+        """
+        formats = [image_format] * len(vouchers)
+        qualities = [quality] * len(vouchers)
+
+        if workers <= 1 or len(vouchers) < MIN_POOL_BATCH:
+            return list(map(VoucherRenderer.render, vouchers, formats, qualities))
+
+        executor = VoucherRenderer.get_executor(workers)
+        chunksize = max(1, len(vouchers) // (workers * 4))
+        return list(executor.map(VoucherRenderer.render, vouchers, formats, qualities, chunksize=chunksize))